@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Check that create_github_issues.py still starts quickly.
+
+Imports the script in fresh interpreters with `python -X importtime` and
+fails when its cumulative import time (best of several runs) exceeds the
+budget, or when a network library is imported before a client is built.
+
+Usage:
+    python3 check_import_time.py [--budget-ms N] [--runs N]
+
+Configuration:
+    - IMPORT_TIME_BUDGET_MS: Default for --budget-ms (default: 150)
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+MODULE = "create_github_issues"
+DEFAULT_BUDGET_MS = 150
+DEFAULT_RUNS = 5
+# Only load_github() and the asyncio transport may import these
+DEFERRED_MODULES = {"github", "requests", "urllib3", "aiohttp", "asyncio"}
+
+
+def measure():
+    """Import the module once; return (cumulative_us, top_level_imports)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {MODULE}"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative = None
+    imported = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, total, name = line.split("|")
+        name = name.strip()
+        imported.add(name.split(".")[0])
+        if name == MODULE:
+            cumulative = int(total)
+    return cumulative, imported
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=float(os.getenv("IMPORT_TIME_BUDGET_MS", DEFAULT_BUDGET_MS)),
+        help="maximum import time in milliseconds (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=DEFAULT_RUNS,
+        help="imports to take the best time of (default: %(default)s)",
+    )
+    args = parser.parse_args()
+
+    best = None
+    eager = set()
+    for _ in range(args.runs):
+        cumulative, imported = measure()
+        best = cumulative if best is None else min(best, cumulative)
+        eager |= imported & DEFERRED_MODULES
+
+    ok = True
+    print(f"{MODULE}: {best / 1000:.1f}ms (budget {args.budget_ms:g}ms)")
+    if best / 1000 > args.budget_ms:
+        print("✗ Import time is over budget")
+        ok = False
+    if eager:
+        print(f"✗ Imported at startup: {', '.join(sorted(eager))}")
+        ok = False
+    if ok:
+        print("✓ Startup is within budget")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,14 +6,47 @@ This script creates a comprehensive set of epics and subtasks covering all
 major components of the Bolt AI Salon Assistant application.
 
 Usage:
-    python3 create_github_issues.py
+    python3 create_github_issues.py [--concurrency N] [--requests-per-minute N]
+    python3 create_github_issues.py --sync [--manifest PATH]
+    python3 create_github_issues.py --resume [--journal PATH]
+    python3 create_github_issues.py --backend graphql [--batch-size N]
+    python3 create_github_issues.py --dry-run [...]
+    python3 create_github_issues.py --repo OWNER/A --repo OWNER/B [--repos-file PATH]
+    python3 create_github_issues.py --transport asyncio [...]
+    python3 create_github_issues.py --spec issues.jsonl|issues/|issues-to-create.json
+    python3 create_github_issues.py --export-spec issues.jsonl|issues/
+    python3 create_github_issues.py --validate [--spec PATH]
+    python3 create_github_issues.py [--cache-dir PATH | --no-cache]
+    python3 create_github_issues.py --link-dependencies [...]
+    python3 create_github_issues.py --metrics events.jsonl [--metrics-textfile PATH]
+    python3 create_github_issues.py --subtasks [--backend graphql] [...]
+    python3 create_github_issues.py --mirror issues-mirror.db [...]
+    python3 create_github_issues.py mirror [--mirror PATH] [--repo OWNER/NAME]
+    python3 create_github_issues.py query "stripe webhook" [--mirror PATH]
+    python3 create_github_issues.py cleanup [--dry-run] [--delete] [--concurrency N]
+    python3 create_github_issues.py --project OWNER/NUMBER [--milestone TITLE] [--field NAME=VALUE]
+    python3 create_github_issues.py --shard 2/4 [...]
+    python3 create_github_issues.py pull --spec issues.jsonl [--dry-run]
+    python3 create_github_issues.py scan [--root PATH] [--dry-run]
 
 Requirements:
     - PyGithub library: pip install PyGithub
+    - aiohttp, only for --transport asyncio: pip install aiohttp
     - GitHub token with repo access (set as GH_TOKEN environment variable)
     
 Configuration:
     - GITHUB_REPOSITORY: Repository name (default: cpetrula/bolt-ai-group)
+    - GITHUB_API_URL: API root, e.g. for GitHub Enterprise (default: https://api.github.com)
+    - ISSUE_CONCURRENCY: Default for --concurrency (default: 1)
+    - ISSUE_REQUESTS_PER_MINUTE: Default for --requests-per-minute (default: 80)
+    - ISSUE_MANIFEST: Default for --manifest (default: issues-manifest.json)
+    - ISSUE_JOURNAL: Default for --journal (default: issues-journal.jsonl)
+    - ISSUE_SPEC: Default for --spec (default: the built-in ISSUES list)
+    - ISSUE_CACHE_DIR: Default for --cache-dir (default: ~/.cache/create_github_issues)
+    - ISSUE_METRICS, ISSUE_METRICS_TEXTFILE: Defaults for --metrics and --metrics-textfile
+    - ISSUE_MIRROR: Default for --mirror
+    - ISSUE_SHARD: Default for --shard, e.g. 2/4
+    - ISSUE_SCAN_CACHE: Default for --scan-cache (default: issues-scan-cache.json)
 
 GitHub Token Setup:
     1. Go to: https://github.com/settings/tokens
@@ -29,12 +62,273 @@ Note:
     - Read-only tokens will result in 403 Forbidden errors
 """
 
+import argparse
+import atexit
+import contextlib
+import functools
+import hashlib
+import json
+import math
 import os
+import re
 import sys
-from github import Github, GithubException, Auth
+import threading
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from urllib.parse import quote, urlsplit
+
+
+# PyGithub pulls in requests, urllib3 and cryptography, which take longer
+# to import than everything else here. It's imported by load_github() once
+# a client is built, so --help, --dry-run without a token and
+# --export-spec start quickly. Until then GithubException is a stand-in
+# that nothing raises, which keeps the except clauses below valid.
+class GithubException(Exception):
+    """Placeholder for github.GithubException until load_github() runs."""
+
+
+def load_github():
+    """Import PyGithub and return the github module."""
+    global GithubException
+    import github
+    GithubException = github.GithubException
+    return github
 
 # Configuration
 DEFAULT_REPOSITORY = "cpetrula/bolt-ai-group"
+DEFAULT_API_URL = "https://api.github.com"
+DEFAULT_CONCURRENCY = 1
+# GitHub asks for no more than 80 content-creating requests per minute
+DEFAULT_REQUESTS_PER_MINUTE = 80
+MAX_RATE_LIMIT_RETRIES = 10
+# Wait used for secondary rate limits that come without a Retry-After header
+SECONDARY_RATE_LIMIT_WAIT = 60
+# Hidden marker appended to created issue bodies so re-runs can find them
+# even after the title has been edited on GitHub
+FINGERPRINT_MARKER = "<!-- create_github_issues:fingerprint={} -->"
+FINGERPRINT_RE = re.compile(r"<!-- create_github_issues:fingerprint=([0-9a-f]+) -->")
+DEFAULT_MANIFEST = "issues-manifest.json"
+DEFAULT_JOURNAL = "issues-journal.jsonl"
+# Issues updated this long before the last journal entry are re-checked on
+# --resume, covering requests in flight and clock skew
+RESUME_OVERLAP = 300
+DEFAULT_MIRROR = "issues-mirror.db"
+DEFAULT_SCAN_CACHE = "issues-scan-cache.json"
+# Directories the scan command never descends into
+SCAN_SKIP_DIRS = {".git", "node_modules", "__pycache__", ".venv", "venv", "dist", "build"}
+# Labels holding a --shard lease, e.g. "shard-lease-2-of-4". Their
+# description names the holder and the expiry, after which a lease left
+# behind by a killed run is taken over; the expiry is GitHub Actions' job
+# time limit.
+SHARD_LEASE_PREFIX = "shard-lease-"
+SHARD_LEASE_LABEL = SHARD_LEASE_PREFIX + "{}-of-{}"
+SHARD_LEASE_COLOR = "ededed"
+SHARD_LEASE_SECONDS = 6 * 3600
+SHARD_LEASE_RE = re.compile(r"held by (\S+) until (\S+)")
+# Timestamp format of the REST API
+GITHUB_TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+DEFAULT_BATCH_SIZE = 20
+# createLabel/updateLabel were introduced behind this GraphQL preview
+GRAPHQL_LABELS_PREVIEW = "application/vnd.github.bane-preview+json"
+# Entries with this title prefix are epics that --subtasks expands
+EPIC_PREFIX = "[EPIC]"
+# Unchecked "- [ ]" checklist items
+CHECKLIST_ITEM_RE = re.compile(r"^\s*[-*] \[ \] (.+?)\s*$", re.M)
+# "## Required Files" or "## Required Files/Directories" section
+REQUIRED_FILES_RE = re.compile(
+    r"^## Required Files(?:/Directories)?[ \t]*\n(.*?)(?=^## |\Z)", re.M | re.S
+)
+# One entry of a directory tree drawn with box characters, e.g. "│  ├─ db.ts"
+TREE_LINE_RE = re.compile(r"^((?:│  |   )*)[├└]─\s*(.+?)\s*$")
+# "## Dependencies" section of an issue body, up to the next heading
+DEPENDENCIES_RE = re.compile(r"^## Dependencies[ \t]*\n(.*?)(?=^## |\Z)", re.M | re.S)
+# Words that don't identify an epic when matching dependency names
+GENERIC_DEPENDENCY_WORDS = {
+    "a", "all", "an", "and", "api", "apis", "backend", "frontend", "in",
+    "of", "the", "system",
+}
+# Conditional-request cache limits
+DEFAULT_CACHE_DIR = os.path.join("~", ".cache", "create_github_issues")
+CACHE_MAX_BYTES = 50 * 1024 * 1024
+CACHE_MAX_AGE = 7 * 24 * 3600
+# Assumed round-trip time per request when estimating a --dry-run
+ESTIMATED_REQUEST_SECONDS = 0.5
+# Secondary rate limit cost of reads and writes (REST and GraphQL alike)
+READ_POINTS = 1
+WRITE_POINTS = 5
+# Length of a primary rate-limit window
+RATE_LIMIT_WINDOW = 3600
+# Limits GitHub enforces on issues and labels
+MAX_TITLE_LENGTH = 256
+MAX_BODY_LENGTH = 65536
+HEX_COLOR_RE = re.compile(r"[0-9a-fA-F]{6}")
+# "#123" issue references, as written by --link-dependencies
+ISSUE_REFERENCE_RE = re.compile(r"(?<![\w&])#(\d+)\b")
+
+
+# Sections of an issue body in the order they are rendered: (heading,
+# IssueSpec field, kind). "list" fields hold "- " bullets, "checklist"
+# fields unchecked "- [ ]" items and "text" fields markdown as written.
+BODY_SECTIONS = (
+    ("Description", "description", "text"),
+    ("Objectives", "objectives", "list"),
+    ("Tasks", "tasks", "list"),
+    ("Acceptance Criteria", "acceptance_criteria", "checklist"),
+    ("Required Files/Directories", "required_files", "text"),
+    ("Dependencies", "dependencies", "text"),
+    ("API Endpoints", "api_endpoints", "text"),
+    ("Subtasks", "subtasks", "text"),
+)
+SECTION_HEADING_RE = re.compile(r"^## (.+)\n", re.M)
+BULLET_RE = re.compile(r"^- (.+)$", re.M)
+
+
+@functools.lru_cache(maxsize=4096)
+def render_body(sections):
+    """Render the (field, value) pairs of an IssueSpec into markdown.
+
+    Memoized on the section contents, so entries that come back unchanged,
+    e.g. on another pass over a streamed spec, aren't rendered again.
+    """
+    parts = []
+    for (heading, _, kind), value in zip(BODY_SECTIONS, sections):
+        if not value:
+            continue
+        if kind == "list":
+            value = "\n".join(f"- {item}" for item in value)
+        elif kind == "checklist":
+            value = "\n".join(f"- [ ] {item}" for item in value)
+        elif heading == "Required Files/Directories" and not value.startswith("```"):
+            # A plain list of files rather than a directory tree
+            heading = "Required Files"
+        parts.append(f"## {heading}\n\n{value}")
+    return "\n\n".join(parts)
+
+
+class IssueSpec:
+    """One issue of the spec, with its body kept as typed sections.
+
+    The body is rendered from the sections on first use and cached, as is
+    the digest used by --sync. It unpacks like a (title, body, labels)
+    tuple. milestone is a milestone title, project a Projects v2 board as
+    "OWNER/NUMBER" and fields maps the board's field names to values,
+    e.g. {"Status": "Todo", "Iteration": "@current"}.
+    """
+
+    # The keyword arguments of __init__ besides body, in order
+    _FIELDS = (
+        "title", "labels", "description", "objectives", "tasks",
+        "acceptance_criteria", "required_files", "dependencies",
+        "api_endpoints", "subtasks", "milestone", "project", "fields",
+    )
+    __slots__ = _FIELDS + ("_body", "_digest")
+
+    def __init__(self, title, labels=(), description="", objectives=(), tasks=(),
+                 acceptance_criteria=(), required_files="", dependencies="",
+                 api_endpoints="", subtasks="", milestone=None, project=None,
+                 fields=None, body=None):
+        self.title = title
+        self.labels = list(labels)
+        self.description = description
+        self.objectives = tuple(objectives)
+        self.tasks = tuple(tasks)
+        self.acceptance_criteria = tuple(acceptance_criteria)
+        self.required_files = required_files
+        self.dependencies = dependencies
+        self.api_endpoints = api_endpoints
+        self.subtasks = subtasks
+        self.milestone = milestone
+        self.project = project
+        self.fields = dict(fields or {})
+        # Set when the body came from markdown that the sections can't
+        # reproduce exactly; it is then used as written
+        self._body = body
+        self._digest = None
+
+    @classmethod
+    def from_markdown(cls, title, body, labels=(), milestone=None, project=None,
+                      fields=None):
+        """Parse a markdown body into sections.
+
+        Bodies that don't render back to the same text, e.g. with other
+        headings or checked items, keep their text as the body; the
+        sections are still filled in as far as they could be read.
+        """
+        parsed = {}
+        parts = SECTION_HEADING_RE.split(body)
+        known = {heading: (name, kind) for heading, name, kind in BODY_SECTIONS}
+        known["Required Files"] = known["Required Files/Directories"]
+        for heading, text in zip(parts[1::2], parts[2::2]):
+            if heading.strip() not in known:
+                continue
+            name, kind = known[heading.strip()]
+            text = text.strip("\n")
+            if kind == "list":
+                parsed[name] = BULLET_RE.findall(text)
+            elif kind == "checklist":
+                parsed[name] = CHECKLIST_ITEM_RE.findall(text)
+            else:
+                parsed[name] = text
+        spec = cls(title, labels, milestone=milestone, project=project,
+                   fields=fields, **parsed)
+        if spec.body != body:
+            spec._body = body
+        return spec
+
+    def sections(self):
+        """Return the section values in BODY_SECTIONS order."""
+        return tuple(getattr(self, name) for _, name, _ in BODY_SECTIONS)
+
+    def replace(self, **changes):
+        """Return a copy with some fields changed."""
+        values = {name: getattr(self, name) for name in self._FIELDS}
+        values.update(changes)
+        return type(self)(**values)
+
+    @property
+    def body(self):
+        if self._body is None:
+            self._body = render_body(self.sections())
+        return self._body
+
+    @property
+    def structured(self):
+        """Check whether the body is exactly what the sections render."""
+        return self.body == render_body(self.sections())
+
+    @property
+    def digest(self):
+        """Return the sha256 of the title, body and labels."""
+        if self._digest is None:
+            payload = json.dumps(
+                [self.title, self.body, sorted(self.labels)], ensure_ascii=False
+            )
+            self._digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        return self._digest
+
+    def __iter__(self):
+        return iter((self.title, self.body, self.labels))
+
+    def __getitem__(self, index):
+        return (self.title, self.body, self.labels)[index]
+
+    def __len__(self):
+        return 3
+
+    def __repr__(self):
+        return f"IssueSpec({self.title!r})"
+
+
+def issue_placement(spec, args):
+    """Return a spec entry's placement, completed by --milestone/--project/--field."""
+    return (
+        spec.milestone or args.milestone,
+        spec.project or args.project,
+        {**args.fields, **spec.fields},
+    )
+
 
 # Issue data structure
 LABELS_TO_CREATE = [
@@ -50,39 +344,36 @@ LABELS_TO_CREATE = [
 ]
 
 # All issues to create
-# Format: (title, body, labels_list)
+# Format: IssueSpec(title, labels_list, description=..., objectives=(...), ...)
+# with the body sections of BODY_SECTIONS; add milestone=...,
+# project="OWNER/NUMBER" and fields={"Status": ...} to also put the issue on
+# a milestone and a Projects v2 board
 ISSUES = [
     # ===== EPICS =====
-    (
+    IssueSpec(
         "[EPIC] Backend Infrastructure Setup",
-        """## Description
-
-Set up the foundational backend infrastructure for the Bolt AI Salon Assistant application.
-
-## Objectives
-
-- Initialize Node.js + TypeScript project
-- Set up Express/Fastify framework
-- Configure MySQL database with ORM (Prisma or TypeORM)
-- Implement database migrations
-- Set up multi-tenant middleware
-- Configure environment variables and secrets management
-- Set up logging and error handling
-
-## Acceptance Criteria
-
-- [ ] Backend project is initialized with TypeScript
-- [ ] Express/Fastify server runs successfully
-- [ ] MySQL database is configured and accessible
-- [ ] ORM is set up with migration system
-- [ ] Multi-tenant middleware correctly identifies tenant from context
-- [ ] Environment variables are properly configured
-- [ ] Basic health check endpoint works
-- [ ] Error handling middleware is in place
-
-## Required Files/Directories
-
-```
+        ["backend", "enhancement", "database"],
+        description="Set up the foundational backend infrastructure for the Bolt AI Salon Assistant application.",
+        objectives=(
+            "Initialize Node.js + TypeScript project",
+            "Set up Express/Fastify framework",
+            "Configure MySQL database with ORM (Prisma or TypeORM)",
+            "Implement database migrations",
+            "Set up multi-tenant middleware",
+            "Configure environment variables and secrets management",
+            "Set up logging and error handling",
+        ),
+        acceptance_criteria=(
+            "Backend project is initialized with TypeScript",
+            "Express/Fastify server runs successfully",
+            "MySQL database is configured and accessible",
+            "ORM is set up with migration system",
+            "Multi-tenant middleware correctly identifies tenant from context",
+            "Environment variables are properly configured",
+            "Basic health check endpoint works",
+            "Error handling middleware is in place",
+        ),
+        required_files="""```
 backend/
 ├─ src/
 │  ├─ app.ts
@@ -96,145 +387,103 @@ backend/
 ├─ package.json
 ├─ tsconfig.json
 └─ README.md
-```
-
-## Dependencies
-
-None - this is a foundational epic
-
-## Subtasks
-
-Track progress with related subtask issues.""",
-        ["backend", "enhancement", "database"]
+```""",
+        dependencies="None - this is a foundational epic",
+        subtasks="Track progress with related subtask issues.",
     ),
-    
-    (
+    IssueSpec(
         "[EPIC] Authentication & 2FA System",
-        """## Description
-
-Implement a complete authentication system with JWT-based sessions and two-factor authentication (2FA) support.
-
-## Objectives
-
-- User signup with email/password
-- User login with JWT token generation
-- Password reset flow (forgot password)
-- 2FA setup and verification (TOTP)
-- Session management
-- Auth middleware for protected routes
-
-## Acceptance Criteria
-
-- [ ] Users can sign up with email and password
-- [ ] Passwords are securely hashed (bcrypt/argon2)
-- [ ] Users can log in and receive JWT tokens
-- [ ] JWT tokens are validated on protected routes
-- [ ] Password reset flow works end-to-end
-- [ ] 2FA can be enabled/disabled per user
-- [ ] 2FA verification works with TOTP codes
-- [ ] Auth middleware properly protects routes
-
-## Required Files/Directories
-
-```
+        ["backend", "auth", "enhancement"],
+        description="Implement a complete authentication system with JWT-based sessions and two-factor authentication (2FA) support.",
+        objectives=(
+            "User signup with email/password",
+            "User login with JWT token generation",
+            "Password reset flow (forgot password)",
+            "2FA setup and verification (TOTP)",
+            "Session management",
+            "Auth middleware for protected routes",
+        ),
+        acceptance_criteria=(
+            "Users can sign up with email and password",
+            "Passwords are securely hashed (bcrypt/argon2)",
+            "Users can log in and receive JWT tokens",
+            "JWT tokens are validated on protected routes",
+            "Password reset flow works end-to-end",
+            "2FA can be enabled/disabled per user",
+            "2FA verification works with TOTP codes",
+            "Auth middleware properly protects routes",
+        ),
+        required_files="""```
 backend/src/modules/auth/
 ├─ auth.controller.ts
 ├─ auth.service.ts
 ├─ auth.routes.ts
 ├─ jwt.utils.ts
 └─ 2fa.utils.ts
-```
-
-## Dependencies
-
-- Backend Infrastructure Setup (database, ORM)
-- User model in database
-
-## API Endpoints
-
-- `POST /api/auth/signup`
+```""",
+        dependencies="""- Backend Infrastructure Setup (database, ORM)
+- User model in database""",
+        api_endpoints="""- `POST /api/auth/signup`
 - `POST /api/auth/login`
 - `POST /api/auth/forgot-password`
 - `POST /api/auth/reset-password`
 - `POST /api/auth/2fa/setup`
 - `POST /api/auth/2fa/verify`""",
-        ["backend", "auth", "enhancement"]
     ),
-    
-    (
+    IssueSpec(
         "[EPIC] Multi-Tenant Management",
-        """## Description
-
-Implement multi-tenant architecture allowing multiple businesses (salons) to use the platform with complete data isolation.
-
-## Objectives
-
-- Create tenant data model
-- Implement tenant creation and onboarding
-- Set up data isolation mechanisms
-- Configure tenant-specific settings
-- Implement tenant context middleware
-
-## Acceptance Criteria
-
-- [ ] Tenant model includes all required fields
-- [ ] New tenants can be created through signup flow
-- [ ] All database queries are scoped to tenant_id
-- [ ] Tenant settings can be retrieved and updated
-- [ ] Tenant status transitions work correctly
-- [ ] Complete data isolation between tenants
-
-## Required Files/Directories
-
-```
+        ["backend", "enhancement", "database"],
+        description="Implement multi-tenant architecture allowing multiple businesses (salons) to use the platform with complete data isolation.",
+        objectives=(
+            "Create tenant data model",
+            "Implement tenant creation and onboarding",
+            "Set up data isolation mechanisms",
+            "Configure tenant-specific settings",
+            "Implement tenant context middleware",
+        ),
+        acceptance_criteria=(
+            "Tenant model includes all required fields",
+            "New tenants can be created through signup flow",
+            "All database queries are scoped to tenant_id",
+            "Tenant settings can be retrieved and updated",
+            "Tenant status transitions work correctly",
+            "Complete data isolation between tenants",
+        ),
+        required_files="""```
 backend/src/modules/tenants/
 ├─ tenant.model.ts
 ├─ tenant.controller.ts
 ├─ tenant.service.ts
 └─ tenant.routes.ts
-```
-
-## Dependencies
-
-- Backend Infrastructure Setup
-- Authentication system
-
-## API Endpoints
-
-- `GET /api/me` (current user & tenant)
+```""",
+        dependencies="""- Backend Infrastructure Setup
+- Authentication system""",
+        api_endpoints="""- `GET /api/me` (current user & tenant)
 - `GET /api/tenant/settings`
 - `PATCH /api/tenant/settings`""",
-        ["backend", "enhancement", "database"]
     ),
-    
-    (
+    IssueSpec(
         "[EPIC] Employee & Service Management",
-        """## Description
-
-Implement CRUD operations for managing employees/contractors and services that a salon offers.
-
-## Objectives
-
-- Create employee data model with schedules
-- Create service data model with add-ons
-- Implement employee CRUD operations
-- Implement service CRUD operations
-- Link employees to services they can perform
-- Seed default salon services
-
-## Acceptance Criteria
-
-- [ ] Employees can be created, read, updated, and deleted
-- [ ] Employee schedules (work days/hours) can be managed
-- [ ] Services can be created, read, updated, and deleted
-- [ ] Service add-ons can be defined
-- [ ] Employees can be linked to services they perform
-- [ ] Default salon services are seeded for new tenants
-- [ ] All operations respect multi-tenant isolation
-
-## Required Files/Directories
-
-```
+        ["backend", "enhancement", "database"],
+        description="Implement CRUD operations for managing employees/contractors and services that a salon offers.",
+        objectives=(
+            "Create employee data model with schedules",
+            "Create service data model with add-ons",
+            "Implement employee CRUD operations",
+            "Implement service CRUD operations",
+            "Link employees to services they can perform",
+            "Seed default salon services",
+        ),
+        acceptance_criteria=(
+            "Employees can be created, read, updated, and deleted",
+            "Employee schedules (work days/hours) can be managed",
+            "Services can be created, read, updated, and deleted",
+            "Service add-ons can be defined",
+            "Employees can be linked to services they perform",
+            "Default salon services are seeded for new tenants",
+            "All operations respect multi-tenant isolation",
+        ),
+        required_files="""```
 backend/src/modules/employees/
 ├─ employee.model.ts
 ├─ employee.controller.ts
@@ -246,16 +495,10 @@ backend/src/modules/services/
 ├─ service.controller.ts
 ├─ service.service.ts
 └─ service.routes.ts
-```
-
-## Dependencies
-
-- Backend Infrastructure Setup
-- Multi-Tenant Management
-
-## API Endpoints
-
-### Employees
+```""",
+        dependencies="""- Backend Infrastructure Setup
+- Multi-Tenant Management""",
+        api_endpoints="""### Employees
 - `GET /api/employees`
 - `POST /api/employees`
 - `PATCH /api/employees/:id`
@@ -268,90 +511,68 @@ backend/src/modules/services/
 - `POST /api/services`
 - `PATCH /api/services/:id`
 - `DELETE /api/services/:id`""",
-        ["backend", "enhancement", "database"]
     ),
-    
-    (
+    IssueSpec(
         "[EPIC] Appointments & Availability System",
-        """## Description
-
-Implement appointment booking system with availability checking and conflict detection.
-
-## Objectives
-
-- Create appointment data model
-- Implement availability calculation algorithm
-- Implement appointment CRUD operations
-- Add conflict detection (prevent double-booking)
-- Support appointment modifications and cancellations
-- Track cancellation reasons
-
-## Acceptance Criteria
-
-- [ ] Appointments can be created with all required fields
-- [ ] Availability calculation considers employee schedules and existing appointments
-- [ ] System prevents double-booking of employees
-- [ ] Appointments can be modified (reschedule)
-- [ ] Appointments can be canceled with reason tracking
-- [ ] Appointment status tracking works correctly
-- [ ] Support for service add-ons in appointments
-
-## Required Files/Directories
-
-```
+        ["backend", "enhancement", "database"],
+        description="Implement appointment booking system with availability checking and conflict detection.",
+        objectives=(
+            "Create appointment data model",
+            "Implement availability calculation algorithm",
+            "Implement appointment CRUD operations",
+            "Add conflict detection (prevent double-booking)",
+            "Support appointment modifications and cancellations",
+            "Track cancellation reasons",
+        ),
+        acceptance_criteria=(
+            "Appointments can be created with all required fields",
+            "Availability calculation considers employee schedules and existing appointments",
+            "System prevents double-booking of employees",
+            "Appointments can be modified (reschedule)",
+            "Appointments can be canceled with reason tracking",
+            "Appointment status tracking works correctly",
+            "Support for service add-ons in appointments",
+        ),
+        required_files="""```
 backend/src/modules/appointments/
 ├─ appointment.model.ts
 ├─ appointment.controller.ts
 ├─ appointment.service.ts
 ├─ availability.service.ts
 └─ appointment.routes.ts
-```
-
-## Dependencies
-
-- Employee & Service Management
-- Multi-Tenant Management
-
-## API Endpoints
-
-- `GET /api/appointments`
+```""",
+        dependencies="""- Employee & Service Management
+- Multi-Tenant Management""",
+        api_endpoints="""- `GET /api/appointments`
 - `POST /api/appointments`
 - `PATCH /api/appointments/:id`
 - `DELETE /api/appointments/:id`
 - `GET /api/availability` (for AI and frontend)""",
-        ["backend", "enhancement", "database"]
     ),
-    
-    (
+    IssueSpec(
         "[EPIC] Billing & Subscriptions (Stripe)",
-        """## Description
-
-Integrate Stripe for handling recurring subscriptions and payments.
-
-## Objectives
-
-- Create subscription data model
-- Implement Stripe customer creation
-- Set up subscription plans (monthly: $295, yearly: $2,832)
-- Create checkout session flow
-- Implement webhook handlers for Stripe events
-- Create customer portal integration
-- Handle subscription lifecycle
-
-## Acceptance Criteria
-
-- [ ] Subscription model tracks Stripe IDs
-- [ ] New signups are redirected to Stripe checkout
-- [ ] Successful payment webhook activates tenant
-- [ ] Monthly ($295) and yearly ($2,832) plans are configured
-- [ ] Subscription status is synced via webhooks
-- [ ] Customer portal allows plan management
-- [ ] Cancellation flow updates both Stripe and database
-- [ ] Subscription status affects tenant access
-
-## Required Files/Directories
-
-```
+        ["backend", "billing", "enhancement"],
+        description="Integrate Stripe for handling recurring subscriptions and payments.",
+        objectives=(
+            "Create subscription data model",
+            "Implement Stripe customer creation",
+            "Set up subscription plans (monthly: $295, yearly: $2,832)",
+            "Create checkout session flow",
+            "Implement webhook handlers for Stripe events",
+            "Create customer portal integration",
+            "Handle subscription lifecycle",
+        ),
+        acceptance_criteria=(
+            "Subscription model tracks Stripe IDs",
+            "New signups are redirected to Stripe checkout",
+            "Successful payment webhook activates tenant",
+            "Monthly ($295) and yearly ($2,832) plans are configured",
+            "Subscription status is synced via webhooks",
+            "Customer portal allows plan management",
+            "Cancellation flow updates both Stripe and database",
+            "Subscription status affects tenant access",
+        ),
+        required_files="""```
 backend/src/modules/billing/
 ├─ subscription.model.ts
 ├─ billing.controller.ts
@@ -359,103 +580,75 @@ backend/src/modules/billing/
 ├─ stripe.service.ts
 ├─ webhook.handler.ts
 └─ billing.routes.ts
-```
-
-## Dependencies
-
-- Backend Infrastructure Setup
+```""",
+        dependencies="""- Backend Infrastructure Setup
 - Multi-Tenant Management
-- Authentication System
-
-## API Endpoints
-
-- `GET /api/billing/subscription`
+- Authentication System""",
+        api_endpoints="""- `GET /api/billing/subscription`
 - `POST /api/billing/create-checkout-session`
 - `POST /api/billing/portal-session`
 - `POST /api/webhooks/stripe`""",
-        ["backend", "billing", "enhancement"]
     ),
-    
-    (
+    IssueSpec(
         "[EPIC] Telephony Integration (Twilio)",
-        """## Description
-
-Integrate Twilio for phone number provisioning, call handling, and SMS notifications.
-
-## Objectives
-
-- Set up Twilio account and API integration
-- Implement phone number provisioning for new tenants
-- Create webhook handlers for incoming calls
-- Create webhook handlers for incoming SMS
-- Implement SMS notification system
-- Create call logging functionality
-
-## Acceptance Criteria
-
-- [ ] New tenants automatically get a Twilio phone number
-- [ ] Incoming call webhooks identify tenant and forward to AI
-- [ ] Incoming SMS webhooks are handled
-- [ ] SMS notifications can be sent to customers
-- [ ] SMS notifications can be sent to employees
-- [ ] Call logs are created with duration and metadata
-- [ ] Demo salon has a working phone number
-
-## Required Files/Directories
-
-```
+        ["backend", "telephony", "enhancement"],
+        description="Integrate Twilio for phone number provisioning, call handling, and SMS notifications.",
+        objectives=(
+            "Set up Twilio account and API integration",
+            "Implement phone number provisioning for new tenants",
+            "Create webhook handlers for incoming calls",
+            "Create webhook handlers for incoming SMS",
+            "Implement SMS notification system",
+            "Create call logging functionality",
+        ),
+        acceptance_criteria=(
+            "New tenants automatically get a Twilio phone number",
+            "Incoming call webhooks identify tenant and forward to AI",
+            "Incoming SMS webhooks are handled",
+            "SMS notifications can be sent to customers",
+            "SMS notifications can be sent to employees",
+            "Call logs are created with duration and metadata",
+            "Demo salon has a working phone number",
+        ),
+        required_files="""```
 backend/src/modules/telephony/
 ├─ twilio.service.ts
 ├─ telephony.controller.ts
 ├─ call.handler.ts
 ├─ sms.handler.ts
 └─ telephony.routes.ts
-```
-
-## Dependencies
-
-- Backend Infrastructure Setup
+```""",
+        dependencies="""- Backend Infrastructure Setup
 - Multi-Tenant Management
-- Appointments System
-
-## API Endpoints
-
-- `POST /api/webhooks/twilio/voice` (incoming calls)
+- Appointments System""",
+        api_endpoints="""- `POST /api/webhooks/twilio/voice` (incoming calls)
 - `POST /api/webhooks/twilio/sms` (incoming SMS)""",
-        ["backend", "telephony", "enhancement"]
     ),
-    
-    (
+    IssueSpec(
         "[EPIC] AI Assistant Integration",
-        """## Description
-
-Integrate AI capabilities for handling customer calls, understanding intent, and performing actions.
-
-## Objectives
-
-- Design pluggable AI provider interface
-- Integrate with Vapi for call orchestration
-- Integrate with OpenAI for LLM/NLU
-- Configure TTS (ElevenLabs or OpenAI)
-- Create AI-callable API endpoints
-- Implement intent detection and handling
-- Configure per-tenant AI settings
-
-## Acceptance Criteria
-
-- [ ] AI provider interface allows swapping implementations
-- [ ] Vapi integration handles call orchestration
-- [ ] OpenAI integration processes natural language
-- [ ] TTS generates natural voice responses
-- [ ] AI can query availability via API
-- [ ] AI can create/modify/cancel appointments via API
-- [ ] AI can retrieve service information
-- [ ] AI can answer questions about hours
-- [ ] Per-tenant configuration (greeting, tone, business hours)
-
-## Required Files/Directories
-
-```
+        ["backend", "ai", "enhancement"],
+        description="Integrate AI capabilities for handling customer calls, understanding intent, and performing actions.",
+        objectives=(
+            "Design pluggable AI provider interface",
+            "Integrate with Vapi for call orchestration",
+            "Integrate with OpenAI for LLM/NLU",
+            "Configure TTS (ElevenLabs or OpenAI)",
+            "Create AI-callable API endpoints",
+            "Implement intent detection and handling",
+            "Configure per-tenant AI settings",
+        ),
+        acceptance_criteria=(
+            "AI provider interface allows swapping implementations",
+            "Vapi integration handles call orchestration",
+            "OpenAI integration processes natural language",
+            "TTS generates natural voice responses",
+            "AI can query availability via API",
+            "AI can create/modify/cancel appointments via API",
+            "AI can retrieve service information",
+            "AI can answer questions about hours",
+            "Per-tenant configuration (greeting, tone, business hours)",
+        ),
+        required_files="""```
 backend/src/modules/ai-assistant/
 ├─ ai-provider.interface.ts
 ├─ vapi.service.ts
@@ -463,54 +656,40 @@ backend/src/modules/ai-assistant/
 ├─ ai.controller.ts
 ├─ intent.handler.ts
 └─ ai.routes.ts
-```
-
-## Dependencies
-
-- Backend Infrastructure Setup
+```""",
+        dependencies="""- Backend Infrastructure Setup
 - Appointments & Availability System
 - Telephony Integration
-- Employee & Service Management
-
-## API Endpoints
-
-- `POST /api/ai/availability`
+- Employee & Service Management""",
+        api_endpoints="""- `POST /api/ai/availability`
 - `POST /api/ai/appointments`
 - `POST /api/ai/services`""",
-        ["backend", "ai", "enhancement"]
     ),
-    
-    (
+    IssueSpec(
         "[EPIC] Frontend Application (Vue 3)",
-        """## Description
-
-Set up the Vue 3 frontend application with Vite, Tailwind CSS, PrimeVue, and proper routing.
-
-## Objectives
-
-- Initialize Vite + Vue 3 project with TypeScript
-- Set up Vue Router for SPA routing
-- Configure Pinia for state management
-- Integrate PrimeVue component library
-- Set up Tailwind CSS
-- Configure authentication state management
-- Create layout components
-- Set up API client for backend communication
-
-## Acceptance Criteria
-
-- [ ] Frontend project builds and runs successfully
-- [ ] Vue Router is configured with public and authenticated routes
-- [ ] Pinia stores are set up for user and tenant state
-- [ ] PrimeVue components are available globally
-- [ ] Tailwind CSS utilities work correctly
-- [ ] Authentication guard protects /app routes
-- [ ] API client handles JWT tokens automatically
-- [ ] Responsive layout works on mobile and desktop
-
-## Required Files/Directories
-
-```
+        ["frontend", "enhancement"],
+        description="Set up the Vue 3 frontend application with Vite, Tailwind CSS, PrimeVue, and proper routing.",
+        objectives=(
+            "Initialize Vite + Vue 3 project with TypeScript",
+            "Set up Vue Router for SPA routing",
+            "Configure Pinia for state management",
+            "Integrate PrimeVue component library",
+            "Set up Tailwind CSS",
+            "Configure authentication state management",
+            "Create layout components",
+            "Set up API client for backend communication",
+        ),
+        acceptance_criteria=(
+            "Frontend project builds and runs successfully",
+            "Vue Router is configured with public and authenticated routes",
+            "Pinia stores are set up for user and tenant state",
+            "PrimeVue components are available globally",
+            "Tailwind CSS utilities work correctly",
+            "Authentication guard protects /app routes",
+            "API client handles JWT tokens automatically",
+            "Responsive layout works on mobile and desktop",
+        ),
+        required_files="""```
 frontend/
 ├─ src/
 │  ├─ main.ts
@@ -532,46 +711,35 @@ frontend/
 ├─ vite.config.ts
 ├─ tailwind.config.js
 └─ README.md
-```
-
-## Dependencies
-
-None - this is a foundational epic""",
-        ["frontend", "enhancement"]
+```""",
+        dependencies="None - this is a foundational epic",
     ),
-    
-    (
+    IssueSpec(
         "[EPIC] Public Website Pages",
-        """## Description
-
-Create all public-facing pages for the marketing website.
-
-## Objectives
-
-- Create Home page with hero section and demo phone number
-- Create Sign Up page with Stripe integration
-- Create Login page with 2FA support
-- Create Forgot Password page
-- Create How It Works page
-- Create FAQ page
-
-## Acceptance Criteria
-
-- [ ] Home page displays professional hero section
-- [ ] Home page shows prominent demo phone number
-- [ ] Home page includes value propositions
-- [ ] Sign Up page collects business and owner information
-- [ ] Sign Up page redirects to Stripe checkout
-- [ ] Login page handles JWT authentication
-- [ ] Login page supports 2FA verification
-- [ ] Forgot Password page sends reset email
-- [ ] How It Works page explains the service clearly
-- [ ] FAQ page answers common questions
-- [ ] All pages are responsive and accessible
-
-## Required Files/Directories
-
-```
+        ["frontend", "enhancement"],
+        description="Create all public-facing pages for the marketing website.",
+        objectives=(
+            "Create Home page with hero section and demo phone number",
+            "Create Sign Up page with Stripe integration",
+            "Create Login page with 2FA support",
+            "Create Forgot Password page",
+            "Create How It Works page",
+            "Create FAQ page",
+        ),
+        acceptance_criteria=(
+            "Home page displays professional hero section",
+            "Home page shows prominent demo phone number",
+            "Home page includes value propositions",
+            "Sign Up page collects business and owner information",
+            "Sign Up page redirects to Stripe checkout",
+            "Login page handles JWT authentication",
+            "Login page supports 2FA verification",
+            "Forgot Password page sends reset email",
+            "How It Works page explains the service clearly",
+            "FAQ page answers common questions",
+            "All pages are responsive and accessible",
+        ),
+        required_files="""```
 frontend/src/pages/
 ├─ HomePage.vue
 ├─ SignUpPage.vue
@@ -579,49 +747,38 @@ frontend/src/pages/
 ├─ ForgotPasswordPage.vue
 ├─ HowItWorksPage.vue
 └─ FAQPage.vue
-```
-
-## Dependencies
-
-- Frontend Application (Vue 3)
+```""",
+        dependencies="""- Frontend Application (Vue 3)
 - Backend Authentication API
 - Backend Billing API""",
-        ["frontend", "enhancement"]
     ),
-    
-    (
+    IssueSpec(
         "[EPIC] Admin Dashboard Pages",
-        """## Description
-
-Create all authenticated admin dashboard pages for salon management.
-
-## Objectives
-
-- Create Dashboard overview page
-- Create Employees management page
-- Create Services management page
-- Create Appointments calendar/list page
-- Create Billing & subscription page
-- Create Reports page
-- Create Settings page
-
-## Acceptance Criteria
-
-- [ ] Dashboard shows key metrics and next appointments
-- [ ] Employees page has CRUD functionality with schedules
-- [ ] Services page has CRUD functionality with pricing
-- [ ] Appointments page shows calendar and list views
-- [ ] Appointments page allows manual booking/editing
-- [ ] Billing page shows current plan and payment method
-- [ ] Billing page links to Stripe customer portal
-- [ ] Reports page displays call logs and statistics
-- [ ] Reports page shows appointment analytics
-- [ ] Settings page manages business profile and preferences
-- [ ] All pages respect multi-tenant isolation
-
-## Required Files/Directories
-
-```
+        ["frontend", "enhancement"],
+        description="Create all authenticated admin dashboard pages for salon management.",
+        objectives=(
+            "Create Dashboard overview page",
+            "Create Employees management page",
+            "Create Services management page",
+            "Create Appointments calendar/list page",
+            "Create Billing & subscription page",
+            "Create Reports page",
+            "Create Settings page",
+        ),
+        acceptance_criteria=(
+            "Dashboard shows key metrics and next appointments",
+            "Employees page has CRUD functionality with schedules",
+            "Services page has CRUD functionality with pricing",
+            "Appointments page shows calendar and list views",
+            "Appointments page allows manual booking/editing",
+            "Billing page shows current plan and payment method",
+            "Billing page links to Stripe customer portal",
+            "Reports page displays call logs and statistics",
+            "Reports page shows appointment analytics",
+            "Settings page manages business profile and preferences",
+            "All pages respect multi-tenant isolation",
+        ),
+        required_files="""```
 frontend/src/pages/
 ├─ DashboardPage.vue
 ├─ EmployeesPage.vue
@@ -630,91 +787,66 @@ frontend/src/pages/
 ├─ BillingPage.vue
 ├─ ReportsPage.vue
 └─ SettingsPage.vue
-```
-
-## Dependencies
-
-- Frontend Application (Vue 3)
+```""",
+        dependencies="""- Frontend Application (Vue 3)
 - All backend APIs""",
-        ["frontend", "enhancement"]
     ),
-    
-    (
+    IssueSpec(
         "[EPIC] Reporting & Analytics",
-        """## Description
-
-Implement reporting and analytics features for call logs, appointments, and revenue.
-
-## Objectives
-
-- Create call logs data model
-- Implement call logging on each call
-- Create reports API endpoints
-- Calculate appointment statistics
-- Calculate revenue metrics
-- Display reports in frontend
-
-## Acceptance Criteria
-
-- [ ] All calls are logged with metadata
-- [ ] Call reports show total calls and breakdown by reason
-- [ ] Appointment reports show upcoming and past appointments
-- [ ] Cancellation reasons are tracked and reported
-- [ ] Revenue reports show total and per-service breakdown
-- [ ] Reports can be filtered by date range
-- [ ] Reports display with charts/tables in frontend
-
-## Required Files/Directories
-
-```
+        ["backend", "frontend", "enhancement"],
+        description="Implement reporting and analytics features for call logs, appointments, and revenue.",
+        objectives=(
+            "Create call logs data model",
+            "Implement call logging on each call",
+            "Create reports API endpoints",
+            "Calculate appointment statistics",
+            "Calculate revenue metrics",
+            "Display reports in frontend",
+        ),
+        acceptance_criteria=(
+            "All calls are logged with metadata",
+            "Call reports show total calls and breakdown by reason",
+            "Appointment reports show upcoming and past appointments",
+            "Cancellation reasons are tracked and reported",
+            "Revenue reports show total and per-service breakdown",
+            "Reports can be filtered by date range",
+            "Reports display with charts/tables in frontend",
+        ),
+        required_files="""```
 backend/src/modules/reports/
 ├─ call-log.model.ts
 ├─ reports.controller.ts
 ├─ reports.service.ts
 └─ reports.routes.ts
-```
-
-## Dependencies
-
-- Telephony Integration
+```""",
+        dependencies="""- Telephony Integration
 - Appointments System
-- Frontend Dashboard Pages
-
-## API Endpoints
-
-- `GET /api/reports/calls`
+- Frontend Dashboard Pages""",
+        api_endpoints="""- `GET /api/reports/calls`
 - `GET /api/reports/appointments`
 - `GET /api/reports/revenue`""",
-        ["backend", "frontend", "enhancement"]
     ),
-    
-    (
+    IssueSpec(
         "[EPIC] Documentation",
-        """## Description
-
-Create comprehensive documentation for the project.
-
-## Objectives
-
-- Write architecture documentation
-- Document all API endpoints
-- Document database schema
-- Document AI conversation flows
-- Create developer setup guide
-- Create deployment guide
-
-## Acceptance Criteria
-
-- [ ] ARCHITECTURE.md explains system design
-- [ ] API.md documents all endpoints with examples
-- [ ] DATA_MODEL.md shows complete database schema
-- [ ] AI_FLOW.md explains AI conversation logic
-- [ ] Setup guide allows new developers to run locally
-- [ ] Deployment guide covers production setup
-
-## Required Files/Directories
-
-```
+        ["docs", "enhancement"],
+        description="Create comprehensive documentation for the project.",
+        objectives=(
+            "Write architecture documentation",
+            "Document all API endpoints",
+            "Document database schema",
+            "Document AI conversation flows",
+            "Create developer setup guide",
+            "Create deployment guide",
+        ),
+        acceptance_criteria=(
+            "ARCHITECTURE.md explains system design",
+            "API.md documents all endpoints with examples",
+            "DATA_MODEL.md shows complete database schema",
+            "AI_FLOW.md explains AI conversation logic",
+            "Setup guide allows new developers to run locally",
+            "Deployment guide covers production setup",
+        ),
+        required_files="""```
 docs/
 ├─ ARCHITECTURE.md
 ├─ API.md
@@ -722,205 +854,4348 @@ docs/
 ├─ AI_FLOW.md
 ├─ SETUP.md
 └─ DEPLOYMENT.md
-```
-
-## Dependencies
-
-- All other epics""",
-        ["docs", "enhancement"]
+```""",
+        dependencies="- All other epics",
     ),
-    
-    (
+    IssueSpec(
         "Create Branding Assets (Logo & Favicon)",
-        """## Description
-
-Create initial branding assets for Bolt AI Group.
-
-## Tasks
-
-- Design simple logo with "Bolt AI Group" text and bolt icon
-- Create logo.svg file
-- Create favicon.ico file
-- Use consistent color scheme
-- Ensure logo works on light and dark backgrounds
-
-## Acceptance Criteria
-
-- [ ] logo.svg file exists in frontend/public/
-- [ ] favicon.ico file exists in frontend/public/
-- [ ] Logo is clean and professional
-- [ ] Logo includes company name and bolt icon
-- [ ] Favicon is simplified bolt icon
-- [ ] Assets are optimized for web
-
-## Required Files
-
-- `frontend/public/logo.svg`
-- `frontend/public/favicon.ico`
-
-## Dependencies
-
-**Epic:** Frontend Application (Vue 3)""",
-        ["frontend", "enhancement"]
+        ["frontend", "enhancement"],
+        description="Create initial branding assets for Bolt AI Group.",
+        tasks=(
+            "Design simple logo with \"Bolt AI Group\" text and bolt icon",
+            "Create logo.svg file",
+            "Create favicon.ico file",
+            "Use consistent color scheme",
+            "Ensure logo works on light and dark backgrounds",
+        ),
+        acceptance_criteria=(
+            "logo.svg file exists in frontend/public/",
+            "favicon.ico file exists in frontend/public/",
+            "Logo is clean and professional",
+            "Logo includes company name and bolt icon",
+            "Favicon is simplified bolt icon",
+            "Assets are optimized for web",
+        ),
+        required_files="""- `frontend/public/logo.svg`
+- `frontend/public/favicon.ico`""",
+        dependencies="**Epic:** Frontend Application (Vue 3)",
     ),
-    
-    (
+    IssueSpec(
         "Set up Demo Salon Tenant",
-        """## Description
-
-Create and configure a demo salon tenant for the public demo phone number.
-
-## Tasks
-
-- Create demo tenant in database
-- Provision Twilio number for demo
-- Seed demo services with pricing
-- Create demo employees with schedules
-- Configure AI for demo tenant
-- Add demo phone number to home page
-
-## Acceptance Criteria
-
-- [ ] Demo tenant exists with name "Demo Salon"
-- [ ] Demo tenant has working Twilio phone number
-- [ ] Demo services include common salon services
-- [ ] Demo has 2-3 stylists with varied schedules
-- [ ] AI is configured for demo tenant
-- [ ] Demo phone number is prominently displayed on home page
-- [ ] Calls to demo number work end-to-end
+        ["backend", "ai", "telephony", "enhancement"],
+        description="Create and configure a demo salon tenant for the public demo phone number.",
+        tasks=(
+            "Create demo tenant in database",
+            "Provision Twilio number for demo",
+            "Seed demo services with pricing",
+            "Create demo employees with schedules",
+            "Configure AI for demo tenant",
+            "Add demo phone number to home page",
+        ),
+        acceptance_criteria=(
+            "Demo tenant exists with name \"Demo Salon\"",
+            "Demo tenant has working Twilio phone number",
+            "Demo services include common salon services",
+            "Demo has 2-3 stylists with varied schedules",
+            "AI is configured for demo tenant",
+            "Demo phone number is prominently displayed on home page",
+            "Calls to demo number work end-to-end",
+        ),
+        required_files="- Database seed script for demo tenant",
+        dependencies="**Requires:** Tenant onboarding, Telephony integration, AI integration, Services seeding",
+    ),
+    IssueSpec(
+        "Set up Docker Compose for Local Development",
+        ["backend", "database", "enhancement", "docs"],
+        description="Create docker-compose.yml for easy local development setup.",
+        tasks=(
+            "Create docker-compose.yml file",
+            "Add MySQL service",
+            "Add backend service",
+            "Add frontend service (optional)",
+            "Configure environment variables",
+            "Add volume mounts for data persistence",
+            "Document usage in README",
+        ),
+        acceptance_criteria=(
+            "docker-compose.yml exists in root",
+            "`docker-compose up` starts MySQL",
+            "MySQL is accessible to backend",
+            "Environment variables are configured",
+            "Data persists between restarts",
+            "README documents Docker setup",
+        ),
+        required_files="""- `docker-compose.yml`
+- `.env.example`""",
+        dependencies="**Epic:** Backend Infrastructure Setup",
+    ),
+]
 
-## Required Files
 
-- Database seed script for demo tenant
+def parse_field(value):
+    """Parse a NAME=VALUE --field argument."""
+    name, sep, field_value = value.partition("=")
+    if not sep or not name.strip():
+        raise argparse.ArgumentTypeError(f"expected NAME=VALUE, got '{value}'")
+    return name.strip(), field_value.strip()
 
-## Dependencies
 
-**Requires:** Tenant onboarding, Telephony integration, AI integration, Services seeding""",
-        ["backend", "ai", "telephony", "enhancement"]
-    ),
-    
-    (
-        "Set up Docker Compose for Local Development",
-        """## Description
+def parse_shard(value):
+    """Parse an I/N --shard argument into (index, count)."""
+    index, sep, count = value.partition("/")
+    try:
+        index, count = int(index), int(count)
+    except ValueError:
+        index = count = 0
+    if not sep or not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(
+            f"expected I/N with 1 <= I <= N, got '{value}'"
+        )
+    return index, count
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Create GitHub issues for the Bolt AI Group project."
+    )
+    parser.add_argument(
+        "command",
+        nargs="?",
+        choices=("create", "cleanup", "mirror", "query", "pull", "scan"),
+        default="create",
+        help="create labels and issues (default), close duplicate issues, "
+             "update the local issue mirror, search it offline, merge "
+             "edits made on GitHub back into the --spec file, or check the "
+             "Required Files of each issue against the working tree",
+    )
+    parser.add_argument(
+        "terms",
+        nargs="*",
+        help="search terms for query, in SQLite FTS5 syntax",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=int(os.getenv("ISSUE_CONCURRENCY", DEFAULT_CONCURRENCY)),
+        help="number of issues to create in parallel (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--requests-per-minute",
+        type=float,
+        default=float(
+            os.getenv("ISSUE_REQUESTS_PER_MINUTE", DEFAULT_REQUESTS_PER_MINUTE)
+        ),
+        help="upper bound on API requests per minute (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--allow-duplicates",
+        action="store_true",
+        help="create every issue even if it already exists in the repository",
+    )
+    parser.add_argument(
+        "--sync",
+        action="store_true",
+        help="create new issues and update only those whose spec changed "
+             "since the last sync, using the manifest",
+    )
+    parser.add_argument(
+        "--manifest",
+        default=os.getenv("ISSUE_MANIFEST", DEFAULT_MANIFEST),
+        help="manifest file used by --sync (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--journal",
+        default=os.getenv("ISSUE_JOURNAL", DEFAULT_JOURNAL),
+        help="append-only log of completed operations, used by --resume "
+             "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="continue an interrupted run from its journal instead of "
+             "listing existing labels and issues",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=("rest", "graphql"),
+        default="rest",
+        help="API used to create labels and issues (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help="mutations per GraphQL request (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--prune-labels",
+        action="store_true",
+        help="delete repository labels that are not in LABELS_TO_CREATE",
+    )
+    parser.add_argument(
+        "--dry-run", "--plan",
+        dest="dry_run",
+        action="store_true",
+        help="print the API calls a run would make and their estimated cost "
+             "without writing anything; works offline when no token is set",
+    )
+    parser.add_argument(
+        "--spec",
+        default=os.getenv("ISSUE_SPEC"),
+        help="read issues from a JSON Lines file, a directory of markdown "
+             "files with front matter, or an issues-to-create.json style file "
+             "instead of the built-in ISSUES list",
+    )
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        help="check the issue spec and labels and exit; this check also "
+             "runs before every other mode",
+    )
+    parser.add_argument(
+        "--export-spec",
+        metavar="PATH",
+        help="write the issue spec to a JSON Lines file (.jsonl) or a "
+             "directory of markdown files and exit",
+    )
+    parser.add_argument(
+        "--repo",
+        action="append",
+        metavar="OWNER/NAME",
+        help="target repository; repeat to process several repositories "
+             "concurrently (default: GITHUB_REPOSITORY)",
+    )
+    parser.add_argument(
+        "--repos-file",
+        metavar="PATH",
+        help="file listing target repositories, one OWNER/NAME per line",
+    )
+    parser.add_argument(
+        "--transport",
+        choices=("pygithub", "asyncio"),
+        default="pygithub",
+        help="HTTP client: PyGithub, or a pooled keep-alive aiohttp client "
+             "on an asyncio event loop (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--subtasks",
+        action="store_true",
+        help="also create one issue per Acceptance Criteria item of each "
+             "epic, with the epic's labels",
+    )
+    parser.add_argument(
+        "--link-dependencies",
+        action="store_true",
+        help="create issues in dependency order and rewrite each "
+             "'## Dependencies' section into #number references",
+    )
+    parser.add_argument(
+        "--milestone",
+        metavar="TITLE",
+        help="milestone for entries that don't name one; missing "
+             "milestones are created",
+    )
+    parser.add_argument(
+        "--project",
+        metavar="OWNER/NUMBER",
+        help="Projects v2 board for entries that don't name one",
+    )
+    parser.add_argument(
+        "--field",
+        action="append",
+        type=parse_field,
+        default=[],
+        metavar="NAME=VALUE",
+        help="project field value for entries that don't set it, e.g. "
+             "Status=Todo or Iteration=@current; repeatable",
+    )
+    parser.add_argument(
+        "--shard",
+        type=parse_shard,
+        default=os.getenv("ISSUE_SHARD"),
+        metavar="I/N",
+        help="handle only the I-th of N hash partitions of the spec, e.g. "
+             "one per parallel CI job, under a lease that keeps two runs off "
+             "the same shard",
+    )
+    parser.add_argument(
+        "--metrics",
+        metavar="PATH",
+        default=os.getenv("ISSUE_METRICS"),
+        help="write one JSON line per API request and phase, plus a final "
+             "summary, to PATH",
+    )
+    parser.add_argument(
+        "--metrics-textfile",
+        metavar="PATH",
+        default=os.getenv("ISSUE_METRICS_TEXTFILE"),
+        help="write run metrics in the Prometheus text format to PATH, "
+             "e.g. for node_exporter's textfile collector",
+    )
+    parser.add_argument(
+        "--mirror",
+        metavar="PATH",
+        default=os.getenv("ISSUE_MIRROR"),
+        help="SQLite mirror of the repositories' issues and labels; it is "
+             "updated incrementally and used instead of listing every issue "
+             f"(mirror and query default to {DEFAULT_MIRROR})",
+    )
+    parser.add_argument(
+        "--delete",
+        action="store_true",
+        help="with cleanup, delete duplicates through GraphQL instead of "
+             "closing them (needs admin access)",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=20,
+        help="maximum number of query results (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--root",
+        default=".",
+        help="working tree that scan looks for required files in "
+             "(default: the current directory)",
+    )
+    parser.add_argument(
+        "--scan-cache",
+        default=os.getenv("ISSUE_SCAN_CACHE", DEFAULT_SCAN_CACHE),
+        help="directory listings cached by scan, keyed by mtime "
+             "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=os.getenv("ISSUE_CACHE_DIR", DEFAULT_CACHE_DIR),
+        help="directory of the ETag cache for GET requests "
+             "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="don't use conditional requests or the response cache",
+    )
+    # Lets options follow the command and its search terms
+    args = parser.parse_intermixed_args(argv)
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.requests_per_minute <= 0:
+        parser.error("--requests-per-minute must be positive")
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+    if args.backend == "graphql" and args.sync:
+        parser.error("--sync is only supported with --backend rest")
+    if args.command == "query" and not args.terms:
+        parser.error("query needs search terms")
+    if args.command != "query" and args.terms:
+        parser.error(f"unexpected arguments: {' '.join(args.terms)}")
+    if args.delete and args.command != "cleanup":
+        parser.error("--delete only applies to cleanup")
+    args.fields = dict(args.field)
+    if args.command in ("mirror", "query") and not args.mirror:
+        args.mirror = DEFAULT_MIRROR
+    if args.command in ("mirror", "query") and args.dry_run:
+        parser.error(f"--dry-run doesn't apply to {args.command}")
+    if args.command == "pull" and not args.spec:
+        parser.error("pull needs --spec; write the built-in ISSUES list to a "
+                     "file first with --export-spec")
+    return args
+
+
+def parse_front_matter(text):
+    """Split a markdown document into (metadata, body).
+
+    Front matter is a block of simple "key: value" lines between "---"
+    fences; "[a, b]" and "a, b" values of the labels key become lists.
+    Keys like "field.Status" are collected into a "fields" dict.
+    """
+    if not text.startswith("---\n"):
+        return {}, text
+    end = text.find("\n---\n", 3)
+    if end == -1:
+        return {}, text
+    meta = {}
+    for line in text[4:end].splitlines():
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        key, _, value = line.partition(":")
+        meta[key.strip()] = value.strip().strip("'\"")
+    labels = meta.get("labels", "")
+    if labels.startswith("[") and labels.endswith("]"):
+        labels = labels[1:-1]
+    meta["labels"] = [
+        label.strip().strip("'\"") for label in labels.split(",") if label.strip()
+    ]
+    meta["fields"] = {
+        key[len("field."):]: value for key, value in meta.items()
+        if key.startswith("field.")
+    }
+    return meta, text[end + 5:]
+
+
+class SpecError(ValueError):
+    """Raised when an issue spec file cannot be read or parsed."""
+
+
+class SpecSource:
+    """Re-iterable stream of (title, body, labels) specs stored on disk.
+
+    path may be a JSON Lines file with one {"title", "body", "labels"}
+    object per line, a directory of *.md files with front matter (read in
+    file name order), or a JSON file in the issues-to-create.json layout.
+    Entries may add "milestone", "project" and "fields" (see IssueSpec).
+    Every pass re-reads the source lazily, so JSON Lines and markdown specs
+    are consumed as they are parsed and memory stays flat.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def __iter__(self):
+        if os.path.isdir(self.path):
+            reader = self._read_markdown()
+        elif self.path.endswith(".json"):
+            reader = self._read_json()
+        else:
+            reader = self._read_jsonl()
+        try:
+            yield from reader
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            if isinstance(e, SpecError):
+                raise
+            raise SpecError(f"cannot read issue spec {self.path}: {e}") from e
+
+    def _read_jsonl(self):
+        with open(self.path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield self._entry(json.loads(line))
+                except (ValueError, KeyError, TypeError) as e:
+                    raise SpecError(f"{self.path}:{line_number}: invalid spec entry ({e})")
+
+    def _read_markdown(self):
+        for name in sorted(os.listdir(self.path)):
+            if not name.endswith(".md"):
+                continue
+            file_path = os.path.join(self.path, name)
+            with open(file_path, encoding="utf-8") as f:
+                meta, body = parse_front_matter(f.read())
+            if not meta.get("title"):
+                raise SpecError(f"{file_path}: front matter has no title")
+            yield IssueSpec.from_markdown(
+                meta["title"], body.strip("\n"), meta["labels"],
+                meta.get("milestone"), meta.get("project"), meta["fields"],
+            )
 
-Create docker-compose.yml for easy local development setup.
+    def _read_json(self):
+        with open(self.path, encoding="utf-8") as f:
+            data = json.load(f)
+        for entry in data.get("epics", []) + data.get("subtasks", []):
+            yield self._entry(entry)
+
+    @staticmethod
+    def _entry(entry):
+        return IssueSpec.from_markdown(
+            entry["title"], entry.get("body", ""), list(entry.get("labels", [])),
+            entry.get("milestone"), entry.get("project"), entry.get("fields"),
+        )
+
+
+def export_spec(specs, path):
+    """Write specs as JSON Lines, or as markdown files if path is a directory.
+
+    A path without a .jsonl/.json suffix is treated as a directory.
+    """
+    if path.endswith((".jsonl", ".json")):
+        with open(path, "w", encoding="utf-8") as f:
+            for spec in specs:
+                entry = {"title": spec.title, "body": spec.body, "labels": spec.labels}
+                for key in ("milestone", "project", "fields"):
+                    value = getattr(spec, key)
+                    if value:
+                        entry[key] = value
+                f.write(json.dumps(entry, ensure_ascii=False))
+                f.write("\n")
+        return
+    os.makedirs(path, exist_ok=True)
+    for i, spec in enumerate(specs, 1):
+        slug = re.sub(r"[^a-z0-9]+", "-", spec.title.lower()).strip("-")
+        with open(os.path.join(path, f"{i:04d}-{slug}.md"), "w", encoding="utf-8") as f:
+            f.write(markdown_spec(spec))
+
+
+def markdown_spec(spec):
+    """Return a spec entry as a markdown file with front matter."""
+    meta = [f"title: {spec.title}", f"labels: [{', '.join(spec.labels)}]"]
+    if spec.milestone:
+        meta.append(f"milestone: {spec.milestone}")
+    if spec.project:
+        meta.append(f"project: {spec.project}")
+    meta.extend(f"field.{name}: {value}" for name, value in spec.fields.items())
+    return "---\n" + "\n".join(meta) + f"\n---\n\n{spec.body}\n"
+
+
+def format_json_spec(data):
+    """Format an issues-to-create.json style document in that file's layout.
+
+    Every entry field goes on its own line, so an edited entry shows up
+    as a small diff.
+    """
+    groups = []
+    for key, entries in data.items():
+        items = []
+        for entry in entries:
+            fields = ",\n".join(
+                f"      {json.dumps(name)}: {json.dumps(value, ensure_ascii=False)}"
+                for name, value in entry.items()
+            )
+            items.append("    {\n" + fields + "\n    }")
+        if items:
+            groups.append(f"  {json.dumps(key)}: [\n" + ",\n".join(items) + "\n  ]")
+        else:
+            groups.append(f"  {json.dumps(key)}: []")
+    return "{\n" + ",\n".join(groups) + "\n}\n"
+
+
+def update_spec(path, updates):
+    """Rewrite the entries of a --spec whose titles are keys of updates.
+
+    updates maps an entry's current title to its new version. Only the
+    title, body and labels are written; other entries, other keys and,
+    in a markdown directory, the other files are left as they are.
+    """
+    def updated(entry):
+        spec = updates.get(entry["title"])
+        if spec is not None:
+            entry.update(title=spec.title, body=spec.body, labels=spec.labels)
+        return entry
+
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            file_path = os.path.join(path, name)
+            if not name.endswith(".md"):
+                continue
+            with open(file_path, encoding="utf-8") as f:
+                meta, _ = parse_front_matter(f.read())
+            spec = updates.get(meta.get("title"))
+            if spec is not None:
+                with open(file_path, "w", encoding="utf-8") as f:
+                    f.write(markdown_spec(spec))
+        return
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            text = "".join(
+                json.dumps(updated(json.loads(line)), ensure_ascii=False) + "\n"
+                for line in f if line.strip()
+            )
+        else:
+            data = json.load(f)
+            for entries in data.values():
+                for entry in entries:
+                    updated(entry)
+            text = format_json_spec(data)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+class SubtaskSpecs:
+    """Specs followed by one subtask per checklist item of each epic.
+
+    Every "- [ ]" item under an epic's "## Acceptance Criteria" becomes
+    an issue with the epic's labels, milestone and project whose
+    Dependencies section names the epic. Like SpecSource this can be
+    iterated more than once, and streamed specs stay streamed.
+    """
+
+    def __init__(self, specs):
+        self.specs = specs
+
+    def __iter__(self):
+        for spec in self.specs:
+            yield spec
+            yield from self.subtasks(spec)
+
+    @staticmethod
+    def subtasks(spec):
+        """Return the subtask specs of one epic spec."""
+        if not spec.title.startswith(EPIC_PREFIX):
+            return []
+        epic = spec.title[len(EPIC_PREFIX):].strip()
+        return [
+            IssueSpec(
+                f"{epic}: {item}",
+                spec.labels,
+                description=f"Acceptance criterion of the {epic} epic.",
+                acceptance_criteria=(item,),
+                dependencies=f"**Epic:** {epic}",
+                milestone=spec.milestone,
+                project=spec.project,
+                fields=spec.fields,
+            )
+            for item in spec.acceptance_criteria
+        ]
+
+
+def shard_of(title, count):
+    """Return the 1-based shard of count that a spec title belongs to.
+
+    It depends only on the title's fingerprint, so every job and every
+    local run agrees on it whatever the spec order or the other entries.
+    """
+    return int(spec_fingerprint(title), 16) % count + 1
+
+
+class ShardSpecs:
+    """The entries of a spec that belong to one --shard.
+
+    Like SubtaskSpecs this can be iterated more than once, and streamed
+    specs stay streamed.
+    """
+
+    def __init__(self, specs, shard):
+        self.specs = specs
+        self.index, self.count = shard
+
+    def __iter__(self):
+        for spec in self.specs:
+            if shard_of(spec.title, self.count) == self.index:
+                yield spec
+
+
+def validate_spec(specs, labels=LABELS_TO_CREATE):
+    """Check the labels and every spec entry in one pass, without the API.
+
+    Returns a list of problems, empty if the spec can be created: label
+    colors that aren't 6-digit hex, duplicate labels, empty or too long
+    titles, duplicate titles, labels missing from labels, and bodies
+    over GitHub's limit once the fingerprint is appended.
+    """
+    problems = []
+    known = {}
+    for name, color, _ in labels:
+        if not HEX_COLOR_RE.fullmatch(color or ""):
+            problems.append(f"Label '{name}': invalid hex color '{color}'")
+        if name.casefold() in known:
+            problems.append(f"Label '{name}': defined more than once")
+        known[name.casefold()] = name
+    seen = {}
+    for i, (title, body, entry_labels) in enumerate(specs, 1):
+        shown = title if len(str(title)) <= 60 else f"{title[:57]}..."
+        where = f"Entry {i} ('{shown}')"
+        if not isinstance(title, str) or not title.strip():
+            problems.append(f"Entry {i}: empty title")
+            continue
+        if len(title) > MAX_TITLE_LENGTH:
+            problems.append(
+                f"{where}: title is {len(title)} characters, "
+                f"the limit is {MAX_TITLE_LENGTH}"
+            )
+        key = normalize_title(title)
+        if key in seen:
+            problems.append(f"{where}: duplicate of entry {seen[key]}")
+        else:
+            seen[key] = i
+        if not isinstance(body, str):
+            problems.append(f"{where}: body is not text")
+        else:
+            length = len(with_fingerprint(title, body))
+            if length > MAX_BODY_LENGTH:
+                problems.append(
+                    f"{where}: body is {length} characters with the "
+                    f"fingerprint, the limit is {MAX_BODY_LENGTH}"
+                )
+        for label in entry_labels:
+            match = known.get(str(label).casefold())
+            if match == label:
+                continue
+            suffix = f" (did you mean '{match}'?)" if match else ""
+            problems.append(f"{where}: unknown label '{label}'{suffix}")
+    return problems
+
+
+def _dependency_words(name):
+    """Return the words of a title or dependency name, minus qualifiers."""
+    name = re.sub(r"^\[[^\]]*\]|\([^)]*\)", " ", name)
+    return tuple(re.findall(r"[a-z0-9]+", name.casefold()))
+
+
+class DependencyGraph:
+    """Dependencies between spec entries, read from "## Dependencies".
+
+    Each line of the section (or each comma separated name on a line like
+    "**Requires:** a, b") names another entry. A name resolves to the
+    entry with the same title, ignoring any "[EPIC]" prefix and
+    parentheses, or else to the only entry whose title contains all of
+    its distinctive words, preferring epics. Names that match nothing are
+    kept as text.
+    """
+
+    def __init__(self, specs):
+        self.specs = list(specs)
+        self.others = []
+        self.dependencies = {}
+        self.unresolved = []
+        words = {spec[0]: _dependency_words(spec[0]) for spec in self.specs}
+        exact = {}
+        for title, key in words.items():
+            exact.setdefault(key, title)
+        for spec in self.specs:
+            title = spec.title
+            resolved = []
+            for name in self.names(spec.dependencies):
+                target = exact.get(_dependency_words(name))
+                if target is None:
+                    wanted = set(_dependency_words(name)) - GENERIC_DEPENDENCY_WORDS
+                    candidates = [
+                        other for other, key in words.items()
+                        if wanted and wanted <= set(key)
+                    ]
+                    if len(candidates) > 1:
+                        # Dependencies name epics rather than their subtasks
+                        candidates = [
+                            other for other in candidates
+                            if other.startswith(EPIC_PREFIX)
+                        ]
+                    if len(candidates) == 1:
+                        target = candidates[0]
+                if target is None or target == title:
+                    self.unresolved.append((title, name))
+                else:
+                    resolved.append((name, target))
+            self.dependencies[title] = resolved
+
+    @staticmethod
+    def names(section):
+        """Return the dependency names listed in a Dependencies section."""
+        names = []
+        for line in section.splitlines():
+            line = re.sub(r"^\s*[-*]\s+", "", line)
+            line = re.sub(r"^\*\*[^*]+:\*\*\s*", "", line).strip()
+            if not line or line.startswith("None"):
+                continue
+            # Split on commas that aren't inside parentheses
+            names.extend(
+                name.strip() for name in re.split(r",(?![^()]*\))", line)
+                if name.strip()
+            )
+        return names
+
+    def select(self, shard):
+        """Keep only the specs of one --shard.
+
+        Dependencies are still resolved against the whole spec; the titles
+        of the other shards' entries are kept in others so their issues
+        can be linked to if they exist.
+        """
+        index, count = shard
+        self.others = [
+            spec.title for spec in self.specs if shard_of(spec.title, count) != index
+        ]
+        self.specs = [
+            spec for spec in self.specs if shard_of(spec.title, count) == index
+        ]
+
+    def waves(self):
+        """Group the specs into waves that only depend on earlier waves.
+
+        Raises SpecError naming the entries involved in a cycle.
+        """
+        remaining = {
+            spec[0]: {target for _, target in self.dependencies[spec[0]]}
+            for spec in self.specs
+        }
+        waves = []
+        while remaining:
+            wave = [
+                spec for spec in self.specs
+                if spec[0] in remaining and not remaining[spec[0]] & remaining.keys()
+            ]
+            if not wave:
+                raise SpecError(
+                    "dependency cycle between: " + ", ".join(sorted(remaining))
+                )
+            for spec in wave:
+                del remaining[spec[0]]
+            waves.append(wave)
+        return waves
+
+    def link(self, spec, numbers):
+        """Return spec's body with resolved dependencies prefixed by #number."""
+        title, body, _ = spec
+        match = DEPENDENCIES_RE.search(body)
+        if not match:
+            return body
+        section = match.group(1)
+        for name, target in self.dependencies[title]:
+            if numbers.get(target) is not None:
+                section = re.sub(
+                    rf"(?<![#\w]){re.escape(name)}",
+                    lambda m: f"#{numbers[target]} {m.group(0)}",
+                    section,
+                    count=1,
+                )
+        return body[:match.start(1)] + section + body[match.end(1):]
+
+
+def _lower_headers(headers):
+    """Return response headers with lower-cased keys."""
+    return {str(k).lower(): v for k, v in (headers or {}).items()}
+
+
+def rate_limit_delay(e):
+    """Classify a GithubException as a rate limit.
+
+    Returns (seconds_to_wait, is_secondary) for primary and secondary rate
+    limits, or None for any other error (including real permission errors).
+    """
+    if e.status not in (403, 429):
+        return None
+    headers = _lower_headers(getattr(e, "headers", None))
+    if "retry-after" in headers:
+        return float(headers["retry-after"]), True
+    if str(headers.get("x-ratelimit-remaining")) == "0":
+        reset = float(headers.get("x-ratelimit-reset", time.time()))
+        return max(reset - time.time(), 0) + 1, False
+    data = getattr(e, "data", None)
+    message = data.get("message", "") if isinstance(data, dict) else str(data)
+    message = message.lower()
+    if "secondary rate limit" in message or "abuse" in message:
+        return SECONDARY_RATE_LIMIT_WAIT, True
+    if "rate limit" in message:
+        return SECONDARY_RATE_LIMIT_WAIT, False
+    return None
+
+
+class RateLimiter:
+    """Schedule API calls around GitHub's primary and secondary rate limits.
+
+    Calls are paced by a token bucket refilled at requests_per_minute and
+    capped at max_concurrency in flight. Exhausting the primary limit pauses
+    every worker until X-RateLimit-Reset. A secondary limit pauses for
+    Retry-After and halves both the allowed concurrency and the refill rate,
+    which then recover gradually as requests succeed again. Pauses and
+    retries are reported through out().
+    """
+
+    def __init__(self, requests_per_minute, max_concurrency, metrics=None,
+                 out=print):
+        self.metrics = metrics
+        self.out = out
+        self.max_rate = requests_per_minute / 60.0
+        self.max_concurrency = max_concurrency
+        self.rate = self.max_rate
+        self.concurrency = max_concurrency
+        self.tokens = float(max_concurrency)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.in_flight = 0
+        self.successes = 0
+        self.retries = 0
+        self._cond = threading.Condition()
+
+    def _refill(self, now):
+        capacity = float(self.concurrency)
+        elapsed = now - self.updated
+        self.tokens = min(capacity, self.tokens + elapsed * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                elif self.in_flight >= self.concurrency:
+                    wait = None
+                elif self.tokens < 1:
+                    wait = (1 - self.tokens) / self.rate
+                else:
+                    self.tokens -= 1
+                    self.in_flight += 1
+                    return
+                self._cond.wait(wait)
+
+    def release(self, headers=None, ok=True):
+        """Finish a request, updating limits from its response headers."""
+        with self._cond:
+            self.in_flight -= 1
+            if ok:
+                self.successes += 1
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+                if (self.concurrency < self.max_concurrency
+                        and self.successes >= self.concurrency):
+                    self.concurrency += 1
+                    self.successes = 0
+            headers = _lower_headers(headers)
+            remaining = headers.get("x-ratelimit-remaining")
+            # Stop while the requests still in flight can use up the rest of
+            # the window, so none of them runs into a 403
+            if remaining is not None and int(remaining) <= self.in_flight:
+                reset = float(headers.get("x-ratelimit-reset", time.time()))
+                self._hold_until(reset)
+            self._cond.notify_all()
+
+    def _hold_until(self, reset):
+        if time.monotonic() + max(reset - time.time(), 0) > self.paused_until:
+            self.out(f"  Rate-limit budget used up, pausing until "
+                     f"{format_time(reset)}")
+        self._pause(max(reset - time.time(), 0) + 1)
+
+    def pause_until(self, reset):
+        """Hold every request until the epoch time reset (plus a second)."""
+        with self._cond:
+            self._hold_until(reset)
+            self._cond.notify_all()
+
+    def _pause(self, seconds):
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def backoff(self, seconds, secondary):
+        """Pause all requests, slowing down further after a secondary limit."""
+        with self._cond:
+            self.retries += 1
+            self._pause(seconds)
+            if secondary:
+                self.concurrency = max(1, self.concurrency // 2)
+                self.rate = max(self.max_rate / 16, self.rate / 2)
+                self.tokens = 0.0
+                self.successes = 0
+            self._cond.notify_all()
+
+    def call(self, func, *args, **kwargs):
+        """Call func once a request slot is free, retrying on rate limits.
+
+        Non-rate-limit errors, and rate limits that persist past
+        MAX_RATE_LIMIT_RETRIES attempts, are raised to the caller.
+        """
+        attempt = 0
+        while True:
+            started = time.monotonic()
+            self.acquire()
+            if self.metrics is not None:
+                self.metrics.attempt(attempt, time.monotonic() - started)
+            try:
+                result = func(*args, **kwargs)
+            except GithubException as e:
+                self.release(getattr(e, "headers", None), ok=False)
+                delay = rate_limit_delay(e)
+                if delay is None or attempt >= MAX_RATE_LIMIT_RETRIES:
+                    raise
+                attempt += 1
+                seconds, secondary = delay
+                kind = "Secondary" if secondary else "Primary"
+                self.out(f"  {kind} rate limit hit, retrying in {seconds:.0f}s")
+                self.backoff(seconds, secondary)
+                continue
+            self.release(getattr(result, "raw_headers", None))
+            return result
+
+
+def percentile(values, fraction):
+    """Return the nearest-rank percentile of sorted values (0 if empty)."""
+    if not values:
+        return 0.0
+    return values[max(0, math.ceil(fraction * len(values)) - 1)]
+
+
+class Metrics:
+    """Per-request and per-phase timings of a run.
+
+    Every API request (each attempt, including 304s answered from the
+    cache) and every phase of a repository is kept in memory and, with a
+    path, streamed to it as JSON Lines. finish() adds a summary event and
+    can write the same figures as a Prometheus textfile.
+    """
+
+    def __init__(self, path=None):
+        self.started = time.time()
+        self.requests = []
+        self.phases = []
+        self.waited = 0.0
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.file = open(path, "w", encoding="utf-8") if path else None
+        if self.file is not None:
+            atexit.register(self.close)
+
+    def attempt(self, attempt, waited=0.0):
+        """Note the retry number of the calling thread's next request.
+
+        waited is the time the RateLimiter held the call back.
+        """
+        self.local.attempt = attempt
+        with self.lock:
+            self.waited += waited
+
+    def request(self, method, url, status, seconds, size, headers, cached=False):
+        """Record one HTTP request."""
+        remaining = _lower_headers(headers).get("x-ratelimit-remaining")
+        event = {
+            "event": "request",
+            "time": round(time.time(), 3),
+            "method": method,
+            "path": urlsplit(url).path,
+            "status": status,
+            "seconds": round(seconds, 4),
+            "bytes": size,
+            "retry": getattr(self.local, "attempt", 0),
+            "rate_limit_remaining": int(remaining) if remaining else None,
+            "cached": cached,
+        }
+        with self.lock:
+            self.requests.append(event)
+            self._write(event)
+
+    @contextlib.contextmanager
+    def phase(self, repo_name, name):
+        """Time a phase (connect, labels, index, issues, links) of a repo."""
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            event = {
+                "event": "phase",
+                "time": round(time.time(), 3),
+                "repo": repo_name,
+                "phase": name,
+                "seconds": round(time.monotonic() - started, 4),
+            }
+            with self.lock:
+                self.phases.append(event)
+                self._write(event)
+
+    def _write(self, event):
+        if self.file is not None:
+            self.file.write(json.dumps(event) + "\n")
+            self.file.flush()
+
+    def summary(self, counts=None):
+        """Return totals, latency percentiles and phase times as a dict."""
+        with self.lock:
+            requests = list(self.requests)
+            phases = list(self.phases)
+        latencies = sorted(event["seconds"] for event in requests)
+        statuses = {}
+        for event in requests:
+            key = f"{event['method']} {event['status']}"
+            statuses[key] = statuses.get(key, 0) + 1
+        phase_seconds = {}
+        for event in phases:
+            phase_seconds[event["phase"]] = round(
+                phase_seconds.get(event["phase"], 0) + event["seconds"], 4
+            )
+        remaining = [
+            event["rate_limit_remaining"] for event in requests
+            if event["rate_limit_remaining"] is not None
+        ]
+        elapsed = time.time() - self.started
+        issues = (counts or {}).get("created", 0)
+        return {
+            "event": "summary",
+            "time": round(time.time(), 3),
+            "seconds": round(elapsed, 3),
+            "requests": len(requests),
+            "statuses": statuses,
+            "retries": sum(1 for event in requests if event["retry"]),
+            "cached": sum(1 for event in requests if event["cached"]),
+            "bytes": sum(event["bytes"] for event in requests),
+            "latency": {
+                "p50": percentile(latencies, 0.50),
+                "p95": percentile(latencies, 0.95),
+                "p99": percentile(latencies, 0.99),
+                "max": latencies[-1] if latencies else 0.0,
+            },
+            "rate_limit_remaining": min(remaining) if remaining else None,
+            "rate_limit_wait_seconds": round(self.waited, 3),
+            "phases": phase_seconds,
+            "issues": dict(counts or {}),
+            "issues_per_second": round(issues / elapsed, 3) if elapsed else 0.0,
+        }
+
+    def finish(self, counts=None, textfile=None):
+        """Write the summary event and the textfile; return the summary."""
+        summary = self.summary(counts)
+        with self.lock:
+            self._write(summary)
+        if textfile:
+            self.write_textfile(textfile, summary)
+        return summary
+
+    def write_textfile(self, path, summary):
+        """Atomically write summary in the Prometheus text format."""
+        prefix = "create_github_issues"
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for labels, value in samples:
+                label_text = ",".join(f'{key}="{val}"' for key, val in labels)
+                label_text = f"{{{label_text}}}" if label_text else ""
+                lines.append(f"{prefix}_{name}{label_text} {value}")
+
+        metric("requests_total", "counter", "API requests by method and status.", [
+            ((("method", key.split()[0]), ("status", key.split()[1])), count)
+            for key, count in sorted(summary["statuses"].items())
+        ])
+        latency = summary["latency"]
+        metric("request_duration_seconds", "summary", "API request latency.", [
+            ((("quantile", "0.5"),), latency["p50"]),
+            ((("quantile", "0.95"),), latency["p95"]),
+            ((("quantile", "0.99"),), latency["p99"]),
+        ])
+        with self.lock:
+            total_seconds = sum(event["seconds"] for event in self.requests)
+        lines.append(f"{prefix}_request_duration_seconds_sum {total_seconds:.4f}")
+        lines.append(f"{prefix}_request_duration_seconds_count {summary['requests']}")
+        metric("request_retries_total", "counter",
+               "Requests retried after a rate limit.", [((), summary["retries"])])
+        metric("cached_responses_total", "counter",
+               "GET requests answered by a 304 from the cache.",
+               [((), summary["cached"])])
+        metric("response_bytes_total", "counter",
+               "Response body bytes received.", [((), summary["bytes"])])
+        if summary["rate_limit_remaining"] is not None:
+            metric("rate_limit_remaining", "gauge",
+                   "Lowest remaining rate limit seen.",
+                   [((), summary["rate_limit_remaining"])])
+        metric("rate_limit_wait_seconds_total", "counter",
+               "Time calls were held back by request pacing and rate limits.",
+               [((), summary["rate_limit_wait_seconds"])])
+        metric("phase_duration_seconds", "gauge", "Time spent per phase.", [
+            ((("phase", name),), seconds)
+            for name, seconds in sorted(summary["phases"].items())
+        ])
+        metric("issues", "gauge", "Issues by outcome in the last run.", [
+            ((("status", status),), count)
+            for status, count in sorted(summary["issues"].items())
+        ])
+        metric("run_duration_seconds", "gauge", "Duration of the last run.",
+               [((), summary["seconds"])])
+        metric("last_run_timestamp_seconds", "gauge",
+               "When the last run finished.", [((), summary["time"])])
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, path)
+
+    def close(self):
+        if self.file is not None and not self.file.closed:
+            self.file.close()
+
+
+def run_ordered(func, items, concurrency=1):
+    """Apply func to each item on a bounded thread pool.
+
+    Yields (item, result) pairs in the same order as items. At most
+    2 * concurrency calls are queued at once, so items may be a generator.
+    """
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for item in items:
+            pending.append((item, pool.submit(func, item)))
+            if len(pending) >= 2 * concurrency:
+                item, future = pending.popleft()
+                yield item, future.result()
+        while pending:
+            item, future = pending.popleft()
+            yield item, future.result()
+
+
+def batched(items, size):
+    """Yield lists of up to size consecutive items."""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def normalize_title(title):
+    """Normalize a title for duplicate detection."""
+    return " ".join(title.split()).casefold()
+
+
+def spec_fingerprint(title):
+    """Return the stable fingerprint identifying a spec entry."""
+    return hashlib.sha256(normalize_title(title).encode("utf-8")).hexdigest()[:16]
+
+
+def with_fingerprint(title, body):
+    """Append the hidden fingerprint marker for title to body."""
+    return f"{body}\n\n{FINGERPRINT_MARKER.format(spec_fingerprint(title))}"
+
+
+# What the journal knows about an issue; the body isn't recorded
+JournaledIssue = namedtuple("JournaledIssue", "number title body")
+
+
+class IssueIndex:
+    """Existing repository issues keyed by normalized title and fingerprint."""
+
+    def __init__(self):
+        self.by_title = {}
+        self.by_fingerprint = {}
+
+    def add(self, issue):
+        """Index an issue, keeping the oldest one for each key."""
+        self.by_title.setdefault(normalize_title(issue.title), issue)
+        match = FINGERPRINT_RE.search(issue.body or "")
+        if match:
+            self.by_fingerprint.setdefault(match.group(1), issue)
+
+    def find(self, title):
+        """Return the existing issue for a spec title, or None."""
+        issue = self.by_fingerprint.get(spec_fingerprint(title))
+        if issue is None:
+            issue = self.by_title.get(normalize_title(title))
+        return issue
+
+    def __len__(self):
+        return len(self.by_title)
+
+    @classmethod
+    def from_repo(cls, repo, limiter, since=None, index=None):
+        """Build the index from a single paginated listing of all issues.
+
+        With since (a datetime) only issues updated after it are listed,
+        and they can be added to an existing index.
+        """
+        if index is None:
+            index = cls()
+        filters = {"since": since} if since is not None else {}
+
+        def fetch():
+            for issue in repo.get_issues(state="all", direction="asc", **filters):
+                # The issues endpoint also returns pull requests
+                if "/pull/" not in issue.html_url:
+                    index.add(issue)
+
+        limiter.call(fetch)
+        return index
+
+    @classmethod
+    def from_journal(cls, entries):
+        """Build the index from the issue entries of a Journal."""
+        index = cls()
+        for entry in entries:
+            index.add(JournaledIssue(entry["number"], entry["title"], None))
+        return index
+
+
+class Journal:
+    """Append-only log of completed operations, fsync'd entry by entry.
+
+    Every label pass, created or matched issue and dependency link is
+    written as one JSON line as soon as it's done, so a killed run can be
+    resumed from the last complete line. A fresh run starts a new
+    journal; a resumed one appends to it.
+    """
+
+    def __init__(self, path, resume=False):
+        self.path = path
+        self.lock = threading.Lock()
+        self.repositories = {}
+        partial = False
+        if resume and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    partial = not line.endswith("\n")
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # The last line may have been cut off mid-write
+                        continue
+                    self._apply(entry)
+        self.file = open(path, "a" if resume else "w", encoding="utf-8")
+        if partial:
+            self.file.write("\n")
+        atexit.register(self.close)
+
+    def _apply(self, entry):
+        state = self.repository(entry["repo"])
+        state["last"] = max(state["last"] or 0, entry.get("time", 0))
+        if entry["op"] == "labels":
+            state["labels"] = True
+        elif entry["op"] == "issue":
+            state["issues"][entry["title"]] = entry
+        elif entry["op"] == "link":
+            state["linked"].add(entry["title"])
+
+    def repository(self, repo_name):
+        """Return what is journaled for one repository."""
+        return self.repositories.setdefault(
+            repo_name,
+            {"labels": False, "issues": {}, "linked": set(), "last": None},
+        )
+
+    def record(self, repo_name, op, **fields):
+        """Durably append one completed operation."""
+        entry = dict(repo=repo_name, op=op, time=round(time.time(), 3), **fields)
+        with self.lock:
+            self.file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+
+class ShardLease:
+    """Claim on one --shard of a repository while a run works on it.
+
+    The claim is a label (SHARD_LEASE_LABEL), since creating a label that
+    already exists fails: of two jobs started on the same shard only one
+    gets to create issues. The label is deleted when the run ends; one
+    left behind by a killed run expires after SHARD_LEASE_SECONDS, and a
+    re-run of the same workflow run may take it over at once.
+    """
+
+    def __init__(self, repo, limiter, shard, holder=None):
+        self.repo = repo
+        self.limiter = limiter
+        self.name = SHARD_LEASE_LABEL.format(*shard)
+        run_id = os.getenv("GITHUB_RUN_ID")
+        self.holder = holder or (f"run-{run_id}" if run_id else f"pid-{os.getpid()}")
+        self.label = None
+
+    def acquire(self):
+        """Take the lease.
+
+        Returns None once it is held, or (holder, expires) of the run
+        holding it.
+        """
+        expires = time.time() + SHARD_LEASE_SECONDS
+        description = (f"held by {self.holder} until "
+                       f"{time.strftime(GITHUB_TIME_FORMAT, time.gmtime(expires))}")
+        try:
+            self.label = self.limiter.call(
+                self.repo.create_label, self.name, SHARD_LEASE_COLOR, description
+            )
+            return None
+        except GithubException as e:
+            if e.status != 422:
+                raise
+        label = self.limiter.call(self.repo.get_label, self.name)
+        holder, until = self.parse(label.description)
+        if holder != self.holder and until > time.time():
+            return holder, until
+        self.limiter.call(label.edit, self.name, SHARD_LEASE_COLOR, description)
+        # Another run may have taken over the expired lease at the same time
+        label = self.limiter.call(self.repo.get_label, self.name)
+        holder, until = self.parse(label.description)
+        if holder != self.holder:
+            return holder, until
+        self.label = label
+        return None
+
+    @staticmethod
+    def parse(description):
+        """Return (holder, expires) from a lease label's description."""
+        match = SHARD_LEASE_RE.search(description or "")
+        if not match:
+            return None, 0
+        expires = datetime.strptime(match.group(2), GITHUB_TIME_FORMAT)
+        return match.group(1), expires.replace(tzinfo=timezone.utc).timestamp()
+
+    def release(self):
+        """Give the lease up by deleting its label."""
+        if self.label is None:
+            return
+        try:
+            self.limiter.call(self.label.delete)
+        except GithubException as e:
+            if e.status != 404:
+                raise
+        self.label = None
+
+
+def spec_digest(spec):
+    """Return the sha256 of a spec entry's title, body and labels."""
+    return spec.digest
+
+
+def issue_matches(issue, spec):
+    """Check whether an existing issue already reflects a spec entry."""
+    title, body, labels = spec
+    return (
+        issue.title == title
+        and (issue.body or "") == with_fingerprint(title, body)
+        and sorted(label.name for label in issue.labels) == sorted(labels)
+    )
+
+
+class Manifest:
+    """On-disk record of the issue number and spec digest of synced entries.
+
+    Entries are stored per repository and keyed by spec fingerprint, so a
+    changed body or label list is detected without any API call. One
+    Manifest can be shared by several repositories synced concurrently.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.data = {"version": 1, "repositories": {}}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.data = json.load(f)
+        self.lock = threading.Lock()
+
+    def repository(self, repo_name):
+        """Return the entries of one repository."""
+        with self.lock:
+            self.data["repositories"].setdefault(repo_name, {})
+        return RepoManifest(self, repo_name)
+
+    def save(self):
+        """Atomically write the manifest back to disk."""
+        with self.lock:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.data, f, indent=2, sort_keys=True)
+                f.write("\n")
+            os.replace(tmp_path, self.path)
+
+
+class RepoManifest:
+    """The manifest entries of a single repository.
+
+    Each entry also keeps the title, body and labels that were last in
+    sync, the common base for merging edits made on GitHub (see pull).
+    """
+
+    def __init__(self, manifest, repo_name):
+        self.manifest = manifest
+        self.repo_name = repo_name
+        self.entries = manifest.data["repositories"][repo_name]
+
+    def get(self, title):
+        """Return the manifest entry for a spec title, or None."""
+        return self.entries.get(spec_fingerprint(title))
+
+    def record(self, spec, number):
+        """Remember that spec is in sync with issue number."""
+        entry = {"title": spec[0], "number": number, "sha256": spec_digest(spec),
+                 "body": spec[1], "labels": list(spec[2])}
+        with self.manifest.lock:
+            previous = self.entries.get(spec_fingerprint(spec[0])) or {}
+            # An update rewrites the body, so its links have to be redone
+            if previous.get("sha256") == entry["sha256"] and "links" in previous:
+                entry["links"] = previous["links"]
+            self.entries[spec_fingerprint(spec[0])] = entry
+
+    def restore(self, entry):
+        """Re-add an entry recorded in the journal of an interrupted run."""
+        with self.manifest.lock:
+            previous = self.entries.get(spec_fingerprint(entry["title"])) or {}
+            restored = {key: entry[key] for key in ("title", "number", "sha256")}
+            if previous.get("sha256") == entry["sha256"]:
+                # The journal doesn't hold the body, but it hasn't changed
+                restored.update(
+                    (key, previous[key]) for key in ("links", "body", "labels")
+                    if key in previous
+                )
+            self.entries[spec_fingerprint(entry["title"])] = restored
+
+    def forget(self, title):
+        """Drop the entry of a spec title, e.g. after it was renamed."""
+        with self.manifest.lock:
+            self.entries.pop(spec_fingerprint(title), None)
+
+    @property
+    def pulled(self):
+        """Return the updated_at of the newest issue pulled, or None."""
+        return self.manifest.data.get("pulled", {}).get(self.repo_name)
+
+    @pulled.setter
+    def pulled(self, watermark):
+        with self.manifest.lock:
+            self.manifest.data.setdefault("pulled", {})[self.repo_name] = watermark
+
+    def record_links(self, title, body):
+        """Remember the linked body written to the issue for title."""
+        digest = hashlib.sha256(body.encode("utf-8")).hexdigest()
+        with self.manifest.lock:
+            self.entries[spec_fingerprint(title)]["links"] = digest
+
+    def is_linked(self, title, body):
+        """Check whether body was the last linked body recorded for title."""
+        entry = self.get(title) or {}
+        digest = hashlib.sha256(body.encode("utf-8")).hexdigest()
+        return entry.get("links") == digest
+
+    def save(self):
+        """Write the whole manifest back to disk."""
+        self.manifest.save()
+
+
+def github_time(value):
+    """Format a PyGithub datetime, or pass an API timestamp string through."""
+    if isinstance(value, datetime):
+        return value.astimezone(timezone.utc).strftime(GITHUB_TIME_FORMAT)
+    return value
+
+
+# An issue as the mirror holds it; labels only carry their name
+MirroredIssue = namedtuple("MirroredIssue", "number title body state labels")
+MirroredLabel = namedtuple("MirroredLabel", "name")
+
+
+class MirrorError(RuntimeError):
+    """Raised when the issue mirror cannot be opened or searched."""
+
+
+class IssueMirror:
+    """Local SQLite copy of repositories' issues and labels.
+
+    sync() lists only the issues updated since the newest one already
+    mirrored, so keeping the copy current costs a request or two, and an
+    FTS5 index over titles and bodies makes it searchable offline. Issues
+    deleted on GitHub stay in the mirror until it's rebuilt.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS issues (
+            repo TEXT NOT NULL,
+            number INTEGER NOT NULL,
+            title TEXT NOT NULL,
+            body TEXT NOT NULL,
+            state TEXT NOT NULL,
+            labels TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            PRIMARY KEY (repo, number)
+        );
+        CREATE TABLE IF NOT EXISTS labels (
+            repo TEXT NOT NULL,
+            name TEXT NOT NULL,
+            color TEXT NOT NULL,
+            description TEXT,
+            PRIMARY KEY (repo, name)
+        );
+        CREATE TABLE IF NOT EXISTS synced (
+            repo TEXT PRIMARY KEY,
+            watermark TEXT,
+            time REAL NOT NULL
+        );
+        CREATE VIRTUAL TABLE IF NOT EXISTS issues_fts USING fts5(
+            title, body, content='issues', content_rowid='rowid'
+        );
+        CREATE TRIGGER IF NOT EXISTS issues_ai AFTER INSERT ON issues BEGIN
+            INSERT INTO issues_fts (rowid, title, body)
+            VALUES (new.rowid, new.title, new.body);
+        END;
+        CREATE TRIGGER IF NOT EXISTS issues_ad AFTER DELETE ON issues BEGIN
+            INSERT INTO issues_fts (issues_fts, rowid, title, body)
+            VALUES ('delete', old.rowid, old.title, old.body);
+        END;
+        CREATE TRIGGER IF NOT EXISTS issues_au AFTER UPDATE ON issues BEGIN
+            INSERT INTO issues_fts (issues_fts, rowid, title, body)
+            VALUES ('delete', old.rowid, old.title, old.body);
+            INSERT INTO issues_fts (rowid, title, body)
+            VALUES (new.rowid, new.title, new.body);
+        END;
+    """
+
+    def __init__(self, path):
+        # Only runs with a mirror need sqlite3
+        import sqlite3
+        self.path = path
+        self.lock = threading.Lock()
+        self.error = sqlite3.Error
+        try:
+            self.db = sqlite3.connect(path, check_same_thread=False)
+            with self.db:
+                self.db.executescript(self.SCHEMA)
+        except sqlite3.Error as e:
+            raise MirrorError(f"Cannot open issue mirror {path}: {e}") from e
+        atexit.register(self.close)
+
+    def synced(self, repo_name):
+        """Return (watermark, time) of the last sync, or None if never synced."""
+        with self.lock:
+            return self.db.execute(
+                "SELECT watermark, time FROM synced WHERE repo = ?", (repo_name,)
+            ).fetchone()
+
+    def sync(self, repo, limiter):
+        """List what changed since the last sync into the mirror.
+
+        Returns the number of new or changed issues.
+        """
+        repo_name = repo.full_name
+        synced = self.synced(repo_name)
+        filters = {}
+        if synced is not None and synced[0] is not None:
+            filters["since"] = datetime.strptime(
+                synced[0], GITHUB_TIME_FORMAT
+            ).replace(tzinfo=timezone.utc)
+
+        def fetch():
+            issues = list(repo.get_issues(state="all", direction="asc", **filters))
+            return issues, list(repo.get_labels())
+
+        issues, labels = limiter.call(fetch)
+        # The newest timestamp GitHub reported, so the local clock never matters
+        watermark = max(
+            (github_time(issue.updated_at) for issue in issues),
+            default=synced[0] if synced is not None else None,
+        )
+        rows = [
+            (repo_name, issue.number, issue.title, issue.body or "", issue.state,
+             json.dumps([label.name for label in issue.labels]),
+             github_time(issue.created_at), github_time(issue.updated_at))
+            for issue in issues
+            # The issues endpoint also returns pull requests
+            if "/pull/" not in issue.html_url
+        ]
+        with self.lock, self.db:
+            self.db.executemany(
+                "INSERT INTO issues VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (repo, number) DO UPDATE SET title = excluded.title, "
+                "body = excluded.body, state = excluded.state, "
+                "labels = excluded.labels, updated_at = excluded.updated_at",
+                rows,
+            )
+            self.db.execute("DELETE FROM labels WHERE repo = ?", (repo_name,))
+            self.db.executemany(
+                "INSERT INTO labels VALUES (?, ?, ?, ?)",
+                [(repo_name, label.name, label.color, label.description)
+                 for label in labels],
+            )
+            self.db.execute(
+                "INSERT OR REPLACE INTO synced VALUES (?, ?, ?)",
+                (repo_name, watermark, time.time()),
+            )
+        return len(rows)
+
+    def count(self, repo_name):
+        """Return the number of mirrored issues of a repository."""
+        with self.lock:
+            return self.db.execute(
+                "SELECT count(*) FROM issues WHERE repo = ?", (repo_name,)
+            ).fetchone()[0]
+
+    def issues(self, repo_name):
+        """Return a repository's mirrored issues as MirroredIssues, oldest first."""
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT number, title, body, state, labels FROM issues "
+                "WHERE repo = ? ORDER BY number",
+                (repo_name,),
+            ).fetchall()
+        return [
+            MirroredIssue(number, title, body, state,
+                          [MirroredLabel(name) for name in json.loads(labels)])
+            for number, title, body, state, labels in rows
+        ]
+
+    def index(self, repo_name):
+        """Return an IssueIndex of a repository's mirrored issues."""
+        index = IssueIndex()
+        for issue in self.issues(repo_name):
+            index.add(issue)
+        return index
+
+    def forget(self, repo_name, numbers):
+        """Drop issues that were deleted on GitHub."""
+        with self.lock, self.db:
+            self.db.executemany(
+                "DELETE FROM issues WHERE repo = ? AND number = ?",
+                [(repo_name, number) for number in numbers],
+            )
 
-## Tasks
+    def labels(self, repo_name):
+        """Return {name: (color, description)} like plan_labels() expects."""
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT name, color, description FROM labels WHERE repo = ?",
+                (repo_name,),
+            ).fetchall()
+        return {name: (color, description) for name, color, description in rows}
+
+    def search(self, query, repo_names=None, limit=20):
+        """Search titles and bodies, best matches first.
+
+        query uses the FTS5 syntax, e.g. 'stripe webhook' or '"data
+        isolation" OR tenant*'. Returns (repo, number, state, title,
+        snippet) rows.
+        """
+        sql = (
+            "SELECT issues.repo, issues.number, issues.state, issues.title, "
+            "snippet(issues_fts, 1, '[', ']', '...', 12) "
+            "FROM issues_fts JOIN issues ON issues.rowid = issues_fts.rowid "
+            "WHERE issues_fts MATCH ?"
+        )
+        params = [query]
+        if repo_names:
+            sql += f" AND issues.repo IN ({', '.join('?' * len(repo_names))})"
+            params.extend(repo_names)
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+        with self.lock:
+            try:
+                return self.db.execute(sql, params).fetchall()
+            except self.error as e:
+                raise MirrorError(f"Invalid search {query!r}: {e}") from e
+
+    def close(self):
+        self.db.close()
+
+
+def plan_issue(spec, manifest=None, index=None):
+    """Decide what a run would do with one spec entry.
+
+    Returns (action, number): "created" (number is None), "exists" when
+    the index already has it, or, with a manifest, "unchanged" and
+    "updated" as described in sync_issue.
+    """
+    title = spec[0]
+    if manifest is not None:
+        entry = manifest.get(title)
+        if entry is not None:
+            if entry["sha256"] == spec_digest(spec):
+                return "unchanged", entry["number"]
+            return "updated", entry["number"]
+    existing = index.find(title) if index is not None else None
+    if existing is None:
+        return "created", None
+    if manifest is None:
+        return "exists", existing.number
+    if issue_matches(existing, spec):
+        return "unchanged", existing.number
+    return "updated", existing.number
+
+
+def create_issue(repo, spec, limiter, index=None):
+    """Create a single issue from a (title, body, labels) spec.
+
+    Returns a (status, number, error) tuple where status is "created",
+    "exists" (found in index, nothing sent) or "failed".
+    """
+    title, body, labels = spec
+    action, number = plan_issue(spec, index=index)
+    if action == "exists":
+        return "exists", number, None
+    try:
+        issue = limiter.call(
+            repo.create_issue,
+            title=title,
+            body=with_fingerprint(title, body),
+            labels=labels,
+        )
+        return "created", issue.number, None
+    except GithubException as e:
+        return "failed", None, e
+
+
+def sync_issue(repo, spec, limiter, manifest, index=None):
+    """Bring one issue in line with its spec entry.
+
+    Entries whose digest matches the manifest are "unchanged" without any
+    request. Changed entries are edited in place ("updated") and unknown
+    ones are adopted from the index or created. Returns the same
+    (status, number, error) tuple as create_issue.
+    """
+    title, body, labels = spec
+    action, number = plan_issue(spec, manifest, index)
+    if action == "unchanged":
+        return "unchanged", number, None
+    if action == "created":
+        return create_issue(repo, spec, limiter)
+    try:
+        # repo is lazy here, so get_issue() doesn't fetch before the PATCH
+        limiter.call(
+            repo.get_issue(number).edit,
+            title=title,
+            body=with_fingerprint(title, body),
+            labels=labels,
+        )
+        return "updated", number, None
+    except GithubException as e:
+        return "failed", number, e
+
+
+def issue_spec(issue, like, entry=None):
+    """Return a GitHub issue as a spec entry, the GitHub side of a pull.
+
+    The fingerprint marker and line endings converted by the web editor
+    are dropped, and so are the "#number " prefixes --link-dependencies
+    added if the manifest entry says the body was linked. The milestone,
+    project and fields are taken from the spec entry like.
+    """
+    body = (issue.body or "").replace("\r\n", "\n")
+    match = FINGERPRINT_RE.search(body)
+    if match:
+        head = body[:match.start()]
+        if head.endswith("\n\n"):
+            head = head[:-2]
+        body = head + body[match.end():]
+    if entry is not None and "links" in entry:
+        match = DEPENDENCIES_RE.search(body)
+        if match:
+            section = re.sub(r"(?<![\w&])#\d+ ", "", match.group(1))
+            body = body[:match.start(1)] + section + body[match.end(1):]
+    return IssueSpec.from_markdown(
+        issue.title, body, [label.name for label in issue.labels],
+        like.milestone, like.project, like.fields,
+    )
+
+
+def merge3(base, ours, theirs):
+    """Three-way merge of one value; returns (value, conflicted)."""
+    if ours == theirs or theirs == base:
+        return ours, False
+    if ours == base:
+        return theirs, False
+    return ours, True
+
+
+def merge_specs(base, ours, theirs):
+    """Merge the GitHub side of an entry into the spec side.
+
+    The title, the labels and each body section are merged on their own,
+    so edits to different sections don't conflict; a body that isn't
+    in the BODY_SECTIONS layout is merged as a whole. Returns (merged,
+    conflicts), conflicts naming the parts changed on both sides, which
+    keep the spec's version.
+    """
+    conflicts = []
+
+    def merge(name, base_value, ours_value, theirs_value):
+        value, conflicted = merge3(base_value, ours_value, theirs_value)
+        if conflicted:
+            conflicts.append(name)
+        return value
+
+    title = merge("title", base.title, ours.title, theirs.title)
+    # A label removed on either side stays removed, one added on either is added
+    removed = (set(base.labels) - set(ours.labels)) | (set(base.labels) - set(theirs.labels))
+    labels = [
+        label for label in dict.fromkeys(ours.labels + theirs.labels)
+        if label not in removed
+    ]
+    if base.structured and ours.structured and theirs.structured:
+        sections = {
+            name: merge(heading, getattr(base, name), getattr(ours, name),
+                        getattr(theirs, name))
+            for heading, name, _ in BODY_SECTIONS
+        }
+        merged = ours.replace(title=title, labels=labels, **sections)
+    else:
+        body = merge("body", base.body, ours.body, theirs.body)
+        merged = IssueSpec.from_markdown(title, body, labels, ours.milestone,
+                                         ours.project, ours.fields)
+    return merged, conflicts
+
+
+def changed_parts(old, new):
+    """Name the parts of a spec entry that differ between two versions."""
+    parts = [name for name in ("title", "labels") if getattr(old, name) != getattr(new, name)]
+    if old.sections() != new.sections():
+        parts.extend(
+            heading for heading, name, _ in BODY_SECTIONS
+            if getattr(old, name) != getattr(new, name)
+        )
+    elif old.body != new.body:
+        parts.append("body")
+    return parts
+
+
+def plan_links(graph, numbers, bodies, manifest=None):
+    """Return the (spec, number, body) edits that link dependencies.
+
+    numbers maps titles to issue numbers and bodies maps titles to the
+    current issue bodies where they are known. Issues whose body already
+    carries the links, or whose links are recorded in the manifest, are
+    left alone.
+    """
+    edits = []
+    for spec in graph.specs:
+        title = spec[0]
+        if numbers.get(title) is None or not graph.dependencies[title]:
+            continue
+        body = with_fingerprint(title, graph.link(spec, numbers))
+        if body == with_fingerprint(title, spec[1]) or bodies.get(title) == body:
+            continue
+        if manifest is not None and manifest.is_linked(title, body):
+            continue
+        edits.append((spec, numbers[title], body))
+    return edits
+
+
+def edit_bodies(repo, limiter, edits, concurrency=1):
+    """PATCH the body of each (spec, number, body) edit.
+
+    repo should be lazy so no issue is fetched first. Yields
+    (edit, error) pairs in order.
+    """
+    def edit(item):
+        _, number, body = item
+        try:
+            limiter.call(repo.get_issue(number).edit, body=body)
+            return None
+        except GithubException as e:
+            return e
 
-- Create docker-compose.yml file
-- Add MySQL service
-- Add backend service
-- Add frontend service (optional)
-- Configure environment variables
-- Add volume mounts for data persistence
-- Document usage in README
+    return run_ordered(edit, edits, concurrency)
 
-## Acceptance Criteria
 
-- [ ] docker-compose.yml exists in root
-- [ ] `docker-compose up` starts MySQL
-- [ ] MySQL is accessible to backend
-- [ ] Environment variables are configured
-- [ ] Data persists between restarts
-- [ ] README documents Docker setup
+def close_issues(repo, limiter, numbers, concurrency=1):
+    """Close each issue as not planned over REST.
 
-## Required Files
+    repo should be lazy so no issue is fetched first. Yields
+    (number, error) pairs in order.
+    """
+    def close(number):
+        try:
+            limiter.call(repo.get_issue(number).edit, state="closed",
+                         state_reason="not_planned")
+            return None
+        except GithubException as e:
+            return e
+
+    return run_ordered(close, numbers, concurrency)
+
+
+def find_duplicates(issues, specs, manifest=None):
+    """Group a repository's issues by the spec entry they were created from.
+
+    Issues are matched by their fingerprint marker, or by normalized title
+    when they have none. Returns (title, keep, duplicates) for each entry
+    with more than one issue: keep is the issue the manifest records, else
+    one that other issues link to, else the oldest.
+    """
+    by_fingerprint = {}
+    for issue in sorted(issues, key=lambda issue: issue.number):
+        match = FINGERPRINT_RE.search(issue.body or "")
+        key = match.group(1) if match else spec_fingerprint(issue.title)
+        by_fingerprint.setdefault(key, []).append(issue)
+    referenced = {
+        int(number) for issue in issues
+        for number in ISSUE_REFERENCE_RE.findall(issue.body or "")
+    }
+    groups = []
+    for spec in specs:
+        title = spec[0]
+        group = by_fingerprint.get(spec_fingerprint(title), [])
+        if len(group) < 2:
+            continue
+        entry = manifest.get(title) if manifest is not None else None
+        keep = next(
+            (issue for issue in group if entry and issue.number == entry["number"]),
+            None,
+        ) or next(
+            (issue for issue in group if issue.number in referenced), group[0]
+        )
+        groups.append((title, keep, [issue for issue in group if issue is not keep]))
+    return groups
+
+
+def plan_labels(existing, labels, prune=False):
+    """Diff the desired labels against the repository's labels.
+
+    existing maps label name to (color, description). Returns (name, action)
+    pairs in spec order, where action is "created", "updated" or
+    "unchanged"; with prune, labels missing from the spec follow as
+    "deleted".
+    """
+    plan = []
+    for name, color, description in labels:
+        if name not in existing:
+            plan.append((name, "created"))
+            continue
+        actual_color, actual_description = existing[name]
+        if (actual_color.lower() == color.lower()
+                and (actual_description or "") == description):
+            plan.append((name, "unchanged"))
+        else:
+            plan.append((name, "updated"))
+    if prune:
+        wanted = {name for name, _, _ in labels}
+        plan.extend(
+            (name, "deleted") for name in existing
+            if name not in wanted and not name.startswith(SHARD_LEASE_PREFIX)
+        )
+    return plan
+
+
+def apply_labels(repo, limiter, labels, concurrency=1, prune=False):
+    """Reconcile repository labels with the spec over REST.
+
+    Only labels that are missing or have drifted are written, using up to
+    concurrency parallel requests. Returns a list of (name, action, error)
+    tuples (see plan_labels); error is None on success.
+    """
+    existing = {
+        label.name: label
+        for label in limiter.call(lambda: list(repo.get_labels()))
+    }
+    plan = plan_labels(
+        {name: (label.color, label.description) for name, label in existing.items()},
+        labels,
+        prune,
+    )
+    wanted = {name: (color, description) for name, color, description in labels}
+
+    def apply(step):
+        name, action = step
+        try:
+            if action == "created":
+                limiter.call(repo.create_label, name, *wanted[name])
+            elif action == "updated":
+                limiter.call(existing[name].edit, name, *wanted[name])
+            elif action == "deleted":
+                limiter.call(existing[name].delete)
+        except GithubException as e:
+            if action == "created" and e.status == 422:
+                # Created in the meantime, e.g. by another --shard job
+                return "unchanged", None
+            return action, e
+        return action, None
+
+    return [
+        (name, action, error)
+        for (name, _), (action, error) in run_ordered(apply, plan, concurrency)
+    ]
+
+
+class GraphQLBackend:
+    """Create labels and issues with batched, aliased GraphQL mutations.
+
+    The repository and label node IDs are resolved once; afterwards each
+    request carries up to batch_size createIssue/createLabel mutations.
+    """
+
+    def __init__(self, g, repo, limiter, batch_size):
+        self.requester = g.requester
+        self.owner, self.name = repo.full_name.split("/", 1)
+        self.limiter = limiter
+        self.batch_size = batch_size
+        self.repository_id = None
+        self.label_ids = {}
+
+    def query(self, query, variables=None):
+        """Send one GraphQL request and return (data, errors_by_alias).
+
+        Errors tied to a single alias are returned so the rest of a batch
+        can succeed. Rate limits and request-wide errors raise
+        GithubException.
+        """
+        def send():
+            headers, data = self.requester.requestJsonAndCheck(
+                "POST",
+                self.requester.graphql_url,
+                input={"query": query, "variables": variables or {}},
+                headers={"Accept": GRAPHQL_LABELS_PREVIEW},
+            )
+            errors = data.get("errors") or []
+            if any(error.get("type") == "RATE_LIMITED" for error in errors):
+                raise GithubException(403, data, headers)
+            return data, errors
+
+        data, errors = self.limiter.call(send)
+        by_alias = {}
+        for error in errors:
+            path = error.get("path") or []
+            if not path:
+                raise GithubException(400, {"message": error.get("message")})
+            status = 403 if error.get("type") == "FORBIDDEN" else 422
+            by_alias[path[0]] = GithubException(
+                status, {"message": error.get("message")}
+            )
+        return data.get("data") or {}, by_alias
+
+    def resolve(self):
+        """Look up the repository ID and existing labels."""
+        labels = {}
+        cursor = None
+        while True:
+            data, _ = self.query(
+                """query($owner: String!, $name: String!, $after: String) {
+                  repository(owner: $owner, name: $name) {
+                    id
+                    labels(first: 100, after: $after) {
+                      nodes { id name color description }
+                      pageInfo { hasNextPage endCursor }
+                    }
+                  }
+                }""",
+                {"owner": self.owner, "name": self.name, "after": cursor},
+            )
+            repository = data["repository"]
+            self.repository_id = repository["id"]
+            for node in repository["labels"]["nodes"]:
+                labels[node["name"]] = node
+            page = repository["labels"]["pageInfo"]
+            if not page["hasNextPage"]:
+                break
+            cursor = page["endCursor"]
+        self.label_ids = {name: node["id"] for name, node in labels.items()}
+        return labels
+
+    def mutate(self, mutation, input_type, inputs, selection):
+        """Run one aliased mutation per input in a single request.
+
+        Returns a list of (payload, error) pairs in input order.
+        """
+        return self.mutate_many(
+            [(mutation, input_type, item, selection) for item in inputs]
+        )
+
+    def mutate_many(self, calls):
+        """Run (mutation, input_type, input, selection) calls in one request.
+
+        The calls may mix mutations. Returns a list of (payload, error)
+        pairs in call order.
+        """
+        if not calls:
+            return []
+        aliases = [f"m{i}" for i in range(len(calls))]
+        params = ", ".join(
+            f"${alias}: {input_type}!"
+            for alias, (_, input_type, _, _) in zip(aliases, calls)
+        )
+        fields = "\n".join(
+            f"{alias}: {mutation}(input: ${alias}) {{ {selection} }}"
+            for alias, (mutation, _, _, selection) in zip(aliases, calls)
+        )
+        try:
+            data, errors = self.query(
+                f"mutation({params}) {{\n{fields}\n}}",
+                {alias: item for alias, (_, _, item, _) in zip(aliases, calls)},
+            )
+        except GithubException as e:
+            return [(None, e)] * len(calls)
+        return [(data.get(alias), errors.get(alias)) for alias in aliases]
+
+    def issue_ids(self, numbers):
+        """Look up the node IDs of issues in one aliased query.
+
+        Returns a list of (node_id, error) pairs in order.
+        """
+        if not numbers:
+            return []
+        fields = "\n".join(
+            f"i{i}: issue(number: {number}) {{ id }}"
+            for i, number in enumerate(numbers)
+        )
+        try:
+            data, errors = self.query(
+                f"""query($owner: String!, $name: String!) {{
+                  repository(owner: $owner, name: $name) {{
+                    {fields}
+                  }}
+                }}""",
+                {"owner": self.owner, "name": self.name},
+            )
+        except GithubException as e:
+            return [(None, e)] * len(numbers)
+        repository = data.get("repository") or {}
+        results = []
+        for i, number in enumerate(numbers):
+            issue = repository.get(f"i{i}")
+            if issue is None:
+                results.append((None, errors.get("repository") or GithubException(
+                    404, {"message": f"issue #{number} not found"}
+                )))
+            else:
+                results.append((issue["id"], None))
+        return results
+
+    def apply_labels(self, labels, prune=False):
+        """Reconcile repository labels with the spec in batches.
+
+        Only missing or drifted labels are written. Returns a list of
+        (name, action, error) tuples like apply_labels.
+        """
+        existing = self.resolve()
+        plan = plan_labels(
+            {name: (node["color"], node["description"])
+             for name, node in existing.items()},
+            labels,
+            prune,
+        )
+        wanted = {name: (color, description) for name, color, description in labels}
+        mutations = {
+            "created": ("createLabel", "CreateLabelInput", "label { id name }"),
+            "updated": ("updateLabel", "UpdateLabelInput", "label { id name }"),
+            "deleted": ("deleteLabel", "DeleteLabelInput", "clientMutationId"),
+        }
+        errors = {}
+        for action, (mutation, input_type, selection) in mutations.items():
+            names = [name for name, step in plan if step == action]
+            inputs = []
+            for name in names:
+                if action == "created":
+                    color, description = wanted[name]
+                    inputs.append({"repositoryId": self.repository_id, "name": name,
+                                   "color": color, "description": description})
+                elif action == "updated":
+                    color, description = wanted[name]
+                    inputs.append({"id": existing[name]["id"], "name": name,
+                                   "color": color, "description": description})
+                else:
+                    inputs.append({"id": existing[name]["id"]})
+            for batch in batched(list(zip(names, inputs)), self.batch_size):
+                outcomes = self.mutate(
+                    mutation, input_type, [item for _, item in batch], selection
+                )
+                for (name, _), (payload, error) in zip(batch, outcomes):
+                    errors[name] = error
+                    if payload and action == "created":
+                        self.label_ids[name] = payload["label"]["id"]
+                    elif error is None and action == "deleted":
+                        self.label_ids.pop(name, None)
+        raced = set()
+        if any(errors.get(name) for name, action in plan if action == "created"):
+            # Labels another --shard job created in the meantime
+            raced = self.resolve().keys()
+        return [
+            (name, "unchanged", None)
+            if action == "created" and errors.get(name) and name in raced
+            else (name, action, errors.get(name))
+            for name, action in plan
+        ]
+
+    def create_batch(self, specs):
+        """Create a batch of issues in one request.
+
+        Entries naming a label the repository doesn't have are failed
+        without being sent, rather than created without that label.
+        Returns (status, number, error) tuples like create_issue.
+        """
+        results = [None] * len(specs)
+        todo = []
+        for i, (title, body, labels) in enumerate(specs):
+            missing = [label for label in labels if label not in self.label_ids]
+            if missing:
+                results[i] = ("failed", None, GithubException(
+                    422, {"message": f"unknown labels: {', '.join(missing)}"}
+                ))
+                continue
+            todo.append((i, {
+                "repositoryId": self.repository_id,
+                "title": title,
+                "body": with_fingerprint(title, body),
+                "labelIds": [self.label_ids[label] for label in labels],
+            }))
+        outcomes = self.mutate(
+            "createIssue", "CreateIssueInput", [item for _, item in todo],
+            "issue { number }",
+        )
+        for (i, _), (payload, error) in zip(todo, outcomes):
+            if payload:
+                results[i] = ("created", payload["issue"]["number"], None)
+            else:
+                results[i] = ("failed", None, error)
+        return results
+
+    def issue_mutations(self, items, number, mutation, input_type, make_input,
+                        selection="clientMutationId", concurrency=1):
+        """Run one mutation per issue in batches, yielding (item, error) in order.
+
+        number(item) is the issue number and make_input(item, node_id) the
+        mutation input. Each batch costs two requests: one aliased query
+        for the issue node IDs and one aliased mutation.
+        """
+        def process(batch):
+            results = [None] * len(batch)
+            todo = []
+            ids = self.issue_ids([number(item) for item in batch])
+            for i, (item, (node_id, error)) in enumerate(zip(batch, ids)):
+                if error is not None:
+                    results[i] = error
+                else:
+                    todo.append((i, make_input(item, node_id)))
+            if todo:
+                outcomes = self.mutate(
+                    mutation, input_type, [item for _, item in todo], selection,
+                )
+                for (i, _), (_, error) in zip(todo, outcomes):
+                    results[i] = error
+            return results
+
+        batches = run_ordered(
+            process, batched(items, self.batch_size), concurrency
+        )
+        for batch, results in batches:
+            yield from zip(batch, results)
+
+    def edit_bodies(self, edits, concurrency=1):
+        """Rewrite the body of each (spec, number, body) edit in batches.
+
+        Yields (edit, error) in order.
+        """
+        return self.issue_mutations(
+            edits, lambda edit: edit[1], "updateIssue", "UpdateIssueInput",
+            lambda edit, node_id: {"id": node_id, "body": edit[2]},
+            "issue { number }", concurrency,
+        )
+
+    def close_issues(self, numbers, delete=False, concurrency=1):
+        """Close, or with delete remove, issues in batches.
+
+        Deleting needs admin access to the repository. Yields
+        (number, error) in order.
+        """
+        if delete:
+            return self.issue_mutations(
+                numbers, lambda number: number, "deleteIssue", "DeleteIssueInput",
+                lambda number, node_id: {"issueId": node_id},
+                concurrency=concurrency,
+            )
+        return self.issue_mutations(
+            numbers, lambda number: number, "closeIssue", "CloseIssueInput",
+            lambda number, node_id: {"issueId": node_id, "stateReason": "NOT_PLANNED"},
+            "issue { number }", concurrency,
+        )
+
+    def create_issues(self, specs, index=None, concurrency=1, done=None):
+        """Create issues in batches, yielding (spec, result) in spec order.
+
+        Entries already present in index are reported as "exists" and are
+        not sent. done(spec, result) is called as soon as a batch finishes.
+        """
+        def process(batch):
+            results = [None] * len(batch)
+            todo = []
+            for i, spec in enumerate(batch):
+                existing = index.find(spec[0]) if index is not None else None
+                if existing is not None:
+                    results[i] = ("exists", existing.number, None)
+                else:
+                    todo.append(i)
+            if todo:
+                created = self.create_batch([batch[i] for i in todo])
+                for i, result in zip(todo, created):
+                    results[i] = result
+            if done is not None:
+                for spec, result in zip(batch, results):
+                    done(spec, result)
+            return results
+
+        batches = run_ordered(
+            process, batched(specs, self.batch_size), concurrency
+        )
+        for batch, results in batches:
+            yield from zip(batch, results)
+
+
+class BoardAssigner:
+    """Put issues on milestones and Projects v2 boards with batched GraphQL.
+
+    Milestone IDs are looked up once per repository (missing milestones
+    are created over REST, GraphQL can't) and project, field and option
+    IDs once per run through the shared projects dict. Each batch of
+    issues then costs up to three requests: the issue IDs, the milestones
+    and project items, and the field values.
+    """
+
+    PROJECT_FIELDS = """
+        id
+        fields(first: 100) {
+          nodes {
+            ... on ProjectV2FieldCommon { id name dataType }
+            ... on ProjectV2SingleSelectField { options { id name } }
+            ... on ProjectV2IterationField {
+              configuration { iterations { id title startDate duration } }
+            }
+          }
+        }
+    """
+
+    def __init__(self, backend, projects):
+        self.backend = backend
+        self.projects = projects
+        self.milestones = None
+
+    def milestone_id(self, title):
+        """Return the node ID of a milestone, creating it if it's missing."""
+        backend = self.backend
+        if self.milestones is None:
+            milestones = {}
+            cursor = None
+            while True:
+                data, _ = backend.query(
+                    """query($owner: String!, $name: String!, $after: String) {
+                      repository(owner: $owner, name: $name) {
+                        milestones(first: 100, after: $after, states: [OPEN, CLOSED]) {
+                          nodes { id title }
+                          pageInfo { hasNextPage endCursor }
+                        }
+                      }
+                    }""",
+                    {"owner": backend.owner, "name": backend.name, "after": cursor},
+                )
+                page = data["repository"]["milestones"]
+                for node in page["nodes"]:
+                    milestones[node["title"]] = node["id"]
+                if not page["pageInfo"]["hasNextPage"]:
+                    break
+                cursor = page["pageInfo"]["endCursor"]
+            self.milestones = milestones
+        if title not in self.milestones:
+            _, data = backend.limiter.call(
+                backend.requester.requestJsonAndCheck, "POST",
+                f"/repos/{backend.owner}/{backend.name}/milestones",
+                input={"title": title},
+            )
+            self.milestones[title] = data["node_id"]
+        return self.milestones[title]
+
+    def project(self, ref):
+        """Return the project "OWNER/NUMBER" as {"id", "fields"}."""
+        if ref not in self.projects:
+            owner, _, number = ref.rpartition("/")
+            if not owner or not number.isdigit():
+                raise GithubException(
+                    422, {"message": f"project '{ref}' isn't OWNER/NUMBER"}
+                )
+            data, _ = self.backend.query(
+                f"""query($owner: String!, $number: Int!) {{
+                  repositoryOwner(login: $owner) {{
+                    ... on User {{ projectV2(number: $number) {{ {self.PROJECT_FIELDS} }} }}
+                    ... on Organization {{ projectV2(number: $number) {{ {self.PROJECT_FIELDS} }} }}
+                  }}
+                }}""",
+                {"owner": owner, "number": int(number)},
+            )
+            project = (data.get("repositoryOwner") or {}).get("projectV2")
+            if project is None:
+                raise GithubException(404, {"message": f"project {ref} not found"})
+            self.projects[ref] = {
+                "id": project["id"],
+                "fields": {
+                    field["name"].casefold(): field
+                    for field in project["fields"]["nodes"] if field
+                },
+            }
+        return self.projects[ref]
+
+    @staticmethod
+    def field_value(project, name, value):
+        """Return (field_id, ProjectV2FieldValue) for one field of a project.
+
+        Single-select options and iterations are matched by name;
+        "@current" picks the iteration running today.
+        """
+        field = project["fields"].get(name.casefold())
+        if field is None:
+            raise GithubException(422, {"message": f"project has no field '{name}'"})
+        kind = field.get("dataType")
+        if kind == "SINGLE_SELECT":
+            for option in field["options"]:
+                if option["name"].casefold() == str(value).casefold():
+                    return field["id"], {"singleSelectOptionId": option["id"]}
+        elif kind == "ITERATION":
+            today = datetime.now(timezone.utc).date()
+            for iteration in field["configuration"]["iterations"]:
+                start = datetime.strptime(iteration["startDate"], "%Y-%m-%d").date()
+                current = 0 <= (today - start).days < iteration["duration"]
+                if (current if value == "@current"
+                        else iteration["title"].casefold() == str(value).casefold()):
+                    return field["id"], {"iterationId": iteration["id"]}
+        elif kind == "NUMBER":
+            return field["id"], {"number": float(value)}
+        elif kind == "DATE":
+            return field["id"], {"date": str(value)}
+        else:
+            return field["id"], {"text": str(value)}
+        raise GithubException(
+            422, {"message": f"field '{name}' has no option '{value}'"}
+        )
+
+    def prepare(self, placement):
+        """Resolve (milestone, project, fields) into IDs before batching."""
+        milestone, project, fields = placement
+        milestone_id = self.milestone_id(milestone) if milestone else None
+        if fields and not project:
+            raise GithubException(422, {"message": "fields need a project"})
+        project = self.project(project) if project else None
+        values = [
+            self.field_value(project, name, value) for name, value in fields.items()
+        ]
+        return milestone_id, project and project["id"], values
+
+    def assign(self, items, concurrency=1):
+        """Place each (spec, number, placement) item, yielding (item, error).
+
+        Results come in order; IDs are resolved in the calling thread
+        first, so only the per-issue requests run concurrently.
+        """
+        resolved = []
+        for item in items:
+            try:
+                resolved.append((item, self.prepare(item[2]), None))
+            except GithubException as e:
+                resolved.append((item, None, e))
+            except ValueError as e:
+                resolved.append((item, None, GithubException(422, {"message": str(e)})))
+
+        def process(batch):
+            errors = [error for _, _, error in batch]
+            todo = [i for i, error in enumerate(errors) if error is None]
+            ids = dict(zip(todo, self.backend.issue_ids(
+                [batch[i][0][1] for i in todo]
+            )))
+            calls, owners = [], []
+            for i, (node_id, error) in ids.items():
+                milestone_id, project_id, _ = batch[i][1]
+                if error is not None:
+                    errors[i] = error
+                    continue
+                if milestone_id:
+                    calls.append(("updateIssue", "UpdateIssueInput",
+                                  {"id": node_id, "milestoneId": milestone_id},
+                                  "issue { number }"))
+                    owners.append(i)
+                if project_id:
+                    calls.append(("addProjectV2ItemById", "AddProjectV2ItemByIdInput",
+                                  {"projectId": project_id, "contentId": node_id},
+                                  "item { id }"))
+                    owners.append(i)
+            fields = []
+            for i, (payload, error) in zip(owners, self.backend.mutate_many(calls)):
+                errors[i] = errors[i] or error
+                if payload and "item" in payload:
+                    _, project_id, values = batch[i][1]
+                    fields.extend(
+                        (i, ("updateProjectV2ItemFieldValue",
+                             "UpdateProjectV2ItemFieldValueInput",
+                             {"projectId": project_id, "itemId": payload["item"]["id"],
+                              "fieldId": field_id, "value": value},
+                             "projectV2Item { id }"))
+                        for field_id, value in values
+                    )
+            if fields:
+                outcomes = self.backend.mutate_many([call for _, call in fields])
+                for (i, _), (_, error) in zip(fields, outcomes):
+                    errors[i] = errors[i] or error
+            return errors
+
+        batches = run_ordered(
+            process, batched(resolved, self.backend.batch_size), concurrency
+        )
+        for batch, errors in batches:
+            for (item, _, _), error in zip(batch, errors):
+                yield item, error
+
+
+class ResponseCache:
+    """On-disk cache of GET responses revalidated with conditional requests.
+
+    Responses carrying an ETag or Last-Modified header are stored and sent
+    back as If-None-Match/If-Modified-Since; a 304 (which GitHub doesn't
+    count against the rate limit) is answered from the cache. Each entry
+    is a JSON file written atomically, so concurrent processes can share a
+    directory. Entries older than max_age are dropped and the least
+    recently used ones are evicted once the directory exceeds max_bytes.
+    """
+
+    def __init__(self, directory, max_bytes=CACHE_MAX_BYTES, max_age=CACHE_MAX_AGE):
+        self.directory = os.path.expanduser(directory)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+        self.prune()
+
+    def _path(self, url, headers):
+        # Responses differ per token and media type, so both are in the key
+        headers = _lower_headers(headers)
+        key = "\n".join(
+            (url, headers.get("accept", ""), headers.get("authorization", ""))
+        )
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def lookup(self, url, headers):
+        """Return (entry, conditional_headers) for a GET, or (None, {})."""
+        path = self._path(url, headers)
+        try:
+            if time.time() - os.path.getmtime(path) > self.max_age:
+                os.remove(path)
+                return None, {}
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None, {}
+        conditional = {}
+        if entry.get("etag"):
+            conditional["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            conditional["If-Modified-Since"] = entry["last_modified"]
+        return entry, conditional
+
+    def revalidated(self, url, headers, entry, response_headers):
+        """Record a 304 and return the cached (headers, body).
+
+        Fresh rate-limit headers from the 304 replace the cached ones.
+        """
+        with self._lock:
+            self.hits += 1
+        try:
+            os.utime(self._path(url, headers))
+        except OSError:
+            pass
+        merged = dict(entry["headers"])
+        merged.update(_lower_headers(response_headers))
+        return merged, entry["body"]
+
+    def store(self, url, headers, response_headers, body):
+        """Cache a 200 response to a GET if it can be revalidated."""
+        with self._lock:
+            self.misses += 1
+        response_headers = _lower_headers(response_headers)
+        etag = response_headers.get("etag")
+        last_modified = response_headers.get("last-modified")
+        if not etag and not last_modified:
+            return
+        path = self._path(url, headers)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "url": url,
+                    "etag": etag,
+                    "last_modified": last_modified,
+                    "headers": response_headers,
+                    "body": body,
+                }, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+    def prune(self):
+        """Drop expired entries and evict old ones beyond max_bytes."""
+        now = time.time()
+        entries = []
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if not entry.name.endswith(".json"):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    if now - stat.st_mtime > self.max_age:
+                        self._remove(entry.path)
+                    else:
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            return
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            # Another process may have evicted it already
+            pass
+
+
+class CachedResponse:
+    """A cached body answered in place of a 304, shaped like RequestsResponse."""
+
+    def __init__(self, headers, body):
+        self.status = 200
+        self.headers = headers
+        self.body = body
+
+    def getheaders(self):
+        return self.headers.items()
+
+    def read(self):
+        return self.body
+
+
+def _connection_class(base, cache, metrics=None):
+    """Make a thread-safe PyGithub connection class with an optional cache.
+
+    PyGithub stores each request on the shared connection object between
+    request() and getresponse(), so concurrent workers could send each
+    other's requests; here that state is kept per thread instead.
+    """
+
+    class Connection(base):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self._pending = threading.local()
+
+        def request(self, verb, url, input, headers, stream=False):
+            self._pending.request = (verb, url, input, headers)
+
+        def getresponse(self):
+            from github.Requester import RequestsResponse
+            verb, path, data, headers = self._pending.request
+            url = f"{self.protocol}://{self.host}:{self.port}{path}"
+            entry = None
+            if cache is not None and verb == "GET":
+                entry, conditional = cache.lookup(url, headers)
+                headers = dict(headers, **conditional)
+            started = time.monotonic()
+            response = RequestsResponse(self.session.request(
+                verb,
+                url,
+                headers=headers,
+                data=data,
+                timeout=self.timeout,
+                verify=self.verify,
+                allow_redirects=False,
+            ))
+            if metrics is not None:
+                metrics.request(
+                    verb, url, response.status, time.monotonic() - started,
+                    len(response.response.content), response.headers,
+                    cached=entry is not None and response.status == 304,
+                )
+            if entry is not None and response.status == 304:
+                return CachedResponse(*cache.revalidated(
+                    url, headers, entry, response.headers
+                ))
+            if cache is not None and verb == "GET" and response.status == 200:
+                cache.store(url, headers, response.headers, response.read())
+            return response
+
+    return Connection
+
+
+def api_url():
+    """Return the REST API root URL."""
+    return os.getenv("GITHUB_API_URL", DEFAULT_API_URL).rstrip("/")
+
+
+def make_client(token, concurrency, cache=None, metrics=None):
+    """Build a PyGithub client for use behind a RateLimiter."""
+    github = load_github()
+    from github.Requester import (
+        HTTPRequestsConnectionClass,
+        HTTPSRequestsConnectionClass,
+        Requester,
+    )
+    from urllib3.util import Retry
+    if cache is not None or metrics is not None or concurrency > 1:
+        Requester.injectConnectionClasses(
+            _connection_class(HTTPRequestsConnectionClass, cache, metrics),
+            _connection_class(HTTPSRequestsConnectionClass, cache, metrics),
+        )
+        # Injecting turns off connection reuse; the per-thread pending
+        # request keeps the one shared connection safe, so keep it alive
+        Requester._Requester__persist = True
+    else:
+        Requester.resetConnectionClasses()
+    # Pacing and rate-limit retries are handled by RateLimiter, so
+    # PyGithub's own request spacing and 403 retries are turned off.
+    return github.Github(
+        auth=github.Auth.Token(token),
+        base_url=api_url(),
+        per_page=100,
+        pool_size=concurrency,
+        retry=Retry(total=3, backoff_factor=1),
+        seconds_between_requests=None,
+        seconds_between_writes=None,
+    )
+
+
+def _next_link(header):
+    """Return the rel="next" URL of a Link header, or None."""
+    for part in (header or "").split(","):
+        url, _, rel = part.partition(";")
+        if rel.strip() == 'rel="next"':
+            return url.strip().strip("<>")
+    return None
+
+
+class AsyncTransport:
+    """Pooled keep-alive aiohttp session running on a background event loop.
+
+    Worker threads hand requests to the loop and wait for the result, so
+    all of them share one connection pool while any number of requests are
+    in flight. Error responses raise GithubException just like PyGithub.
+    """
+
+    def __init__(self, token, concurrency, cache=None, metrics=None):
+        try:
+            import aiohttp
+        except ImportError:
+            raise SystemExit(
+                "Error: --transport asyncio requires aiohttp: pip install aiohttp"
+            )
+        import asyncio
+        # Error responses are raised as PyGithub's GithubException
+        load_github()
+        self.aiohttp = aiohttp
+        self.asyncio = asyncio
+        self.base_url = api_url()
+        if self.base_url.endswith("/api/v3"):
+            self.graphql_url = self.base_url[:-len("/v3")] + "/graphql"
+        else:
+            self.graphql_url = f"{self.base_url}/graphql"
+        self.headers = {
+            "Authorization": f"token {token}",
+            "Accept": "application/vnd.github+json",
+            "User-Agent": "create_github_issues",
+        }
+        self.concurrency = concurrency
+        self.cache = cache
+        self.metrics = metrics
+        self.loop = self.asyncio.new_event_loop()
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
+        self.session = self._run(self._open())
+        atexit.register(self.close)
+
+    async def _open(self):
+        connector = self.aiohttp.TCPConnector(
+            limit=self.concurrency, keepalive_timeout=60
+        )
+        return self.aiohttp.ClientSession(headers=self.headers, connector=connector)
+
+    def _run(self, coroutine):
+        return self.asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    async def _request(self, method, url, payload, headers):
+        async with self.session.request(
+            method, url, json=payload, headers=headers
+        ) as response:
+            text = await response.text()
+            return response.status, dict(response.headers), text
+
+    def request(self, method, url, payload=None, headers=None):
+        """Send a request and return (headers, data, next_url)."""
+        if not url.startswith("http"):
+            url = f"{self.base_url}{url}"
+        entry = None
+        if self.cache is not None and method == "GET":
+            cache_headers = dict(self.headers, **(headers or {}))
+            entry, conditional = self.cache.lookup(url, cache_headers)
+            headers = dict(headers or {}, **conditional)
+        started = time.monotonic()
+        status, response_headers, text = self._run(
+            self._request(method, url, payload, headers)
+        )
+        if self.metrics is not None:
+            self.metrics.request(
+                method, url, status, time.monotonic() - started,
+                len(text.encode("utf-8")), response_headers,
+                cached=entry is not None and status == 304,
+            )
+        if entry is not None and status == 304:
+            response_headers, text = self.cache.revalidated(
+                url, cache_headers, entry, response_headers
+            )
+            status = 200
+        elif self.cache is not None and method == "GET" and status == 200:
+            self.cache.store(url, cache_headers, response_headers, text)
+        data = None
+        if text:
+            try:
+                data = json.loads(text)
+            except ValueError:
+                # Gateways in front of the API answer some 502/503s with
+                # HTML; those are raised as GithubException like any error
+                if status < 400:
+                    raise
+                data = text
+        if status >= 400:
+            from github import UnknownObjectException
+            # Callers may catch the same 404 subclass PyGithub raises
+            error = UnknownObjectException if status == 404 else GithubException
+            raise error(status, data, response_headers)
+        next_url = _next_link(_lower_headers(response_headers).get("link"))
+        return response_headers, data, next_url
+
+    def paginate(self, url):
+        """Yield the items of every page of a list endpoint."""
+        while url:
+            _, data, url = self.request("GET", url)
+            yield from data
+
+    def close(self):
+        if not self.session.closed:
+            self._run(self.session.close())
+            self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+class AsyncRecord:
+    """Plain attribute view of an API response; never loads anything lazily."""
+
+    def __init__(self, transport, data, headers=None):
+        self._transport = transport
+        self._load(data, headers)
+
+    def _load(self, data, headers=None):
+        self.raw_data = data
+        self.raw_headers = headers or {}
+        for key, value in data.items():
+            if key == "labels":
+                value = [AsyncLabel(self._transport, label) for label in value]
+            setattr(self, key, value)
+
+
+class AsyncLabel(AsyncRecord):
+    """Label with the subset of the PyGithub Label API used here."""
+
+    def edit(self, name, color, description):
+        headers, data, _ = self._transport.request(
+            "PATCH", self.url,
+            {"new_name": name, "color": color, "description": description},
+        )
+        self._load(data, headers)
+
+    def delete(self):
+        self._transport.request("DELETE", self.url)
+
+
+class AsyncIssue(AsyncRecord):
+    """Issue with the subset of the PyGithub Issue API used here."""
+
+    def edit(self, **fields):
+        headers, data, _ = self._transport.request("PATCH", self.url, fields)
+        self._load(data, headers)
+
+
+class AsyncRepository(AsyncRecord):
+    """Repository with the subset of the PyGithub Repository API used here."""
+
+    def get_labels(self):
+        return [
+            AsyncLabel(self._transport, label)
+            for label in self._transport.paginate(f"{self.url}/labels?per_page=100")
+        ]
+
+    def get_label(self, name):
+        headers, data, _ = self._transport.request(
+            "GET", f"{self.url}/labels/{quote(name, safe='')}"
+        )
+        return AsyncLabel(self._transport, data, headers)
+
+    def create_label(self, name, color, description):
+        headers, data, _ = self._transport.request(
+            "POST", f"{self.url}/labels",
+            {"name": name, "color": color, "description": description},
+        )
+        return AsyncLabel(self._transport, data, headers)
+
+    def get_issues(self, state="open", sort="created", direction="desc", since=None):
+        url = (f"{self.url}/issues?state={state}&sort={sort}&direction={direction}"
+               "&per_page=100")
+        if since is not None:
+            url += f"&since={since.strftime('%Y-%m-%dT%H:%M:%SZ')}"
+        for issue in self._transport.paginate(url):
+            yield AsyncIssue(self._transport, issue)
+
+    def create_issue(self, title, body, labels):
+        headers, data, _ = self._transport.request(
+            "POST", f"{self.url}/issues",
+            {"title": title, "body": body, "labels": labels},
+        )
+        return AsyncIssue(self._transport, data, headers)
+
+    def get_issue(self, number):
+        # Only the URL is needed to edit, so nothing is fetched here
+        return AsyncIssue(self._transport, {
+            "number": number, "url": f"{self.url}/issues/{number}",
+        })
+
+
+class AsyncRequester:
+    """Stand-in for PyGithub's Requester as used by GraphQLBackend."""
+
+    def __init__(self, transport):
+        self.transport = transport
+        self.graphql_url = transport.graphql_url
+
+    def requestJsonAndCheck(self, verb, url, input=None, headers=None):
+        response_headers, data, _ = self.transport.request(verb, url, input, headers)
+        return response_headers, data
+
+
+class AsyncGithub:
+    """Drop-in for the parts of the Github client that run_repo() uses."""
+
+    def __init__(self, token, concurrency, cache=None, metrics=None):
+        self.transport = AsyncTransport(token, concurrency, cache, metrics)
+        self.requester = AsyncRequester(self.transport)
+
+    def get_repo(self, full_name):
+        owner, name = full_name.split("/", 1)
+        headers, data, _ = self.transport.request(
+            "GET", f"/repos/{quote(owner)}/{quote(name)}"
+        )
+        return AsyncRepository(self.transport, data, headers)
+
+    def withLazy(self, lazy):
+        # Records are never completed lazily, so there is nothing to toggle
+        return self
+
+    def close(self):
+        self.transport.close()
+
+
+PlannedCall = namedtuple("PlannedCall", "api method path description write")
+
+
+class CallCount:
+    """Running totals of planned calls, so a plan is never held in memory."""
+
+    def __init__(self):
+        self.rest = 0
+        self.graphql = 0
+        self.writes = 0
+
+    def add(self, call):
+        """Count one PlannedCall and return it."""
+        if call.api == "rest":
+            self.rest += 1
+        else:
+            self.graphql += 1
+        self.writes += call.write
+        return call
+
+    def update(self, other):
+        """Add the totals of another CallCount."""
+        self.rest += other.rest
+        self.graphql += other.graphql
+        self.writes += other.writes
+
+    @property
+    def total(self):
+        return self.rest + self.graphql
+
+    @property
+    def reads(self):
+        return self.total - self.writes
+
+
+def plan_calls(repo_name, label_plan, issue_plan, args,
+               existing_labels=0, existing_issues=0, list_issues=True, links=0,
+               placed=0):
+    """Yield the API requests a run would send for label and issue plans.
+
+    label_plan comes from plan_labels() and issue_plan is a list of
+    (title, action, number) from plan_issue(). The existing_* counts size
+    the paginated listings, links is the number of issues whose
+    dependencies --link-dependencies may rewrite and placed the number
+    of issues to put on milestones and projects.
+    """
+    yield PlannedCall("rest", "GET", f"/repos/{repo_name}", "get repository", False)
+    if args.shard:
+        yield PlannedCall("rest", "POST", f"/repos/{repo_name}/labels",
+                          f"take the lease of shard {args.shard[0]}/{args.shard[1]}",
+                          True)
+    graphql = args.backend == "graphql"
+    label_pages = max(1, math.ceil(existing_labels / 100))
+    for page in range(1, label_pages + 1):
+        if graphql:
+            yield PlannedCall("graphql", "POST", "/graphql",
+                              f"query repository and labels (page {page})", False)
+        else:
+            yield PlannedCall("rest", "GET", f"/repos/{repo_name}/labels",
+                              f"list labels (page {page})", False)
+
+    label_routes = {
+        "created": ("POST", f"/repos/{repo_name}/labels", "createLabel"),
+        "updated": ("PATCH", f"/repos/{repo_name}/labels/{{}}", "updateLabel"),
+        "deleted": ("DELETE", f"/repos/{repo_name}/labels/{{}}", "deleteLabel"),
+    }
+    for action, (method, path, mutation) in label_routes.items():
+        names = [name for name, step in label_plan if step == action]
+        if graphql:
+            for batch in batched(names, args.batch_size):
+                yield PlannedCall("graphql", "POST", "/graphql",
+                                  f"{mutation} x{len(batch)}", True)
+        else:
+            for name in names:
+                yield PlannedCall("rest", method, path.format(name),
+                                  f"{action[:-1]} label {name}", True)
+
+    if list_issues:
+        for page in range(1, max(1, math.ceil(existing_issues / 100)) + 1):
+            yield PlannedCall("rest", "GET", f"/repos/{repo_name}/issues",
+                              f"list issues (page {page})", False)
+
+    creates = (title for title, action, _ in issue_plan if action == "created")
+    if graphql:
+        for batch in batched(creates, args.batch_size):
+            yield PlannedCall("graphql", "POST", "/graphql",
+                              f"createIssue x{len(batch)}", True)
+    else:
+        for title in creates:
+            yield PlannedCall("rest", "POST", f"/repos/{repo_name}/issues",
+                              f"create issue {title}", True)
+    for title, action, number in issue_plan:
+        if action == "updated":
+            yield PlannedCall("rest", "PATCH", f"/repos/{repo_name}/issues/{number}",
+                              f"update issue {title}", True)
+    if graphql:
+        for batch in batched(range(links), args.batch_size):
+            yield PlannedCall("graphql", "POST", "/graphql",
+                              f"look up issue IDs x{len(batch)}", False)
+            yield PlannedCall("graphql", "POST", "/graphql",
+                              f"updateIssue x{len(batch)}", True)
+    else:
+        for _ in range(links):
+            yield PlannedCall("rest", "PATCH", f"/repos/{repo_name}/issues/:number",
+                              "link dependencies", True)
+    for batch in batched(range(placed), args.batch_size):
+        yield PlannedCall("graphql", "POST", "/graphql",
+                          f"look up issue IDs x{len(batch)}", False)
+        yield PlannedCall("graphql", "POST", "/graphql",
+                          f"add to milestones and projects x{len(batch)}", True)
+        yield PlannedCall("graphql", "POST", "/graphql",
+                          f"set project fields x{len(batch)}", True)
+    if args.shard:
+        name = SHARD_LEASE_LABEL.format(*args.shard)
+        yield PlannedCall("rest", "DELETE", f"/repos/{repo_name}/labels/{name}",
+                          "release the shard lease", True)
+
+
+def count_placements(specs, issue_plan, args):
+    """Return how many planned issues get a milestone or project."""
+    return sum(
+        1 for spec, (_, action, _) in zip(specs, issue_plan)
+        if action in ("created", "updated") and any(issue_placement(spec, args))
+    )
+
+
+def count_links(graph):
+    """Return how many issues --link-dependencies may have to rewrite."""
+    if graph is None:
+        return 0
+    return sum(1 for spec in graph.specs if graph.dependencies[spec.title])
+
+
+def estimate_seconds(count, concurrency, requests_per_minute):
+    """Estimate the wall-clock time of the calls tallied in a CallCount.
+
+    Reads are sent one after another and writes concurrency at a time, but
+    never faster than the rate limiter's requests_per_minute pace.
+    """
+    rounds = count.reads + math.ceil(count.writes / concurrency)
+    latency = rounds * ESTIMATED_REQUEST_SECONDS
+    # The token bucket starts with one token per worker
+    paced = max(count.total - concurrency, 0) * 60 / requests_per_minute
+    return max(latency, paced)
+
+
+def print_plan(args, g, limiter, repo_name, specs, manifest=None, graph=None,
+               mirror=None):
+    """Print what a run would do without sending any write requests.
+
+    With a client (g) the plan is based on read-only listings of the
+    repository; without one it uses the IssueMirror if it holds the
+    repository, and otherwise assumes an empty repository and works from
+    the spec alone. Returns the CallCount of the printed calls, or None
+    if the repository couldn't be read.
+    """
+    existing_labels = {}
+    index = None
+    offline_mirror = (
+        g is None and mirror is not None and mirror.synced(repo_name) is not None
+    )
+    if g is not None:
+        try:
+            repo = limiter.call(g.get_repo, repo_name)
+            repo_name = repo.full_name
+            existing_labels = {
+                label.name: (label.color, label.description)
+                for label in limiter.call(lambda: list(repo.get_labels()))
+            }
+        except GithubException as e:
+            print(f"Error connecting to GitHub: {e}")
+            return None
+        print(f"✓ Connected to repository: {repo_name} (read-only)")
+    elif offline_mirror:
+        synced = mirror.synced(repo_name)[1]
+        existing_labels = mirror.labels(repo_name)
+        print(f"No GitHub token set; planning from the mirror of {repo_name} "
+              f"(synced {format_time(synced)})")
+    else:
+        print(f"No GitHub token set; planning offline for {repo_name}")
+
+    if manifest is not None:
+        manifest = manifest.repository(repo_name)
+    fully_synced = manifest is not None and all(
+        manifest.get(title) is not None for title, _, _ in specs
+    )
+    list_issues = not args.allow_duplicates and not fully_synced
+    if list_issues and offline_mirror:
+        index = mirror.index(repo_name)
+    elif list_issues and g is not None:
+        try:
+            if mirror is not None:
+                mirror.sync(repo, limiter)
+                index = mirror.index(repo_name)
+            else:
+                index = IssueIndex.from_repo(repo, limiter)
+        except GithubException as e:
+            print(f"Error listing existing issues: {e}")
+            return None
+
+    label_plan = plan_labels(existing_labels, LABELS_TO_CREATE, args.prune_labels)
+    issue_plan = [
+        (spec[0], *plan_issue(spec, manifest, index)) for spec in specs
+    ]
+    calls = plan_calls(
+        repo_name, label_plan, issue_plan, args,
+        existing_labels=len(existing_labels),
+        existing_issues=len(index) if index is not None else 0,
+        list_issues=list_issues,
+        links=count_links(graph),
+        placed=count_placements(specs, issue_plan, args),
+    )
+
+    print("\n=== Planned API calls ===")
+    tally = CallCount()
+    for call in map(tally.add, calls):
+        print(f"{call.method:6} {call.path}  ({call.description})")
+
+    def count(plan, action):
+        return sum(1 for step in plan if step[1] == action)
+
+    secondary = tally.writes * WRITE_POINTS + tally.reads * READ_POINTS
+    seconds = estimate_seconds(tally, args.concurrency, args.requests_per_minute)
+    print("\n=== Plan summary ===")
+    print(f"Labels: {count(label_plan, 'created')} to create, "
+          f"{count(label_plan, 'updated')} to update, "
+          f"{count(label_plan, 'unchanged')} unchanged, "
+          f"{count(label_plan, 'deleted')} to delete")
+    print(f"Issues: {count(issue_plan, 'created')} to create, "
+          f"{count(issue_plan, 'updated')} to update, "
+          f"{count(issue_plan, 'unchanged')} unchanged, "
+          f"{count(issue_plan, 'exists')} already exist")
+    print(f"API calls: {tally.rest} REST, {tally.graphql} GraphQL")
+    print(f"Rate-limit points: {tally.rest} core, {tally.graphql} GraphQL, "
+          f"{secondary} secondary")
+    print(f"Estimated time: {seconds:.0f}s at concurrency {args.concurrency} "
+          f"and {args.requests_per_minute:g} requests/minute")
+    print("\nDry run: nothing was written.")
+    return tally
+
+
+def format_time(epoch):
+    """Format an epoch time as local HH:MM, with the date if not today."""
+    moment = datetime.fromtimestamp(epoch)
+    if moment.date() == datetime.now().date():
+        return moment.strftime("%H:%M")
+    return moment.strftime("%Y-%m-%d %H:%M")
+
+
+def fetch_rate_limits(g, limiter):
+    """Return {resource: (remaining, limit, reset)} for core and GraphQL.
+
+    /rate_limit itself doesn't count against the rate limit.
+    """
+    _, data = limiter.call(g.requester.requestJsonAndCheck, "GET", "/rate_limit")
+    resources = data.get("resources") or {}
+    return {
+        name: (resource["remaining"], resource["limit"], resource["reset"])
+        for name, resource in resources.items()
+        if name in ("core", "graphql")
+    }
+
+
+def planned_calls(repo_names, specs, args, manifest=None, graph=None):
+    """Return the CallCount of the calls a run over repo_names needs at most.
+
+    Like an offline --dry-run, every repository is assumed to be empty
+    unless the manifest already knows its issues.
+    """
+    label_plan = plan_labels({}, LABELS_TO_CREATE, args.prune_labels)
+    tally = CallCount()
+    for repo_name in repo_names:
+        repo_manifest = manifest.repository(repo_name) if manifest else None
+        issue_plan = [
+            (spec[0], *plan_issue(spec, repo_manifest)) for spec in specs
+        ]
+        for call in plan_calls(
+            repo_name, label_plan, issue_plan, args,
+            list_issues=not args.allow_duplicates, links=count_links(graph),
+            placed=count_placements(specs, issue_plan, args),
+        ):
+            tally.add(call)
+    return tally
+
+
+def plan_windows(needed, remaining, limit, reset, now):
+    """Split needed requests over rate-limit windows.
+
+    Returns [(start, count)]: what is left of the current window is used
+    right away, then up to limit requests from each following reset.
+    """
+    first = min(needed, max(remaining, 0))
+    windows = [(now, first)]
+    left = needed - first
+    start = reset
+    while left > 0:
+        count = min(left, max(limit, 1))
+        windows.append((start, count))
+        left -= count
+        start += RATE_LIMIT_WINDOW
+    return windows
+
+
+def print_budget(g, limiter, count, args):
+    """Compare a run's CallCount with the remaining rate limit and print an ETA.
+
+    Work that doesn't fit into the current window is scheduled into the
+    following ones; if the budget is already spent, the limiter is held
+    until the reset so the run waits instead of failing with 403s.
+    """
+    try:
+        limits = fetch_rate_limits(g, limiter)
+    except GithubException as e:
+        print(f"- Could not read the rate limit, skipping the budget check: {e}")
+        return
+    now = time.time()
+    eta = now + estimate_seconds(count, args.concurrency, args.requests_per_minute)
+    print("\n=== Rate-limit budget ===")
+    for resource, name in (("core", "Core"), ("graphql", "GraphQL")):
+        needed = count.rest if resource == "core" else count.graphql
+        if not needed or resource not in limits:
+            continue
+        remaining, limit, reset = limits[resource]
+        print(f"{name}: needs up to {needed} requests, {remaining} of {limit} "
+              f"left until {format_time(reset)}")
+        # A spent budget leaves nothing for the current window
+        windows = [
+            window for window in plan_windows(needed, remaining, limit, reset, now)
+            if window[1]
+        ]
+        if len(windows) == 1 and windows[0][0] == now:
+            continue
+        for i, (window_start, window_count) in enumerate(windows, 1):
+            when = "now" if window_start == now else f"from {format_time(window_start)}"
+            print(f"  Window {i} ({when}): {window_count} requests")
+        window_start, window_count = windows[-1]
+        eta = max(eta, window_start + window_count * 60 / args.requests_per_minute)
+        if remaining <= 0:
+            limiter.pause_until(reset)
+    print(f"ETA: {format_time(eta)} (about {math.ceil((eta - now) / 60)} min)")
+
+
+def print_permission_error(out=print):
+    """Print helpful message for permission errors."""
+    out("  Make sure your GitHub token has 'repo' scope with write permissions")
+    out("  Generate a new token at: https://github.com/settings/tokens")
+
+
+def run_repo(g, limiter, repo_name, specs, args, manifest=None, out=print,
+             graph=None, journal=None, mirror=None, projects=None):
+    """Create labels and issues in one repository.
+
+    g and limiter may be shared between repositories processed at the same
+    time. Progress is reported through out(). With a DependencyGraph the
+    issues are created wave by wave and then linked to their dependencies.
+    Completed steps are written to the journal; with --resume the steps it
+    already holds are skipped without listing the repository. With an
+    IssueMirror only issues changed since its last sync are listed. New
+    and updated issues are then put on their milestones and projects,
+    whose IDs are cached in the shared projects dict. Returns a
+    dict of counts keyed by issue status, or None if the repository
+    couldn't be reached.
+    """
+    counts = dict.fromkeys(
+        ("created", "updated", "unchanged", "exists", "failed", "linked",
+         "placed"), 0
+    )
+    
+    def phase(name):
+        if limiter.metrics is None:
+            return contextlib.nullcontext()
+        return limiter.metrics.phase(repo_name, name)
 
-- `docker-compose.yml`
-- `.env.example`
+    with phase("connect"):
+        try:
+            # Get the repository (owner/repo format)
+            repo = limiter.call(g.get_repo, repo_name)
+            out(f"✓ Connected to repository: {repo.full_name}")
+        except GithubException as e:
+            out(f"Error connecting to GitHub: {e}")
+            return None
+    
+    backend = None
+    if args.backend == "graphql":
+        backend = GraphQLBackend(g, repo, limiter, args.batch_size)
+    
+    resumed = None
+    if journal is not None and args.resume:
+        resumed = journal.repository(repo.full_name)
+    
+    # Create labels
+    out("\n=== Creating labels ===")
+    with phase("labels"):
+        try:
+            if resumed is not None and resumed["labels"]:
+                out("- Labels were applied before the interruption")
+                label_results = []
+                if backend is not None:
+                    # Issue mutations still need the label node IDs
+                    backend.resolve()
+            elif backend is not None:
+                label_results = backend.apply_labels(
+                    LABELS_TO_CREATE, args.prune_labels
+                )
+            else:
+                label_results = apply_labels(
+                    repo, limiter, LABELS_TO_CREATE, args.concurrency,
+                    args.prune_labels,
+                )
+        except GithubException as e:
+            out(f"Error listing labels: {e}")
+            return None
+    
+    for label_name, action, e in label_results:
+        if action == "created" and e is None:
+            out(f"✓ Created label: {label_name}")
+        elif action == "updated" and e is None:
+            out(f"✓ Updated label: {label_name}")
+        elif action == "deleted" and e is None:
+            out(f"✓ Deleted label: {label_name}")
+        elif action == "unchanged":
+            out(f"- Unchanged label: {label_name}")
+        elif e.status == 403:
+            out(f"✗ Permission denied for label '{label_name}'")
+            print_permission_error(out)
+            if hasattr(e, 'data') and isinstance(getattr(e, 'data', None), dict):
+                out(f"  Error: {e.data.get('message', str(e))}")
+        else:
+            out(f"✗ Error with label '{label_name}': {e}")
+    if journal is not None and label_results and all(
+        e is None for _, _, e in label_results
+    ):
+        journal.record(repo.full_name, "labels")
+    
+    if manifest is not None:
+        manifest = manifest.repository(repo.full_name)
+    
+    # Index existing issues so re-runs don't create duplicates. A sync
+    # whose entries are all in the manifest doesn't need the listing, and
+    # a resumed run trusts its journal instead.
+    with phase("index"):
+        index = None
+        if resumed is not None and resumed["issues"]:
+            if manifest is not None:
+                for entry in resumed["issues"].values():
+                    manifest.restore(entry)
+            index = IssueIndex.from_journal(resumed["issues"].values())
+            journaled = len(index)
+            # Requests in flight when the run stopped may have created issues
+            # that never reached the journal; only those recent ones are listed.
+            since = datetime.fromtimestamp(
+                resumed["last"] - RESUME_OVERLAP, timezone.utc
+            )
+            try:
+                IssueIndex.from_repo(repo, limiter, since, index)
+            except GithubException as e:
+                out(f"Error listing recent issues: {e}")
+                return None
+            out(f"\n✓ Resuming after {journaled} journaled issues "
+                f"({len(index) - journaled} more found since the interruption)")
+        fully_synced = manifest is not None and all(
+            manifest.get(title) is not None for title, _, _ in specs
+        )
+        if index is None and not args.allow_duplicates and not fully_synced:
+            try:
+                if mirror is not None:
+                    changed = mirror.sync(repo, limiter)
+                    index = mirror.index(repo.full_name)
+                    out(f"\n✓ Indexed {len(index)} existing issues from the "
+                        f"mirror ({changed} new or changed)")
+                else:
+                    index = IssueIndex.from_repo(repo, limiter)
+                    out(f"\n✓ Indexed {len(index)} existing issues")
+            except GithubException as e:
+                out(f"Error listing existing issues: {e}")
+                return None
+    
+    # Create issues
+    out("\n=== Creating issues ===")
+    lazy_repo = None
+    if manifest is not None or (graph is not None and backend is None):
+        lazy_repo = g.withLazy(True).get_repo(repo.full_name)
+
+    def journaled(spec, result):
+        # Journal from the worker, so results that are done but not yet
+        # reported in spec order survive an interruption
+        status, number, _ = result
+        if journal is not None and status != "failed":
+            journal.record(repo.full_name, "issue", title=spec[0],
+                           number=number, sha256=spec_digest(spec))
+        return result
+
+    def create(wave):
+        if backend is not None:
+            return backend.create_issues(wave, index, args.concurrency, journaled)
+        if manifest is not None:
+            process = lambda spec: journaled(
+                spec, sync_issue(lazy_repo, spec, limiter, manifest, index)
+            )
+        else:
+            process = lambda spec: journaled(
+                spec, create_issue(repo, spec, limiter, index)
+            )
+        return run_ordered(process, wave, args.concurrency)
+
+    waves = graph.waves() if graph is not None else [specs]
+    numbers = {}
+    bodies = {}
+    placements = []
+    with phase("issues"):
+        for wave_number, wave in enumerate(waves, 1):
+            if graph is not None:
+                out(f"- Wave {wave_number} of {len(waves)}: {len(wave)} issues")
+            for spec, (status, number, e) in create(wave):
+                title = spec[0]
+                counts[status] += 1
+                if graph is not None:
+                    # Only linking needs every issue's number and body, so
+                    # streamed specs without it stay out of memory
+                    numbers[title] = number
+                    if status == "created":
+                        bodies[title] = with_fingerprint(title, spec[1])
+                    elif status == "exists":
+                        bodies[title] = index.find(title).body
+                placement = issue_placement(spec, args)
+                if status in ("created", "updated") and any(placement):
+                    placements.append((spec, number, placement))
+                if manifest is not None and status != "failed":
+                    manifest.record(spec, number)
+                if status == "created":
+                    out(f"✓ Created #{number}: {title}")
+                elif status == "updated":
+                    out(f"✓ Updated #{number}: {title}")
+                elif status == "unchanged":
+                    out(f"- Unchanged #{number}: {title}")
+                elif status == "exists":
+                    out(f"- Skipped #{number} (already exists): {title}")
+                elif e.status == 403:
+                    out(f"✗ Permission denied creating '{title}'")
+                    print_permission_error(out)
+                else:
+                    out(f"✗ Failed to create '{title}': {e}")
+
+    if graph is not None:
+        # Dependencies on other shards' entries link to their issues if
+        # those were created already
+        for title in graph.others:
+            entry = manifest.get(title) if manifest is not None else None
+            issue = index.find(title) if index is not None else None
+            if entry is not None:
+                numbers[title] = entry["number"]
+            elif issue is not None:
+                numbers[title] = issue.number
+        with phase("links"):
+            # Rewrite dependency sections once every number is known
+            edits = [
+                edit for edit in plan_links(graph, numbers, bodies, manifest)
+                if resumed is None or edit[0][0] not in resumed["linked"]
+            ]
+            if edits:
+                out("\n=== Linking dependencies ===")
+            if backend is not None:
+                results = backend.edit_bodies(edits, args.concurrency)
+            else:
+                results = edit_bodies(lazy_repo, limiter, edits, args.concurrency)
+            for (spec, number, body), e in results:
+                if e is None:
+                    counts["linked"] += 1
+                    if manifest is not None:
+                        manifest.record_links(spec[0], body)
+                    if journal is not None:
+                        journal.record(repo.full_name, "link", title=spec[0],
+                                       number=number)
+                    out(f"✓ Linked #{number}: {spec[0]}")
+                else:
+                    out(f"✗ Failed to link #{number} '{spec[0]}': {e}")
+
+    if placements:
+        with phase("placement"):
+            out("\n=== Adding to milestones and projects ===")
+            assigner = BoardAssigner(
+                backend or GraphQLBackend(g, repo, limiter, args.batch_size),
+                projects if projects is not None else {},
+            )
+            for (spec, number, _), e in assigner.assign(placements, args.concurrency):
+                if e is None:
+                    counts["placed"] += 1
+                    out(f"✓ Placed #{number}: {spec[0]}")
+                else:
+                    out(f"✗ Failed to place #{number} '{spec[0]}': {e}")
+
+    if manifest is not None:
+        manifest.save()
+    return counts
+
+
+def run_leased(g, limiter, repo_name, args, run, out=print):
+    """Call run() while holding the --shard lease of a repository.
+
+    Without --shard run() is simply called. Returns its result, or None
+    if another run holds the lease or it couldn't be taken.
+    """
+    if args.shard is None:
+        return run()
+    index, count = args.shard
+    lease = ShardLease(g.withLazy(True).get_repo(repo_name), limiter, args.shard)
+    try:
+        held = lease.acquire()
+    except GithubException as e:
+        out(f"Error taking the lease of shard {index}/{count}: {e}")
+        return None
+    if held is not None:
+        holder, expires = held
+        out(f"✗ Shard {index}/{count} is being worked on by {holder} "
+            f"(lease until {format_time(expires)}); delete the "
+            f"'{lease.name}' label to take it over")
+        return None
+    out(f"✓ Took the lease of shard {index}/{count}")
+    try:
+        return run()
+    finally:
+        try:
+            lease.release()
+        except GithubException as e:
+            out(f"✗ Failed to release the '{lease.name}' label: {e}")
 
-## Dependencies
 
-**Epic:** Backend Infrastructure Setup""",
-        ["backend", "database", "enhancement", "docs"]
-    ),
-]
+def run_cleanup(g, limiter, repo_name, specs, args, manifest=None, mirror=None,
+                out=print):
+    """Close or delete the duplicate issues of one repository.
 
+    Progress is reported through out(). Returns the number of duplicates
+    handled (or previewed with --dry-run), or None if the repository
+    couldn't be cleaned up.
+    """
+    try:
+        repo = limiter.call(g.get_repo, repo_name)
+        out(f"✓ Connected to repository: {repo.full_name}")
+        if mirror is not None:
+            mirror.sync(repo, limiter)
+            issues = mirror.issues(repo.full_name)
+        else:
+            issues = limiter.call(lambda: [
+                issue for issue in repo.get_issues(state="all", direction="asc")
+                if "/pull/" not in issue.html_url
+            ])
+    except GithubException as e:
+        out(f"Error listing issues: {e}")
+        return None
+    if manifest is not None:
+        manifest = manifest.repository(repo.full_name)
+
+    verb = "delete" if args.delete else "close"
+    targets = []
+    out("\n=== Duplicates ===")
+    for title, keep, duplicates in find_duplicates(issues, specs, manifest):
+        # Closed duplicates only matter when deleting
+        numbers = [issue.number for issue in duplicates
+                   if args.delete or issue.state == "open"]
+        if not numbers:
+            continue
+        targets.extend((number, keep.number) for number in numbers)
+        out(f"- {title}: keeping #{keep.number}, "
+            f"{verb} {', '.join(f'#{number}' for number in numbers)}")
+    if not targets:
+        out("- No duplicates to clean up")
+        return 0
+    if args.dry_run:
+        out(f"\nDry run: {len(targets)} duplicates would be {verb}d; "
+            "nothing was written.")
+        return len(targets)
+
+    numbers = [number for number, _ in targets]
+    keepers = dict(targets)
+    if args.delete or args.backend == "graphql":
+        results = GraphQLBackend(g, repo, limiter, args.batch_size).close_issues(
+            numbers, args.delete, args.concurrency
+        )
+    else:
+        lazy_repo = g.withLazy(True).get_repo(repo.full_name)
+        results = close_issues(lazy_repo, limiter, numbers, args.concurrency)
+    out(f"\n=== Cleaning up ({verb}) ===")
+    done = []
+    for number, e in results:
+        if e is None:
+            done.append(number)
+            out(f"✓ {verb.capitalize()}d #{number} (duplicate of #{keepers[number]})")
+        elif e.status == 403:
+            out(f"✗ Permission denied for #{number}"
+                + (" (deleting issues needs admin access)" if args.delete else ""))
+        else:
+            out(f"✗ Failed to {verb} #{number}: {e}")
+    if mirror is not None and args.delete:
+        mirror.forget(repo.full_name, done)
+    out(f"\n{verb.capitalize()}d {len(done)} of {len(targets)} duplicates")
+    return len(done)
+
+
+class PathIndex:
+    """Files and directories under a root, found with or without extension.
+
+    scan() walks the tree once with os.scandir. The entries of every
+    directory are cached with its mtime, so a re-scan only lists the
+    directories that changed and merely stats the others.
+    """
+
+    def __init__(self, root, cache_path=None):
+        self.root = root
+        self.cache_path = cache_path
+        self.cache = {}
+        if cache_path and os.path.exists(cache_path):
+            with open(cache_path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("root") == os.path.abspath(root):
+                self.cache = data["directories"]
+        self.files = set()
+        self.directories = set()
+        self.stems = {}
+        self.listed = 0
+
+    def scan(self):
+        """Index the tree; returns self."""
+        directories = {}
+        pending = [("", os.stat(self.root).st_mtime_ns)]
+        while pending:
+            path, mtime = pending.pop()
+            cached = self.cache.get(path)
+            if cached is not None and cached[0] == mtime:
+                _, files, subdirectories = cached
+                children = [
+                    (name, os.stat(os.path.join(self.root, path, name)).st_mtime_ns)
+                    for name in subdirectories
+                ]
+            else:
+                self.listed += 1
+                files, children = [], []
+                with os.scandir(os.path.join(self.root, path)) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in SCAN_SKIP_DIRS:
+                                children.append((entry.name, entry.stat().st_mtime_ns))
+                        else:
+                            files.append(entry.name)
+            directories[path] = [mtime, files, [name for name, _ in children]]
+            self.directories.add(path)
+            for name in files:
+                file_path = path + name
+                self.files.add(file_path)
+                self.stems.setdefault(os.path.splitext(file_path)[0], []).append(file_path)
+            pending.extend((f"{path}{name}/", child_mtime) for name, child_mtime in children)
+        self.cache = directories
+        return self
+
+    def save(self):
+        """Write the directory cache back to disk."""
+        if not self.cache_path:
+            return
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"root": os.path.abspath(self.root), "directories": self.cache}, f)
+        os.replace(tmp_path, self.cache_path)
+
+    def find(self, path):
+        """Return the indexed path matching path, or None.
+
+        A directory ends with "/". A file whose name only differs in its
+        extension, e.g. app.js for app.ts, matches too.
+        """
+        if path.startswith("./"):
+            path = path[2:]
+        if path.endswith("/"):
+            return path if path in self.directories else None
+        if path in self.files:
+            return path
+        if path + "/" in self.directories:
+            return path + "/"
+        matches = self.stems.get(os.path.splitext(path)[0])
+        return sorted(matches)[0] if matches else None
+
+
+def required_paths(text):
+    """Return the paths a Required Files section lists.
+
+    Reads directory trees in code fences (blank lines start a new tree)
+    and "- `path`" items, checked or not. Each path is a list of
+    alternatives, e.g. "prisma/ or migrations/".
+    """
+    paths = []
+    stack = []
+    in_fence = False
+    for line in text.splitlines():
+        if line.startswith("```"):
+            in_fence = not in_fence
+            stack = []
+            continue
+        if not in_fence:
+            if re.match(r"^\s*[-*] ", line):
+                alternatives = re.findall(r"`([^`]+)`", line)
+                if alternatives:
+                    paths.append(alternatives)
+            continue
+        if not line.strip():
+            stack = []
+            continue
+        match = TREE_LINE_RE.match(line)
+        if match:
+            depth = len(match.group(1)) // 3 + 1
+            if not stack:
+                stack = [""]
+            parent = stack[min(depth, len(stack)) - 1]
+            names = match.group(2)
+        else:
+            depth, parent, names = 0, "", line.strip()
+        alternatives = [parent + name.strip() for name in names.split(" or ")]
+        paths.append(alternatives)
+        if alternatives[0].endswith("/"):
+            stack[depth:] = [alternatives[0]]
+    return paths
+
+
+def required_files_checklist(paths, index):
+    """Render required paths as a checklist, checking those in the index.
+
+    Returns (checklist, found, missing) with the found and missing paths.
+    """
+    lines = []
+    found = []
+    missing = []
+    for alternatives in paths:
+        match = next(filter(None, map(index.find, alternatives)), None)
+        line = " or ".join(f"`{path}`" for path in alternatives)
+        if match is None:
+            missing.append(alternatives[0])
+            lines.append(f"- [ ] {line}")
+            continue
+        found.append(match)
+        if match not in alternatives:
+            line += f" (found {os.path.basename(match.rstrip('/'))})"
+        lines.append(f"- [x] {line}")
+    return "\n".join(lines), found, missing
+
+
+def run_pull(g, limiter, repo_name, specs, args, manifest, out=print):
+    """Merge issue edits made on GitHub back into the --spec file.
+
+    Only issues updated since the last pull are listed. Each is matched to
+    its spec entry through the manifest, its fingerprint or its title and
+    merged three-way against the version last in sync (see merge_specs).
+    Without that version, GitHub's wins unless the spec also changed since
+    the last sync. Conflicts keep the spec's version and stop the
+    watermark, so they are listed again by the next pull. Progress is
+    reported through out(). Returns the number of conflicts, or None if
+    the repository couldn't be listed.
+    """
+    try:
+        repo = limiter.call(g.get_repo, repo_name)
+        out(f"✓ Connected to repository: {repo.full_name}")
+    except GithubException as e:
+        out(f"Error connecting to GitHub: {e}")
+        return None
+    manifest = manifest.repository(repo.full_name)
+    filters = {}
+    if manifest.pulled is not None:
+        filters["since"] = datetime.strptime(
+            manifest.pulled, GITHUB_TIME_FORMAT
+        ).replace(tzinfo=timezone.utc)
+    try:
+        issues = limiter.call(lambda: [
+            issue for issue in repo.get_issues(state="all", sort="updated",
+                                               direction="asc", **filters)
+            if "/pull/" not in issue.html_url
+        ])
+    except GithubException as e:
+        out(f"Error listing issues: {e}")
+        return None
+    since = f" since {manifest.pulled}" if manifest.pulled else ""
+    out(f"✓ Listed {len(issues)} issues updated{since}")
+
+    by_fingerprint = {spec_fingerprint(spec.title): spec for spec in specs}
+    by_title = {normalize_title(spec.title): spec for spec in specs}
+    by_number = {
+        entry["number"]: spec_fingerprint(entry["title"])
+        for entry in manifest.entries.values()
+    }
+    updates = {}
+    conflicted = []
+    unknown = 0
+    out("\n=== Pulling issues ===")
+    for issue in issues:
+        match = FINGERPRINT_RE.search(issue.body or "")
+        ours = (
+            by_fingerprint.get(by_number.get(issue.number))
+            or (by_fingerprint.get(match.group(1)) if match else None)
+            or by_title.get(normalize_title(issue.title))
+        )
+        if ours is None:
+            unknown += 1
+            continue
+        ours = updates.get(ours.title, ours)
+        entry = manifest.get(ours.title)
+        if entry is not None and entry["number"] != issue.number:
+            out(f"- Skipped #{issue.number}: duplicate of #{entry['number']}")
+            continue
+        theirs = issue_spec(issue, ours, entry)
+        if entry is not None and "body" in entry:
+            base = IssueSpec.from_markdown(entry["title"], entry["body"],
+                                           entry["labels"])
+        elif entry is None or entry["sha256"] == ours.digest:
+            # No version to merge against; the spec is taken as the base
+            base = ours
+        elif entry["sha256"] == theirs.digest:
+            base = theirs
+        else:
+            base = None
+        if base is None and ours.digest != theirs.digest:
+            merged, conflicts = ours, ["the whole entry"]
+        else:
+            merged, conflicts = merge_specs(base or ours, ours, theirs)
+        if conflicts:
+            conflicted.append(issue)
+            out(f"✗ Conflict in #{issue.number} '{ours.title}': "
+                f"{', '.join(conflicts)} changed in the spec and on GitHub; "
+                "kept the spec's version")
+            continue
+        parts = changed_parts(ours, merged)
+        if parts:
+            updates[ours.title] = merged
+            out(f"✓ Pulled #{issue.number}: {merged.title} ({', '.join(parts)})")
+        else:
+            out(f"- Unchanged #{issue.number}: {ours.title}")
+        if not args.dry_run:
+            # The issue is now the version both sides were last in sync with
+            if theirs.title != ours.title:
+                manifest.forget(ours.title)
+            manifest.record(theirs, issue.number)
+    if unknown:
+        out(f"- {unknown} updated issues aren't in the spec")
+
+    if args.dry_run:
+        out(f"\nDry run: {len(updates)} entries would be updated in "
+            f"{args.spec}; nothing was written.")
+        return len(conflicted)
+    # Resume from the oldest conflict, so it's listed again next time
+    if conflicted:
+        manifest.pulled = min(github_time(issue.updated_at) for issue in conflicted)
+    elif issues:
+        manifest.pulled = max(github_time(issue.updated_at) for issue in issues)
+    if updates:
+        update_spec(args.spec, updates)
+    manifest.save()
+    out(f"\nUpdated {len(updates)} entries in {args.spec}"
+        + (f"; {len(conflicted)} conflicts" if conflicted else ""))
+    return len(conflicted)
+
+
+def run_scan(g, limiter, repo_name, specs, args, paths, mirror=None,
+             out=print):
+    """Check the Required Files boxes of each issue against a PathIndex.
+
+    Reports the progress of every entry that lists required files
+    through out(). With a client (g), the issues are listed once and
+    those whose checklist changed are rewritten in batched GraphQL
+    mutations; the rest of each body is kept as it is on GitHub. Returns
+    the number of failed edits, or None if the repository couldn't be
+    listed.
+    """
+    progress = []
+    out("=== Required files ===")
+    for spec in specs:
+        expected = required_paths(spec.required_files)
+        if not expected:
+            continue
+        checklist, found, missing = required_files_checklist(expected, paths)
+        progress.append((spec, checklist))
+        if missing:
+            shown = ", ".join(missing[:3])
+            if len(missing) > 3:
+                shown += f" and {len(missing) - 3} more"
+            out(f"- {spec.title}: {len(found)} of {len(expected)} (missing {shown})")
+        else:
+            out(f"✓ {spec.title}: {len(found)} of {len(expected)}")
+    if g is None:
+        return 0
 
-def main():
+    try:
+        repo = limiter.call(g.get_repo, repo_name)
+        if mirror is not None:
+            mirror.sync(repo, limiter)
+            index = mirror.index(repo.full_name)
+        else:
+            index = IssueIndex.from_repo(repo, limiter)
+    except GithubException as e:
+        out(f"Error listing issues: {e}")
+        return None
+    edits = []
+    for spec, checklist in progress:
+        issue = index.find(spec.title)
+        body = (issue.body or "").replace("\r\n", "\n") if issue is not None else ""
+        match = REQUIRED_FILES_RE.search(body)
+        if match is None:
+            continue
+        section = match.group(1)
+        # Keep the blank lines before the next heading
+        tail = section[len(section.rstrip("\n")):]
+        updated = body[:match.start(1)] + "\n" + checklist + tail + body[match.end(1):]
+        if updated != body:
+            edits.append((spec, issue.number, updated))
+    if not edits:
+        out(f"\n- Every checklist in {repo.full_name} is up to date")
+        return 0
+    if args.dry_run:
+        out(f"\nDry run: {len(edits)} checklists in {repo.full_name} would be "
+            "updated; nothing was written.")
+        return 0
+    out("\n=== Updating checklists ===")
+    failed = 0
+    backend = GraphQLBackend(g, repo, limiter, args.batch_size)
+    for (spec, number, _), e in backend.edit_bodies(edits, args.concurrency):
+        if e is None:
+            out(f"✓ Updated #{number}: {spec.title}")
+        else:
+            failed += 1
+            out(f"✗ Failed to update #{number} '{spec.title}': {e}")
+    return failed
+
+
+def print_summary(counts, sync=False, out=print):
+    """Print the issue counts of one repository or of a whole run."""
+    out(f"Successfully created: {counts['created']} issues")
+    if sync:
+        out(f"Updated: {counts['updated']} issues")
+        out(f"Unchanged: {counts['unchanged']} issues")
+    if counts["exists"] > 0:
+        out(f"Already existed: {counts['exists']} issues")
+    if counts["failed"] > 0:
+        out(f"Failed to create: {counts['failed']} issues")
+    if counts["linked"] > 0:
+        out(f"Linked to dependencies: {counts['linked']} issues")
+    if counts["placed"] > 0:
+        out(f"Added to milestones and projects: {counts['placed']} issues")
+
+
+def report_metrics(metrics, counts, args):
+    """Print request latencies and phase times, then export the metrics."""
+    if metrics is None:
+        return
+    summary = metrics.finish(counts, args.metrics_textfile)
+    latency = summary["latency"]
+    print(f"API requests: {summary['requests']} "
+          f"(p50 {latency['p50'] * 1000:.0f}ms, "
+          f"p95 {latency['p95'] * 1000:.0f}ms, "
+          f"p99 {latency['p99'] * 1000:.0f}ms)")
+    if summary["phases"]:
+        print("Phases: " + ", ".join(
+            f"{name} {seconds:.1f}s" for name, seconds in summary["phases"].items()
+        ) + f" (waiting on rate limits: {summary['rate_limit_wait_seconds']:.1f}s)")
+
+
+def read_repositories(args):
+    """Return the target repositories from --repo, --repos-file or the env."""
+    repos = list(args.repo or [])
+    if args.repos_file:
+        with open(args.repos_file, encoding="utf-8") as f:
+            for line in f:
+                line = line.split("#", 1)[0].strip()
+                if line:
+                    repos.append(line)
+    if not repos:
+        # Get repository name (configurable via environment variable)
+        repos.append(os.getenv("GITHUB_REPOSITORY", DEFAULT_REPOSITORY))
+    # Drop duplicates but keep the given order
+    return list(dict.fromkeys(repos))
+
+
+def update_mirror(g, limiter, mirror, repo_names, concurrency=1):
+    """Sync every repository into the mirror; return False if any failed."""
+    def sync(repo_name):
+        try:
+            repo = limiter.call(g.get_repo, repo_name)
+            return repo.full_name, mirror.sync(repo, limiter), None
+        except GithubException as e:
+            return repo_name, None, e
+
+    ok = True
+    for _, (repo_name, changed, e) in run_ordered(sync, repo_names, concurrency):
+        if e is None:
+            print(f"✓ Mirrored {repo_name}: {changed} new or changed issues, "
+                  f"{mirror.count(repo_name)} in total")
+        else:
+            ok = False
+            print(f"✗ Could not mirror {repo_name}: {e}")
+    return ok
+
+
+def run_query(mirror, terms, repo_names=None, limit=20):
+    """Print the mirrored issues matching terms."""
+    query = " ".join(terms)
+    start = time.perf_counter()
+    rows = mirror.search(query, repo_names, limit)
+    elapsed = (time.perf_counter() - start) * 1000
+    for repo_name, number, state, title, snippet in rows:
+        print(f"{repo_name}#{number} [{state}] {title}")
+        if snippet:
+            print(f"    {' '.join(snippet.split())}")
+    print(f"\n{len(rows)} matches in {elapsed:.1f}ms")
+
+
+def main(argv=None):
     """Main function to create GitHub issues."""
-    
-    def print_permission_error():
-        """Print helpful message for permission errors."""
-        print("  Make sure your GitHub token has 'repo' scope with write permissions")
-        print("  Generate a new token at: https://github.com/settings/tokens")
+    args = parse_args(argv)
     
     # Get GitHub token
     token = os.getenv("GH_TOKEN") or os.getenv("GITHUB_TOKEN")
+    
+    try:
+        repo_names = read_repositories(args)
+    except OSError as e:
+        print(f"Error reading repository list: {e}")
+        sys.exit(1)
+    
+    if args.command == "query" and not os.path.exists(args.mirror):
+        print(f"Error: no issue mirror at {args.mirror}; "
+              "run the mirror command first")
+        sys.exit(1)
+    mirror = IssueMirror(args.mirror) if args.mirror else None
+    if args.command == "query":
+        # Without --repo or --repos-file every mirrored repository is searched
+        explicit = args.repo or args.repos_file
+        run_query(mirror, args.terms, repo_names if explicit else None, args.limit)
+        return
+    
+    # Issue specs are streamed from disk when --spec is given
+    specs = SpecSource(args.spec) if args.spec else ISSUES
+    if args.subtasks:
+        specs = SubtaskSpecs(specs)
+    
+    if args.export_spec:
+        export_spec(specs, args.export_spec)
+        print(f"✓ Wrote issue spec to {args.export_spec}")
+        return
+    
+    # Check the whole spec before anything is sent
+    problems = validate_spec(specs)
+    if problems:
+        print(f"Error: the issue spec has {len(problems)} problem(s):")
+        for problem in problems:
+            print(f"✗ {problem}")
+        sys.exit(1)
+    if args.validate:
+        print("✓ Issue spec is valid")
+        return
+    
+    manifest = Manifest(args.manifest) if args.sync else None
+    if args.command == "cleanup" and os.path.exists(args.manifest):
+        # The manifest says which of several duplicates to keep
+        manifest = Manifest(args.manifest)
+
+    graph = None
+    if args.link_dependencies:
+        # Ordering needs the whole spec, so it can't be streamed
+        graph = DependencyGraph(specs)
+        specs = graph.specs
+        # Fail on cycles before anything is written
+        graph.waves()
+        for title, name in graph.unresolved:
+            print(f"- Unresolved dependency of '{title}': {name}")
+    if args.shard:
+        # Validation and dependency names above saw the whole spec
+        if graph is not None:
+            graph.select(args.shard)
+            specs = graph.specs
+        else:
+            specs = ShardSpecs(specs, args.shard)
+    
+    cache = None if args.no_cache else ResponseCache(args.cache_dir)
+    metrics = None
+    if (args.metrics or args.metrics_textfile) and not args.dry_run:
+        metrics = Metrics(args.metrics)
+
+    def connect():
+        if args.transport == "asyncio":
+            return AsyncGithub(token, args.concurrency, cache, metrics)
+        return make_client(token, args.concurrency, cache, metrics)
+    
+    if args.command == "scan":
+        # One pass over the tree serves every entry and repository
+        paths = PathIndex(args.root, args.scan_cache).scan()
+        paths.save()
+        print(f"✓ Indexed {len(paths.files)} files under {args.root} "
+              f"({paths.listed} of {len(paths.directories)} directories listed)\n")
+        g = limiter = None
+        if token:
+            g = connect()
+            limiter = RateLimiter(args.requests_per_minute, args.concurrency)
+        else:
+            print("No GitHub token set; only reporting progress\n")
+            repo_names = repo_names[:1]
+        failed = False
+        for i, repo_name in enumerate(repo_names):
+            if i:
+                print()
+            result = run_scan(g, limiter, repo_name, specs, args, paths, mirror)
+            failed |= result != 0
+        sys.exit(1 if failed else 0)
+    
+    if args.dry_run and args.command == "create":
+        g = limiter = None
+        if token:
+            g = connect()
+            limiter = RateLimiter(args.requests_per_minute, args.concurrency)
+        # The budget covers exactly the calls the plans printed
+        planned = CallCount()
+        for i, repo_name in enumerate(repo_names):
+            if i:
+                print()
+            count = print_plan(args, g, limiter, repo_name, specs, manifest,
+                               graph, mirror)
+            if count is not None:
+                planned.update(count)
+        if g is not None:
+            print_budget(g, limiter, planned, args)
+        return
+    
     if not token:
         print("Error: GitHub token not found!")
         print("Please set GH_TOKEN or GITHUB_TOKEN environment variable")
         print("Example: export GH_TOKEN=your_token_here")
         sys.exit(1)
     
-    # Get repository name (configurable via environment variable)
-    repo_name = os.getenv("GITHUB_REPOSITORY", DEFAULT_REPOSITORY)
+    if args.command == "mirror":
+        g = connect()
+        limiter = RateLimiter(args.requests_per_minute, args.concurrency)
+        sys.exit(0 if update_mirror(g, limiter, mirror, repo_names,
+                                    args.concurrency) else 1)
+    
+    if args.command == "pull":
+        if len(repo_names) != 1:
+            print("Error: pull works on one repository at a time")
+            sys.exit(1)
+        g = connect()
+        limiter = RateLimiter(args.requests_per_minute, args.concurrency)
+        conflicts = run_pull(g, limiter, repo_names[0], list(SpecSource(args.spec)),
+                             args, Manifest(args.manifest))
+        sys.exit(0 if conflicts == 0 else 1)
     
-    # Initialize GitHub client
+    if args.command == "cleanup":
+        g = connect()
+        limiter = RateLimiter(args.requests_per_minute, args.concurrency)
+        failed = False
+        for i, repo_name in enumerate(repo_names):
+            if i:
+                print()
+            failed |= run_cleanup(g, limiter, repo_name, specs, args, manifest,
+                                  mirror) is None
+        if limiter.retries:
+            print(f"Rate limited: {limiter.retries} requests retried")
+        sys.exit(1 if failed else 0)
+    
+    if args.resume and not os.path.exists(args.journal):
+        print(f"- No journal at {args.journal}; starting from the beginning")
     try:
-        auth = Auth.Token(token)
-        g = Github(auth=auth)
-        # Get the repository (owner/repo format)
-        repo = g.get_repo(repo_name)
-        print(f"✓ Connected to repository: {repo.full_name}")
-    except GithubException as e:
-        print(f"Error connecting to GitHub: {e}")
+        journal = Journal(args.journal, args.resume)
+    except OSError as e:
+        print(f"Error opening journal: {e}")
         sys.exit(1)
+
+    # Initialize GitHub client. Every repository shares its connection
+    # pool and the rate limiter, i.e. one request budget for the run.
+    g = connect()
+    limiter = RateLimiter(args.requests_per_minute, args.concurrency, metrics)
+    # Runs that outgrow the rate limit wait for the next window
+    print_budget(g, limiter, planned_calls(repo_names, specs, args, manifest,
+                                           graph), args)
     
-    # Create labels
-    print("\n=== Creating labels ===")
-    existing_labels = {label.name: label for label in repo.get_labels()}
+    if len(repo_names) == 1:
+        repo_name = repo_names[0]
+        counts = run_leased(g, limiter, repo_name, args, lambda: run_repo(
+            g, limiter, repo_name, specs, args, manifest,
+            graph=graph, journal=journal, mirror=mirror,
+        ))
+        if counts is None:
+            report_metrics(metrics, None, args)
+            sys.exit(1)
+        
+        # Summary
+        print("\n=== Summary ===")
+        print_summary(counts, args.sync)
+        if limiter.retries:
+            print(f"Rate limited: {limiter.retries} requests retried")
+        if cache is not None and cache.hits:
+            print(f"Cached: {cache.hits} of {cache.hits + cache.misses} reads not modified")
+        report_metrics(metrics, counts, args)
+        print("\nAll issues have been created in the repository!")
+        print(f"View them at: https://github.com/{repo_name}/issues")
+        return
     
-    for label_name, color, description in LABELS_TO_CREATE:
-        try:
-            if label_name in existing_labels:
-                # Update existing label
-                label = existing_labels[label_name]
-                label.edit(label_name, color, description)
-                print(f"✓ Updated label: {label_name}")
-            else:
-                # Create new label
-                repo.create_label(label_name, color, description)
-                print(f"✓ Created label: {label_name}")
-        except GithubException as e:
-            if e.status == 403:
-                print(f"✗ Permission denied for label '{label_name}'")
-                print_permission_error()
-                if hasattr(e, 'data') and isinstance(getattr(e, 'data', None), dict):
-                    print(f"  Error: {e.data.get('message', str(e))}")
-            else:
-                print(f"✗ Error with label '{label_name}': {e}")
+    print(f"Processing {len(repo_names)} repositories")
+    # Project IDs are looked up once for all repositories
+    projects = {}
     
-    # Create issues
-    print("\n=== Creating issues ===")
-    created_count = 0
-    failed_count = 0
+    def process(repo_name):
+        def out(message):
+            # A single write keeps lines from concurrent repos intact
+            sys.stdout.write(f"[{repo_name}] {message.strip()}\n")
+        return run_leased(g, limiter, repo_name, args, lambda: run_repo(
+            g, limiter, repo_name, specs, args, manifest, out,
+            graph, journal, mirror, projects,
+        ), out)
     
-    for title, body, labels in ISSUES:
-        try:
-            issue = repo.create_issue(
-                title=title,
-                body=body,
-                labels=labels
-            )
-            created_count += 1
-            print(f"✓ Created #{issue.number}: {title}")
-        except GithubException as e:
-            failed_count += 1
-            if e.status == 403:
-                print(f"✗ Permission denied creating '{title}'")
-                print_permission_error()
-            else:
-                print(f"✗ Failed to create '{title}': {e}")
+    totals = dict.fromkeys(
+        ("created", "updated", "unchanged", "exists", "failed", "linked",
+         "placed"), 0
+    )
+    unreachable = []
+    results = list(run_ordered(process, repo_names, args.concurrency))
     
     # Summary
     print("\n=== Summary ===")
-    print(f"Successfully created: {created_count} issues")
-    if failed_count > 0:
-        print(f"Failed to create: {failed_count} issues")
-    print("\nAll issues have been created in the repository!")
-    print(f"View them at: https://github.com/{repo.full_name}/issues")
+    for repo_name, counts in results:
+        print(f"\n{repo_name}:")
+        if counts is None:
+            unreachable.append(repo_name)
+            print("  ✗ Could not be processed")
+            continue
+        print_summary(counts, args.sync, lambda message: print(f"  {message}"))
+        for status, count in counts.items():
+            totals[status] += count
+    print(f"\nAll {len(repo_names)} repositories:")
+    print_summary(totals, args.sync, lambda message: print(f"  {message}"))
+    if unreachable:
+        print(f"  Repositories that failed: {', '.join(unreachable)}")
+    if limiter.retries:
+        print(f"Rate limited: {limiter.retries} requests retried")
+    if cache is not None and cache.hits:
+        print(f"Cached: {cache.hits} of {cache.hits + cache.misses} reads not modified")
+    report_metrics(metrics, totals, args)
+    if unreachable:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    except (SpecError, MirrorError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
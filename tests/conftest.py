@@ -0,0 +1,63 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fakegithub import FakeGitHub  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def github_loaded():
+    """Load PyGithub, so GithubException is the real class in every test.
+
+    The script imports it lazily; until then GithubException is a
+    placeholder that catches nothing PyGithub raises.
+    """
+    import create_github_issues
+
+    create_github_issues.load_github()
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    """A running FakeGitHub that the script is pointed at."""
+    server = FakeGitHub().start()
+    monkeypatch.setenv("GITHUB_API_URL", server.url)
+    monkeypatch.setenv("GH_TOKEN", "test-token")
+    monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+    monkeypatch.delenv("GITHUB_RUN_ID", raising=False)
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def spec(tmp_path):
+    """Write (title, body, labels) entries as a JSON Lines spec; return its path."""
+    def write(entries, name="spec.jsonl"):
+        path = tmp_path / name
+        with open(path, "w", encoding="utf-8") as f:
+            for title, body, labels in entries:
+                f.write(json.dumps({"title": title, "body": body, "labels": labels}))
+                f.write("\n")
+        return str(path)
+    return write
+
+
+@pytest.fixture
+def run(fake, tmp_path, monkeypatch):
+    """Run the script's main() in tmp_path against the fake; return the exit code."""
+    import create_github_issues
+
+    monkeypatch.chdir(tmp_path)
+
+    def main(*argv):
+        try:
+            create_github_issues.main(["--repo", "o/r", "--no-cache",
+                                       "--requests-per-minute", "6000", *argv])
+        except SystemExit as e:
+            return e.code or 0
+        return 0
+    return main
@@ -0,0 +1,301 @@
+"""In-process fake of the parts of the GitHub API the script uses.
+
+FakeGitHub serves the REST routes for repositories, labels and issues and
+the GraphQL queries and mutations of GraphQLBackend from a local HTTP/1.1
+server. It records every request and counts accepted connections, so tests
+can check both what was sent and how.
+"""
+
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+
+def now_iso():
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
+class FakeGitHub:
+    """A fake GitHub API for one or more repositories."""
+
+    def __init__(self):
+        self.repos = {}
+        self.calls = []
+        self.connections = 0
+        # (status, content type, body) of the next responses, in order
+        self.failures = []
+        # (remaining, limit) reported by /rate_limit for each resource
+        self.rate_limits = {"core": (4999, 5000), "graphql": (4999, 5000)}
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.server.fake = self
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        self.thread = threading.Thread(target=self.server.serve_forever,
+                                       kwargs={"poll_interval": 0.05}, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def repo(self, full_name):
+        """Return the labels and issues of a repository, creating it if needed."""
+        with self.lock:
+            return self.repos.setdefault(full_name, {"labels": {}, "issues": []})
+
+    def add_label(self, full_name, name, color="ededed", description=""):
+        labels = self.repo(full_name)["labels"]
+        label = {"id": next_id(labels), "name": name, "color": color,
+                 "description": description}
+        labels[name] = label
+        return label
+
+    def add_issue(self, full_name, title, body="", labels=(), state="open"):
+        issues = self.repo(full_name)["issues"]
+        issue = {"number": len(issues) + 1, "title": title, "body": body,
+                 "labels": list(labels), "state": state,
+                 "created_at": now_iso(), "updated_at": now_iso()}
+        issues.append(issue)
+        return issue
+
+    def issues(self, full_name):
+        """Return the issues of a repository that were not deleted."""
+        return [i for i in self.repo(full_name)["issues"] if i["state"] != "deleted"]
+
+    def count(self, method, pattern=""):
+        """Count the recorded requests of a method whose path contains pattern."""
+        return sum(1 for m, path in self.calls if m == method and pattern in path)
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.fake.lock:
+            self.server.fake.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    @property
+    def fake(self):
+        return self.server.fake
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def do_PATCH(self):
+        self.dispatch("PATCH")
+
+    def do_DELETE(self):
+        self.dispatch("DELETE")
+
+    def send(self, status, payload, headers=None, content_type="application/json"):
+        data = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("X-RateLimit-Limit", "5000")
+        self.send_header("X-RateLimit-Remaining", "4999")
+        self.send_header("X-RateLimit-Reset", str(int(time.time()) + 3600))
+        self.send_header("X-RateLimit-Resource", "core")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def dispatch(self, method):
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = json.loads(self.rfile.read(length)) if length else {}
+        with self.fake.lock:
+            self.fake.calls.append((method, url.path))
+            failure = self.fake.failures.pop(0) if self.fake.failures else None
+        if failure is not None:
+            status, content_type, body = failure
+            return self.send(status, body.encode(), content_type=content_type)
+        if url.path == "/rate_limit":
+            reset = int(time.time()) + 3600
+            resources = {
+                name: {"limit": limit, "remaining": remaining,
+                       "used": limit - remaining, "reset": reset}
+                for name, (remaining, limit) in self.fake.rate_limits.items()
+            }
+            return self.send(200, {"resources": resources, "rate": resources["core"]})
+        if url.path == "/graphql":
+            return self.send(200, self.graphql(payload))
+        match = re.match(r"^/repos/([^/]+)/([^/]+)(/.*)?$", url.path)
+        if not match:
+            return self.send(404, {"message": "Not Found"})
+        owner, name, rest = match.group(1), match.group(2), match.group(3) or ""
+        repo = self.fake.repo(f"{owner}/{name}")
+        base = f"{self.fake.url}/repos/{owner}/{name}"
+        with self.fake.lock:
+            status, body, headers = self.route(method, repo, base, owner, name,
+                                               rest, query, payload)
+        return self.send(status, body, headers)
+
+    def paginate(self, items, query, url):
+        per_page = int(query.get("per_page", 30))
+        page = int(query.get("page", 1))
+        headers = {}
+        if page * per_page < len(items):
+            rest = {k: v for k, v in query.items() if k not in ("page", "per_page")}
+            extra = "".join(f"&{k}={v}" for k, v in rest.items())
+            headers["Link"] = (f'<{url}?per_page={per_page}&page={page + 1}{extra}>; '
+                               'rel="next"')
+        return items[(page - 1) * per_page:page * per_page], headers
+
+    def route(self, method, repo, base, owner, name, rest, query, payload):
+        labels, issues = repo["labels"], repo["issues"]
+        if rest == "" and method == "GET":
+            return 200, {"id": 1, "node_id": "R_1", "name": name,
+                         "full_name": f"{owner}/{name}", "owner": {"login": owner},
+                         "url": base, "html_url": f"https://github.com/{owner}/{name}"}, None
+        if rest == "/labels":
+            if method == "POST":
+                if payload["name"] in labels:
+                    return 422, {"message": "Validation Failed",
+                                 "errors": [{"code": "already_exists"}]}, None
+                label = {"id": next_id(labels), "name": payload["name"],
+                         "color": payload["color"],
+                         "description": payload.get("description", "")}
+                labels[label["name"]] = label
+                return 201, label_json(base, label), None
+            items = [label_json(base, label) for label in labels.values()]
+            chunk, headers = self.paginate(items, query, base + "/labels")
+            return 200, chunk, headers
+        match = re.match(r"^/labels/(.+)$", rest)
+        if match:
+            label = labels.get(unquote(match.group(1)))
+            if label is None:
+                return 404, {"message": "Not Found"}, None
+            if method == "PATCH":
+                del labels[label["name"]]
+                label["name"] = payload.get("new_name", label["name"])
+                label["color"] = payload.get("color", label["color"])
+                label["description"] = payload.get("description", label["description"])
+                labels[label["name"]] = label
+            elif method == "DELETE":
+                del labels[label["name"]]
+                return 204, b"", None
+            return 200, label_json(base, label), None
+        if rest == "/issues":
+            if method == "POST":
+                issue = {"number": len(issues) + 1, "title": payload["title"],
+                         "body": payload.get("body", ""),
+                         "labels": payload.get("labels", []), "state": "open",
+                         "created_at": now_iso(), "updated_at": now_iso()}
+                issues.append(issue)
+                return 201, issue_json(base, labels, issue), None
+            state = query.get("state", "open")
+            items = [issue_json(base, labels, i) for i in issues
+                     if i["state"] != "deleted"
+                     and state in ("all", i["state"])
+                     and i["updated_at"] >= query.get("since", "")]
+            chunk, headers = self.paginate(items, query, base + "/issues")
+            return 200, chunk, headers
+        match = re.match(r"^/issues/(\d+)$", rest)
+        if match:
+            number = int(match.group(1))
+            if number > len(issues) or issues[number - 1]["state"] == "deleted":
+                return 404, {"message": "Not Found"}, None
+            issue = issues[number - 1]
+            if method == "PATCH":
+                for field in ("title", "body", "state", "labels"):
+                    if field in payload:
+                        issue[field] = payload[field]
+                issue["updated_at"] = now_iso()
+            return 200, issue_json(base, labels, issue), None
+        return 404, {"message": "Not Found"}, None
+
+    def graphql(self, payload):
+        query = payload.get("query", "")
+        variables = payload.get("variables") or {}
+        if "owner" in variables and "name" in variables:
+            self.server.last_repo = f"{variables['owner']}/{variables['name']}"
+        repo = self.fake.repo(getattr(self.server, "last_repo", "o/r"))
+        data = {}
+        with self.fake.lock:
+            if "labels(" in query:
+                data["repository"] = {"id": "R_1", "labels": {
+                    "nodes": [{"id": f"LA_{label['id']}", "name": label["name"],
+                               "color": label["color"],
+                               "description": label["description"]}
+                              for label in repo["labels"].values()],
+                    "pageInfo": {"hasNextPage": False, "endCursor": None},
+                }}
+            elif "repository(" in query:
+                data["repository"] = {"id": "R_1"}
+                for alias, number in re.findall(r"(\w+): issue\(number: (\d+)\)", query):
+                    found = int(number) <= len(repo["issues"])
+                    data["repository"][alias] = {"id": f"I_{number}"} if found else None
+            for alias, kind in re.findall(r"(\w+)\s*:\s*(create\w+|update\w+|delete\w+|close\w+)\(",
+                                          query):
+                inputs = variables.get(alias) or variables.get(f"input_{alias}") or {}
+                data[alias] = self.mutation(repo, kind, inputs)
+        return {"data": data}
+
+    def mutation(self, repo, kind, inputs):
+        labels, issues = repo["labels"], repo["issues"]
+        if kind == "createLabel":
+            label = {"id": next_id(labels), "name": inputs["name"],
+                     "color": inputs["color"],
+                     "description": inputs.get("description", "")}
+            labels[label["name"]] = label
+            return {"label": {"id": f"LA_{label['id']}", "name": label["name"]}}
+        if kind == "createIssue":
+            by_id = {f"LA_{label['id']}": name for name, label in labels.items()}
+            issue = {"number": len(issues) + 1, "title": inputs["title"],
+                     "body": inputs.get("body", ""),
+                     "labels": [by_id[i] for i in inputs.get("labelIds", []) if i in by_id],
+                     "state": "open", "created_at": now_iso(), "updated_at": now_iso()}
+            issues.append(issue)
+            return {"issue": {"id": f"I_{issue['number']}", "number": issue["number"],
+                              "title": issue["title"]}}
+        if kind == "updateIssue":
+            number = int(inputs["id"].split("_")[1])
+            if "body" in inputs:
+                issues[number - 1]["body"] = inputs["body"]
+                issues[number - 1]["updated_at"] = now_iso()
+            return {"issue": {"id": inputs["id"], "number": number}}
+        if kind in ("closeIssue", "deleteIssue"):
+            number = int(inputs["issueId"].split("_")[1])
+            issues[number - 1]["state"] = "closed" if kind == "closeIssue" else "deleted"
+            return {"issue": {"id": inputs["issueId"], "number": number}}
+        return {"clientMutationId": None}
+
+
+def label_json(base, label):
+    return {"id": label["id"], "node_id": f"LA_{label['id']}", "name": label["name"],
+            "color": label["color"], "description": label["description"],
+            "url": f"{base}/labels/{label['name']}"}
+
+
+def issue_json(base, labels, issue):
+    return {"id": issue["number"], "node_id": f"I_{issue['number']}",
+            "number": issue["number"], "title": issue["title"], "body": issue["body"],
+            "state": issue["state"],
+            "labels": [label_json(base, labels[name]) for name in issue["labels"]
+                       if name in labels],
+            "created_at": issue["created_at"], "updated_at": issue["updated_at"],
+            "url": f"{base}/issues/{issue['number']}",
+            "html_url": f"https://github.com/{base.split('/repos/')[1]}/issues/{issue['number']}",
+            "user": {"login": "fake"}}
+
+
+def next_id(labels):
+    # Labels can be deleted, so their count may repeat an id
+    return max((label["id"] for label in labels.values()), default=0) + 1
@@ -0,0 +1,30 @@
+import pytest
+
+import create_github_issues as cgi
+
+
+@pytest.fixture
+def g(fake):
+    client = cgi.AsyncGithub("test-token", 2)
+    yield client
+    client.close()
+
+
+def test_html_error_page_raises_github_exception(fake, g):
+    from github import GithubException
+
+    fake.failures.append((502, "text/html", "<html><h1>502 Bad Gateway</h1></html>"))
+    with pytest.raises(GithubException) as error:
+        g.get_repo("o/r")
+    assert error.value.status == 502
+    assert "Bad Gateway" in error.value.data
+    # The next request goes through as usual
+    assert g.get_repo("o/r").full_name == "o/r"
+
+
+def test_html_rate_limit_page_is_retried(fake, g):
+    fake.failures.append((403, "text/html", "You have exceeded a secondary rate limit"))
+    limiter = cgi.RateLimiter(6000, 1)
+    limiter.backoff = lambda seconds, secondary: None
+    assert limiter.call(g.get_repo, "o/r").full_name == "o/r"
+    assert fake.count("GET", "/repos/o/r") == 2
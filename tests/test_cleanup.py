@@ -0,0 +1,29 @@
+import types
+
+import create_github_issues as cgi
+
+ENTRIES = [
+    ("Set up backend", "Express app", ["backend"]),
+    ("Add login", "JWT", ["backend", "auth"]),
+]
+
+
+def cleanup_args(**changes):
+    values = dict(delete=False, dry_run=False, backend="rest", batch_size=50,
+                  concurrency=1)
+    values.update(changes)
+    return types.SimpleNamespace(**values)
+
+
+def test_duplicates_are_closed_and_reported_through_out(fake):
+    specs = [cgi.IssueSpec.from_markdown(*entry) for entry in ENTRIES]
+    for spec in specs + specs[:1]:
+        fake.add_issue("o/r", spec.title, cgi.with_fingerprint(spec.title, spec.body))
+    g = cgi.make_client("test-token", 1)
+    lines = []
+    handled = cgi.run_cleanup(g, cgi.RateLimiter(6000, 1), "o/r", specs,
+                              cleanup_args(), out=lines.append)
+    assert handled == 1
+    assert [i["state"] for i in fake.issues("o/r")] == ["open", "open", "closed"]
+    assert "✓ Closed #3 (duplicate of #1)" in lines
+    assert lines[-1] == "\nClosed 1 of 1 duplicates"
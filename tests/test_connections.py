@@ -0,0 +1,28 @@
+import pytest
+
+import create_github_issues as cgi
+
+
+@pytest.mark.parametrize("use_cache", [False, True])
+def test_requests_share_one_connection(fake, tmp_path, use_cache):
+    fake.add_label("o/r", "bug")
+    cache = cgi.ResponseCache(str(tmp_path / "cache")) if use_cache else None
+    g = cgi.make_client("test-token", 4, cache)
+    repo = g.get_repo("o/r")
+    for _ in range(3):
+        assert [label.name for label in repo.get_labels()] == ["bug"]
+    repo.create_issue(title="One", body="", labels=["bug"])
+    assert len(fake.calls) == 5
+    assert fake.connections == 1
+
+
+def test_single_worker_without_cache_uses_default_connection(fake):
+    from github.Requester import HTTPRequestsConnectionClass, Requester
+
+    cgi.make_client("test-token", 4)
+    g = cgi.make_client("test-token", 1)
+    assert Requester._Requester__httpConnectionClass is HTTPRequestsConnectionClass
+    repo = g.get_repo("o/r")
+    list(repo.get_labels())
+    list(repo.get_issues())
+    assert fake.connections == 1
@@ -0,0 +1,50 @@
+import create_github_issues as cgi
+
+ENTRIES = [
+    ("Set up backend", "Express app", ["backend"]),
+    ("Add login", "JWT", ["backend", "auth"]),
+    ("Write docs", "", ["docs"]),
+]
+
+
+def backend(fake):
+    g = cgi.make_client("test-token", 1)
+    repo = g.get_repo("o/r")
+    return cgi.GraphQLBackend(g, repo, cgi.RateLimiter(6000, 1), 50)
+
+
+def test_create_batch_sends_one_request(fake):
+    fake.add_label("o/r", "backend")
+    fake.add_label("o/r", "auth")
+    graphql = backend(fake)
+    graphql.resolve()
+    before = fake.count("POST", "/graphql")
+    results = graphql.create_batch([cgi.IssueSpec.from_markdown(*entry) for entry in ENTRIES[:2]])
+    assert results == [("created", 1, None), ("created", 2, None)]
+    assert fake.count("POST", "/graphql") == before + 1
+    assert [i["labels"] for i in fake.issues("o/r")] == [["backend"], ["backend", "auth"]]
+
+
+def test_entries_with_missing_labels_are_not_created(fake):
+    fake.add_label("o/r", "backend")
+    graphql = backend(fake)
+    graphql.resolve()
+    results = graphql.create_batch([cgi.IssueSpec.from_markdown(*entry) for entry in ENTRIES])
+    assert results[0] == ("created", 1, None)
+    for status, number, error in results[1:]:
+        assert (status, number, error.status) == ("failed", None, 422)
+    assert "auth" in results[1][2].data["message"]
+    assert [i["title"] for i in fake.issues("o/r")] == ["Set up backend"]
+
+
+def test_create_run_makes_labels_and_issues(fake, run, spec):
+    path = spec(ENTRIES)
+    assert run("--backend", "graphql", "--spec", path) == 0
+    issues = fake.issues("o/r")
+    assert [(i["title"], i["labels"]) for i in issues] == [
+        (title, labels) for title, _, labels in ENTRIES
+    ]
+    assert all(cgi.FINGERPRINT_RE.search(i["body"]) for i in issues)
+    # A second run finds every issue and creates nothing
+    assert run("--backend", "graphql", "--spec", path) == 0
+    assert len(fake.issues("o/r")) == len(ENTRIES)
@@ -0,0 +1,26 @@
+import inspect
+
+import create_github_issues as cgi
+
+BODY = """## Description
+
+Set up the API.
+
+## Tasks
+
+- [ ] Add routes
+- [ ] Add tests"""
+
+
+def test_fields_match_the_constructor():
+    params = list(inspect.signature(cgi.IssueSpec).parameters)
+    assert params == [*cgi.IssueSpec._FIELDS, "body"]
+
+
+def test_replace_keeps_every_other_field():
+    spec = cgi.IssueSpec.from_markdown("API", BODY, ["backend"], "M1", "o/1",
+                                       {"Status": "Todo"})
+    copy = spec.replace(title="API v2")
+    assert (copy.title, copy.body) == ("API v2", BODY)
+    for name in cgi.IssueSpec._FIELDS[1:]:
+        assert getattr(copy, name) == getattr(spec, name)
@@ -0,0 +1,16 @@
+ENTRIES = [
+    ("Set up backend", "## Description\n\nExpress app", ["backend"]),
+    ("Add login", "## Description\n\nJWT\n\n## Dependencies\n\n- Set up backend",
+     ["backend", "auth"]),
+]
+
+
+def test_dependencies_are_linked_once(fake, run, spec):
+    path = spec(ENTRIES)
+    assert run("--spec", path, "--link-dependencies") == 0
+    login = fake.issues("o/r")[1]
+    assert "#1 Set up backend" in login["body"]
+    # A re-run sees the links already in the body and edits nothing
+    fake.calls.clear()
+    assert run("--spec", path, "--link-dependencies") == 0
+    assert fake.count("PATCH") == 0
@@ -0,0 +1,53 @@
+import re
+import types
+
+import create_github_issues as cgi
+
+ENTRIES = [
+    ("Set up backend", "Express app", ["backend"]),
+    ("Add login", "JWT", ["backend", "auth"]),
+]
+
+
+def test_budget_counts_the_printed_plan(fake, run, spec, capsys):
+    path = spec(ENTRIES)
+    assert run("--spec", path) == 0
+    capsys.readouterr()
+    assert run("--spec", path, "--dry-run") == 0
+    out = capsys.readouterr().out
+    planned = out.split("=== Planned API calls ===")[1].split("=== Plan summary ===")[0]
+    printed = len(planned.strip().splitlines())
+    rest = int(re.search(r"API calls: (\d+) REST", out).group(1))
+    needed = int(re.search(r"Core: needs up to (\d+) requests", out).group(1))
+    # Everything exists, so only the listings are left
+    assert printed == rest == needed == 3
+
+
+def budget(fake, capsys, rest, graphql, limiter=None):
+    g = cgi.make_client("test-token", 1)
+    count = cgi.CallCount()
+    count.rest, count.graphql = rest, graphql
+    args = types.SimpleNamespace(concurrency=1, requests_per_minute=6000)
+    cgi.print_budget(g, limiter or cgi.RateLimiter(6000, 1), count, args)
+    return capsys.readouterr().out
+
+
+def test_budget_spanning_several_windows(fake, capsys):
+    fake.rate_limits = {"core": (10, 50), "graphql": (4999, 5000)}
+    out = budget(fake, capsys, 100, 5)
+    assert "Core: needs up to 100 requests, 10 of 50 left" in out
+    assert re.findall(r"Window \d \((?:now|from [^)]+)\): (\d+) requests", out) == [
+        "10", "50", "40",
+    ]
+    assert "GraphQL: needs up to 5 requests, 4999 of 5000 left" in out
+    assert "ETA: " in out
+
+
+def test_spent_budget_waits_for_the_reset(fake, capsys):
+    fake.rate_limits = {"core": (0, 50), "graphql": (4999, 5000)}
+    lines = []
+    limiter = cgi.RateLimiter(6000, 1, out=lines.append)
+    out = budget(fake, capsys, 20, 0, limiter)
+    assert "(now)" not in out
+    assert re.search(r"Window 1 \(from [^)]+\): 20 requests", out)
+    assert lines[0].startswith("  Rate-limit budget used up")
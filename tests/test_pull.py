@@ -0,0 +1,97 @@
+import json
+
+import pytest
+
+import create_github_issues as cgi
+
+
+@pytest.fixture(params=["pygithub", "asyncio"])
+def transport(request, run):
+    """run() with every command sent through one --transport."""
+    return lambda *argv: run("--transport", request.param, *argv)
+
+
+def body(description, tasks):
+    return (f"## Description\n\n{description}\n\n## Tasks\n\n"
+            + "\n".join(f"- [ ] {task}" for task in tasks))
+
+
+def write_spec(path, entries):
+    with open(path, "w", encoding="utf-8") as f:
+        for title, text, labels in entries:
+            f.write(json.dumps({"title": title, "body": text, "labels": labels}) + "\n")
+
+
+def read_spec(path):
+    return {spec.title: spec for spec in cgi.SpecSource(str(path))}
+
+
+def edit_on_github(fake, number, text):
+    issue = fake.repo("o/r")["issues"][number - 1]
+    issue["body"] = cgi.with_fingerprint(issue["title"], text)
+    issue["updated_at"] = cgi.github_time(cgi.datetime.now(cgi.timezone.utc))
+
+
+def test_merge_specs_merges_sections_separately():
+    base = cgi.IssueSpec.from_markdown("API", body("Old", ["One"]), ["backend"])
+    ours = cgi.IssueSpec.from_markdown("API", body("New", ["One"]), ["backend"])
+    theirs = cgi.IssueSpec.from_markdown("API", body("Old", ["One", "Two"]),
+                                         ["backend", "auth"])
+    merged, conflicts = cgi.merge_specs(base, ours, theirs)
+    assert conflicts == []
+    assert merged.body == body("New", ["One", "Two"])
+    assert merged.labels == ["backend", "auth"]
+
+
+def test_merge_specs_keeps_the_spec_on_conflict():
+    base = cgi.IssueSpec.from_markdown("API", body("Old", ["One"]))
+    ours = cgi.IssueSpec.from_markdown("API", body("Ours", ["One"]))
+    theirs = cgi.IssueSpec.from_markdown("API", body("Theirs", ["One"]))
+    merged, conflicts = cgi.merge_specs(base, ours, theirs)
+    assert conflicts == ["Description"]
+    assert merged.body == ours.body
+
+
+def test_pull_merges_github_edits_into_the_spec(fake, transport, tmp_path, capsys):
+    path = tmp_path / "spec.jsonl"
+    write_spec(path, [("API", body("Old", ["One"]), ["backend"]),
+                      ("Docs", body("Write", ["Readme"]), ["docs"])])
+    assert transport("--spec", str(path), "--sync") == 0
+    write_spec(path, [("API", body("New", ["One"]), ["backend"]),
+                      ("Docs", body("Write", ["Readme"]), ["docs"])])
+    edit_on_github(fake, 1, body("Old", ["One", "Two"]))
+
+    assert transport("pull", "--spec", str(path)) == 0
+    assert read_spec(path)["API"].body == body("New", ["One", "Two"])
+    assert read_spec(path)["Docs"].body == body("Write", ["Readme"])
+    # A second pull starts from the watermark and changes nothing
+    capsys.readouterr()
+    assert transport("pull", "--spec", str(path)) == 0
+    assert "updated since " in capsys.readouterr().out
+    assert read_spec(path)["API"].body == body("New", ["One", "Two"])
+
+
+def test_pull_reports_conflicts(fake, transport, tmp_path):
+    path = tmp_path / "spec.jsonl"
+    write_spec(path, [("API", body("Old", ["One"]), ["backend"])])
+    assert transport("--spec", str(path), "--sync") == 0
+    write_spec(path, [("API", body("Ours", ["One"]), ["backend"])])
+    edit_on_github(fake, 1, body("Theirs", ["One"]))
+
+    assert transport("pull", "--spec", str(path)) == 1
+    assert read_spec(path)["API"].body == body("Ours", ["One"])
+
+
+def test_pull_reports_through_out(fake, tmp_path):
+    path = tmp_path / "spec.jsonl"
+    write_spec(path, [("API", body("Old", ["One"]), ["backend"])])
+    fake.add_label("o/r", "backend")
+    fake.add_issue("o/r", "API", cgi.with_fingerprint("API", body("Old", ["One", "Two"])),
+                   ["backend"])
+    args = type("Args", (), {"dry_run": True, "spec": str(path)})
+    lines = []
+    conflicts = cgi.run_pull(cgi.make_client("test-token", 1), cgi.RateLimiter(6000, 1),
+                             "o/r", list(cgi.SpecSource(str(path))), args,
+                             cgi.Manifest(str(tmp_path / "manifest.json")), lines.append)
+    assert conflicts == 0
+    assert "✓ Pulled #1: API (Tasks)" in lines
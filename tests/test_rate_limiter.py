@@ -0,0 +1,29 @@
+import time
+
+import create_github_issues as cgi
+
+
+def test_retries_are_reported_through_out():
+    from github import GithubException
+
+    lines = []
+    limiter = cgi.RateLimiter(6000, 2, out=lines.append)
+    attempts = []
+
+    def call():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise GithubException(403, {"message": "secondary rate limit"},
+                                  {"Retry-After": "0"})
+        return "ok"
+
+    assert limiter.call(call) == "ok"
+    assert limiter.retries == 1
+    assert lines == ["  Secondary rate limit hit, retrying in 0s"]
+
+
+def test_spent_budget_pause_is_reported_through_out():
+    lines = []
+    limiter = cgi.RateLimiter(6000, 1, out=lines.append)
+    limiter.pause_until(time.time() - 1)
+    assert lines[0].startswith("  Rate-limit budget used up, pausing until ")
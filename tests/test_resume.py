@@ -0,0 +1,35 @@
+import json
+
+ENTRIES = [
+    ("Set up backend", "Express app", ["backend"]),
+    ("Add login", "JWT", ["backend", "auth"]),
+    ("Write docs", "", ["docs"]),
+]
+
+
+def journal_entries(tmp_path):
+    with open(tmp_path / "issues-journal.jsonl", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.endswith("}\n")]
+
+
+def test_resume_skips_journaled_work(fake, run, spec, tmp_path):
+    assert run("--spec", spec(ENTRIES[:2])) == 0
+    assert [entry["op"] for entry in journal_entries(tmp_path)] == ["labels", "issue", "issue"]
+    # The interrupted run was cut off in the middle of a line
+    with open(tmp_path / "issues-journal.jsonl", "a", encoding="utf-8") as f:
+        f.write('{"repo": "o/r", "op": "iss')
+    fake.calls.clear()
+
+    assert run("--spec", spec(ENTRIES), "--resume") == 0
+    assert [i["title"] for i in fake.issues("o/r")] == [title for title, _, _ in ENTRIES]
+    assert fake.count("POST", "/issues") == 1
+    # Labels were journaled as done, so they aren't listed again
+    assert fake.count("GET", "/labels") == 0
+    assert journal_entries(tmp_path)[-1]["title"] == "Write docs"
+
+
+def test_fresh_run_starts_a_new_journal(fake, run, spec, tmp_path):
+    assert run("--spec", spec(ENTRIES[:1])) == 0
+    assert run("--spec", spec(ENTRIES[:1])) == 0
+    assert [entry["op"] for entry in journal_entries(tmp_path)] == ["labels", "issue"]
+    assert len(fake.issues("o/r")) == 1
@@ -0,0 +1,13 @@
+import create_github_issues as cgi
+
+BODY = "## Description\n\nAPI\n\n## Required Files\n\n- `src/app.js`\n- `src/routes.js`"
+
+
+def test_scan_reports_progress_through_out(tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "app.js").write_text("")
+    paths = cgi.PathIndex(str(tmp_path)).scan()
+    specs = [cgi.IssueSpec.from_markdown("API", BODY, ["backend"])]
+    lines = []
+    assert cgi.run_scan(None, None, "o/r", specs, None, paths, out=lines.append) == 0
+    assert lines == ["=== Required files ===", "- API: 1 of 2 (missing src/routes.js)"]
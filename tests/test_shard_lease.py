@@ -0,0 +1,53 @@
+import time
+
+import pytest
+
+import create_github_issues as cgi
+
+
+@pytest.fixture(params=["requests", "asyncio"])
+def repo(request, fake):
+    if request.param == "asyncio":
+        g = cgi.AsyncGithub("test-token", 2)
+        request.addfinalizer(g.close)
+    else:
+        g = cgi.make_client("test-token", 2)
+    return g.get_repo("o/r")
+
+
+def lease(repo, holder):
+    return cgi.ShardLease(repo, cgi.RateLimiter(6000, 2), (1, 2), holder)
+
+
+def held_until(expires):
+    return f"held by other until {time.strftime(cgi.GITHUB_TIME_FORMAT, time.gmtime(expires))}"
+
+
+def test_free_lease_is_taken_and_released(fake, repo):
+    claim = lease(repo, "me")
+    assert claim.acquire() is None
+    assert cgi.ShardLease.parse(fake.repo("o/r")["labels"]["shard-lease-1-of-2"]
+                                ["description"])[0] == "me"
+    claim.release()
+    assert "shard-lease-1-of-2" not in fake.repo("o/r")["labels"]
+
+
+def test_lease_held_by_another_run_is_refused(fake, repo):
+    expires = int(time.time()) + 3600
+    fake.add_label("o/r", "shard-lease-1-of-2", description=held_until(expires))
+    assert lease(repo, "me").acquire() == ("other", expires)
+
+
+def test_expired_lease_is_taken_over(fake, repo):
+    fake.add_label("o/r", "shard-lease-1-of-2",
+                   description=held_until(int(time.time()) - 60))
+    claim = lease(repo, "me")
+    assert claim.acquire() is None
+    assert claim.parse(claim.label.description)[0] == "me"
+
+
+def test_missing_label_is_unknown_object(fake, repo):
+    from github import UnknownObjectException
+
+    with pytest.raises(UnknownObjectException):
+        repo.get_label("nope")